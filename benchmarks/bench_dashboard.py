@@ -0,0 +1,300 @@
+"""
+Benchmark dashboard & pipeline data.
+
+Mengukur wall time dan peak memory (tracemalloc) untuk setiap stage pipeline
+(ingest, load, filter, rentang tanggal, roll-up cube, merge moment, piramida
+rollup, rolling window, quantile sketch) dan untuk setiap halaman dashboard
+yang dijalankan headless lewat Streamlit AppTest (cold = cache chart kosong,
+warm = rerun dengan filter yang sama), termasuk total waktu render figure per
+halaman. Data yang dipakai: data bawaan (scale 1) dan tabel sintetis hasil
+replikasi day/hour sebanyak N kali.
+
+Contoh:
+    python benchmarks/bench_dashboard.py                       # scale 1 & 10, bandingkan dengan baseline
+    python benchmarks/bench_dashboard.py --scales 1 10 100 1000
+    python benchmarks/bench_dashboard.py --save-baseline       # timpa benchmarks/baseline.json
+
+Exit code 1 kalau ada metrik yang lebih lambat dari baseline melebihi --tolerance, atau
+metrik (stage) yang belum ada di baseline untuk scale yang sama.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DIR = os.path.join(ROOT, 'dashboard')
+DATA_DIR = os.path.join(ROOT, 'data')
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+sys.path.insert(0, DASHBOARD_DIR)
+
+import render  # noqa: E402
+from cube import filter_cube, rollup  # noqa: E402
+from dataset import LiveDataset  # noqa: E402
+from datastore import TABLES, ingest_table  # noqa: E402
+from stats import merge_all  # noqa: E402
+from sketch import merge_sketches  # noqa: E402
+from pyramid import RollupPyramid  # noqa: E402
+
+PAGES = ["📊 Overview", "📈 Analisis Utama", "🔍 Analisis Lanjutan", "📝 Kesimpulan"]
+# Tab Analisis Lanjutan di-render lazy, jadi tiap tab diukur sendiri
+ADVANCED_TABS = ["📊 Segmentasi Demand", "📅 Weekday vs Weekend", "👥 Casual vs Registered", "🎯 Multi-Dimensional Clustering"]
+
+# Filter parsial yang dipakai di stage filter (2 musim, 1 cuaca)
+BENCH_SEASONS = [2, 3]
+BENCH_WEATHERS = [1]
+# Rentang tanggal [start, stop) untuk stage date_range (satu bulan, ada di semua skala)
+BENCH_DATES = ('2012-06-01', '2012-07-01')
+
+
+def make_synthetic_data(scale, target_dir):
+    """Replikasi day.csv & hour.csv sebanyak `scale` kali dengan tanggal & instant yang digeser."""
+    for name in TABLES:
+        base = pd.read_csv(os.path.join(DATA_DIR, f'{name}.csv'))
+        dates = pd.to_datetime(base['dteday'])
+        span = (dates.max() - dates.min()).days + 1
+        path = os.path.join(target_dir, f'{name}.csv')
+        for i in range(scale):
+            copy = base.copy()
+            copy['instant'] = base['instant'] + i * len(base)
+            copy['dteday'] = (dates + pd.Timedelta(days=i * span)).dt.strftime('%Y-%m-%d')
+            copy.to_csv(path, mode='a' if i else 'w', header=(i == 0), index=False)
+    return target_dir
+
+
+def measure(func, trace=False):
+    """Jalankan func sekali; kembalikan (hasil, detik, peak MB atau None)."""
+    if trace:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_pipeline(data_dir, trace):
+    stages = {}
+
+    def record(stage, func):
+        result, elapsed, peak = measure(func, trace)
+        stages[stage] = {'wall_s': elapsed} if not trace else {'peak_mb': peak}
+        return result
+
+    shutil.rmtree(os.path.join(data_dir, 'store'), ignore_errors=True)
+    record('ingest', lambda: [ingest_table(data_dir, name) for name in TABLES])
+    dataset = record('load', lambda: LiveDataset(data_dir))
+    hour = dataset.tables['hour']
+    day = dataset.tables['day']
+    record('filter', lambda: hour.take(hour.index.select(season=BENCH_SEASONS)))
+    record('date_range', lambda: hour.take(
+        hour.time_index.restrict(hour.index.select(season=BENCH_SEASONS), *BENCH_DATES)
+    ))
+    record('cube_rollup', lambda: [
+        rollup(filter_cube(day.cube, BENCH_SEASONS, BENCH_WEATHERS), by='weathersit', stats=('mean', 'sum', 'count')),
+        rollup(filter_cube(hour.cube, BENCH_SEASONS), by=['day_type', 'hr']),
+    ])
+    record('moments_merge', lambda: merge_all(
+        [m for (s, w), m in hour.moments.items() if s in BENCH_SEASONS], hour.moment_columns
+    ).corr())
+    record('pyramid_build', lambda: RollupPyramid.from_frame(hour.frame))
+    record('pyramid_trend', lambda: hour.pyramid.series(
+        hour.pyramid.choose_level(*BENCH_DATES), BENCH_SEASONS, *BENCH_DATES
+    ))
+    record('rolling_window', lambda: day.prefix.mean(day.prefix.ends(max_points=400), 28))
+    record('sketch_quantiles', lambda: merge_sketches(
+        [sk for (s, w), sk in day.sketches.items() if s in BENCH_SEASONS]
+    ).quantiles([0.33, 0.67]))
+    return stages
+
+
+class RenderTimer:
+    """Bungkus ParallelRenderer.flush untuk mencatat waktu render chart (miss) per halaman."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.charts = 0
+        self._original = render.ParallelRenderer.flush
+
+    def __enter__(self):
+        timer = self
+        original = self._original
+
+        def timed(renderer):
+            charts = len(renderer._pending)
+            start = time.perf_counter()
+            original(renderer)
+            timer.seconds += time.perf_counter() - start
+            timer.charts += charts
+
+        render.ParallelRenderer.flush = timed
+        return self
+
+    def __exit__(self, *exc):
+        render.ParallelRenderer.flush = self._original
+
+    def take(self):
+        seconds, charts = self.seconds, self.charts
+        self.seconds, self.charts = 0.0, 0
+        return seconds, charts
+
+
+def bench_pages(data_dir, trace, timeout):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    os.environ['BIKE_DATA_DIR'] = data_dir
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    results = {}
+
+    with RenderTimer() as timer:
+        at = AppTest.from_file(os.path.join(DASHBOARD_DIR, 'dashboard.py'), default_timeout=timeout)
+        _, elapsed, peak = measure(at.run, trace)
+        timer.take()
+        results['startup'] = {'wall_s': elapsed} if not trace else {'peak_mb': peak}
+
+        def record(name, action):
+            _, cold, peak = measure(action, trace)
+            render_s, charts = timer.take()
+            _, warm, _ = measure(at.run)
+            timer.take()
+            if at.exception:
+                raise RuntimeError(f"{name}: {at.exception[0].value}")
+            if trace:
+                results[name] = {'peak_mb': peak}
+            else:
+                results[name] = {'cold_s': cold, 'warm_s': warm, 'render_s': render_s, 'charts': charts}
+
+        for page in PAGES:
+            record(page, lambda: at.sidebar.radio[0].set_value(page).run())
+
+        at.sidebar.radio[0].set_value(PAGES[2]).run()
+        for tab in ADVANCED_TABS[1:]:
+            def open_tab():
+                at.session_state['advanced_tab'] = tab
+                at.run()
+            record(f'{PAGES[2]} / {tab}', open_tab)
+    return results
+
+
+def run_scale(scale, timeout):
+    tmp_dir = tempfile.mkdtemp(prefix=f'bike_bench_{scale}x_')
+    try:
+        if scale == 1:
+            for name in TABLES:
+                shutil.copy(os.path.join(DATA_DIR, f'{name}.csv'), tmp_dir)
+        else:
+            make_synthetic_data(scale, tmp_dir)
+        n_hour = sum(1 for _ in open(os.path.join(tmp_dir, 'hour.csv'))) - 1
+
+        result = {'hour_rows': n_hour, 'pipeline': {}, 'pages': {}}
+        # Pass 1: wall time tanpa tracing, pass 2: peak memory dengan tracemalloc
+        for trace in (False, True):
+            for stage, values in bench_pipeline(tmp_dir, trace).items():
+                result['pipeline'].setdefault(stage, {}).update(values)
+            for page, values in bench_pages(tmp_dir, trace, timeout).items():
+                result['pages'].setdefault(page, {}).update(values)
+        return result
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def flatten(results):
+    """{'1x/pipeline/load/wall_s': 0.12, ...} untuk metrik waktu yang dibandingkan ke baseline."""
+    flat = {}
+    for scale, result in results.items():
+        for group in ('pipeline', 'pages'):
+            for stage, values in result[group].items():
+                for metric, value in values.items():
+                    if metric.endswith('_s'):
+                        flat[f'{scale}/{group}/{stage}/{metric}'] = value
+    return flat
+
+
+def compare(results, baseline, tolerance, min_seconds=0.05):
+    """
+    Cetak perbandingan dengan baseline; kembalikan (metrik yang regresi,
+    metrik yang belum ada di baseline). Scale yang sama sekali tidak ada di
+    baseline tidak dihitung sebagai metrik yang hilang.
+    """
+    current, previous = flatten(results), flatten(baseline.get('results', {}))
+    baseline_scales = set(baseline.get('results', {}))
+    regressions, missing = [], []
+    print(f"\n{'metric':60s} {'baseline':>10s} {'current':>10s} {'ratio':>7s}")
+    for key, value in current.items():
+        if key not in previous:
+            if key.split('/')[0] in baseline_scales:
+                # Stage baru yang belum pernah diukur di baseline: baseline perlu diperbarui
+                missing.append(key)
+                print(f"{key:60s} {'-':>10s} {value:10.3f} {'-':>7s}  <-- TIDAK ADA DI BASELINE")
+            continue
+        ratio = value / previous[key] if previous[key] > 0 else np.inf
+        flag = ''
+        # Metrik yang sangat cepat diabaikan karena didominasi noise
+        if ratio > 1 + tolerance and value > min_seconds:
+            regressions.append(key)
+            flag = '  <-- REGRESI'
+        print(f"{key:60s} {previous[key]:10.3f} {value:10.3f} {ratio:7.2f}{flag}")
+    return regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard Bike Sharing")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--output', help="Simpan hasil run ini ke file JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Batas perlambatan relatif (0.25 = 25%%)")
+    parser.add_argument('--timeout', type=float, default=600)
+    args = parser.parse_args()
+
+    results = {}
+    for scale in args.scales:
+        print(f"== scale {scale}x ==", flush=True)
+        results[f'{scale}x'] = run_scale(scale, args.timeout)
+        print(json.dumps(results[f'{scale}x'], indent=2, ensure_ascii=False), flush=True)
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Baseline disimpan ke {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions, missing = compare(results, baseline, args.tolerance)
+        if missing:
+            print(f"\n{len(missing)} metrik belum ada di baseline, perbarui dengan --save-baseline")
+        if regressions:
+            print(f"\n{len(regressions)} metrik lebih lambat dari baseline (> {args.tolerance:.0%})")
+        if missing or regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
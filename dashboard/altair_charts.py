@@ -0,0 +1,267 @@
+"""
+Chart interaktif sisi klien (Altair / Vega-Lite) dari data pra-agregasi.
+
+Pasangan charts.py untuk mode chart interaktif: setiap fungsi menerima data
+yang sama dengan renderer PNG (hasil agregasi kecil, mis. 24 rata-rata per
+jam atau 12 rata-rata bulanan) dan mengembalikan alt.Chart. Spec + data
+dikirim sebagai JSON ke browser, jadi hover (tooltip), zoom/pan, dan toggle
+seri lewat legend diproses Vega-Lite di klien tanpa rerun server.
+
+Chart yang butuh titik mentah dalam jumlah besar (scatter per jam, boxplot)
+tidak ada di SPECS dan tetap di-render sebagai PNG.
+"""
+from functools import partial
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from palette import DEMAND_COLORS, SEASON_COLORS, USER_COLORS, WEATHER_COLORS
+
+
+def _series_frame(series, x, y):
+    # Index categorical / label -> kolom biasa; nilai dijadikan float supaya JSON kecil & konsisten
+    return pd.DataFrame({x: np.asarray(series.index.astype(object)), y: np.asarray(series.values, dtype='float64')})
+
+
+def _legend_toggle(field):
+    # altair >= 5 memakai selection_point / add_params, altair 4 selection_multi / add_selection
+    if hasattr(alt, 'selection_point'):
+        return alt.selection_point(fields=[field], bind='legend')
+    return alt.selection_multi(fields=[field], bind='legend')
+
+
+def _with_selection(chart, selection):
+    if hasattr(chart, 'add_params'):
+        return chart.add_params(selection)
+    return chart.add_selection(selection)
+
+
+def _bar(frame, x, y, title, x_title, y_title, colors=None, fmt=',.0f'):
+    color = (alt.Color(f'{x}:N', scale=alt.Scale(domain=list(frame[x]), range=colors[:len(frame)]), legend=None)
+             if colors else alt.value('#3498db'))
+    base = alt.Chart(frame, title=title).encode(x=alt.X(f'{x}:N', sort=None, title=x_title))
+    bars = base.mark_bar().encode(
+        y=alt.Y(f'{y}:Q', title=y_title), color=color,
+        tooltip=[alt.Tooltip(f'{x}:N', title=x_title), alt.Tooltip(f'{y}:Q', title=y_title, format=fmt)]
+    )
+    labels = base.mark_text(dy=-6, fontWeight='bold').encode(y=f'{y}:Q', text=alt.Text(f'{y}:Q', format=fmt))
+    return bars + labels
+
+
+def _heatmap(matrix, x_title, y_title, value_title, scheme, fmt):
+    frame = matrix.rename_axis(index='row', columns='col').stack().rename('value').reset_index()
+    frame[['row', 'col']] = frame[['row', 'col']].astype(str)
+    rows, cols = [str(v) for v in matrix.index], [str(v) for v in matrix.columns]
+    base = alt.Chart(frame).encode(
+        x=alt.X('col:N', sort=cols, title=x_title), y=alt.Y('row:N', sort=rows, title=y_title)
+    )
+    rect = base.mark_rect().encode(
+        color=alt.Color('value:Q', scale=alt.Scale(scheme=scheme), title=value_title),
+        tooltip=['row:N', 'col:N', alt.Tooltip('value:Q', title=value_title, format=fmt)]
+    )
+    return rect + base.mark_text().encode(text=alt.Text('value:Q', format=fmt))
+
+
+def corr_heatmap(corr, title):
+    return _heatmap(corr, None, None, 'Korelasi', 'redblue', '.2f').properties(title=title)
+
+
+def season_bar(rentals_by_season):
+    return _bar(_series_frame(rentals_by_season, 'Musim', 'Total'), 'Musim', 'Total',
+                'Total Penyewaan Sepeda per Musim', 'Musim', 'Total Penyewaan', SEASON_COLORS)
+
+
+def temp_scatter_daily(temp, cnt, slope, intercept):
+    frame = pd.DataFrame({'Suhu': np.asarray(temp, dtype='float64'), 'Penyewaan': np.asarray(cnt, dtype='float64')})
+    x_line = np.array([frame['Suhu'].min(), frame['Suhu'].max()]) if len(frame) else np.zeros(0)
+    line = pd.DataFrame({'Suhu': x_line, 'Penyewaan': intercept + slope * x_line})
+    points = alt.Chart(frame, title='Pengaruh Suhu terhadap Total Penyewaan Harian').mark_circle(opacity=0.5).encode(
+        x=alt.X('Suhu:Q', title='Suhu (°C)'), y=alt.Y('Penyewaan:Q', title='Total Penyewaan'),
+        tooltip=[alt.Tooltip('Suhu:Q', format='.1f'), alt.Tooltip('Penyewaan:Q', format=',.0f')]
+    ).interactive()
+    return points + alt.Chart(line).mark_line(color='red', strokeWidth=2).encode(x='Suhu:Q', y='Penyewaan:Q')
+
+
+def weather_mean_bar(mean_by_weather):
+    return _bar(_series_frame(mean_by_weather, 'Cuaca', 'Rata-rata'), 'Cuaca', 'Rata-rata',
+                'Rata-rata Penyewaan per Kondisi Cuaca', 'Kondisi Cuaca', 'Rata-rata Penyewaan', WEATHER_COLORS)
+
+
+def demand_level_bar(demand_counts):
+    return _bar(_series_frame(demand_counts, 'Level', 'Hari'), 'Level', 'Hari',
+                'Distribusi Jumlah Hari per Demand Level', None, 'Jumlah Hari', DEMAND_COLORS)
+
+
+def demand_temp_bar(temp_by_demand):
+    return _bar(_series_frame(temp_by_demand, 'Level', 'Suhu'), 'Level', 'Suhu',
+                'Rata-rata Suhu per Demand Level', None, 'Suhu (°C)', DEMAND_COLORS, fmt='.1f')
+
+
+def daytype_bar(avg_by_type):
+    return _bar(_series_frame(avg_by_type, 'Tipe', 'Rata-rata'), 'Tipe', 'Rata-rata',
+                'Rata-rata Penyewaan: Weekday vs Weekend', None, 'Rata-rata Penyewaan', ['#3498db', '#e74c3c'])
+
+
+def _users_frame(frame, index_name):
+    # Kolom casual/registered -> format long supaya legend bisa dipakai untuk toggle seri
+    long = frame[['casual', 'registered']].rename(columns={'casual': 'Casual', 'registered': 'Registered'})
+    long = long.rename_axis(index_name).reset_index().melt(id_vars=index_name, var_name='User', value_name='Rata-rata')
+    long[index_name] = long[index_name].astype(object)
+    return long
+
+
+def _user_color():
+    return alt.Color('User:N', scale=alt.Scale(domain=['Casual', 'Registered'], range=USER_COLORS))
+
+
+def daytype_users_bar(casual_reg_data):
+    frame = _users_frame(casual_reg_data, 'Tipe')
+    toggle = _legend_toggle('User')
+    # Bar berdampingan butuh channel xOffset (altair >= 5); altair 4 menampilkan bar bertumpuk
+    offset = {'xOffset': 'User:N'} if hasattr(alt, 'XOffset') else {}
+    chart = alt.Chart(frame, title='Casual vs Registered: Weekday vs Weekend').mark_bar().encode(
+        x=alt.X('Tipe:N', sort=None, title=None), **offset,
+        y=alt.Y('Rata-rata:Q', title='Rata-rata Penyewaan'), color=_user_color(),
+        opacity=alt.condition(toggle, alt.value(1.0), alt.value(0.15)),
+        tooltip=['Tipe:N', 'User:N', alt.Tooltip('Rata-rata:Q', format=',.0f')]
+    )
+    return _with_selection(chart, toggle)
+
+
+def _hourly_line(hourly, title, color, rush_hours=False):
+    frame = _series_frame(hourly, 'Jam', 'Rata-rata')
+    base = alt.Chart(frame).encode(
+        x=alt.X('Jam:Q', title='Jam', scale=alt.Scale(domain=[0, 23])),
+        y=alt.Y('Rata-rata:Q', title='Rata-rata Penyewaan')
+    )
+    layers = [
+        base.mark_area(opacity=0.3, color=color),
+        base.mark_line(point=True, color=color).encode(
+            tooltip=[alt.Tooltip('Jam:Q'), alt.Tooltip('Rata-rata:Q', format=',.0f')]
+        ).interactive(),
+    ]
+    if rush_hours:
+        rush = pd.DataFrame({'start': [7, 17], 'end': [9, 19], 'Periode': ['Rush Pagi', 'Rush Sore']})
+        layers.insert(0, alt.Chart(rush).mark_rect(opacity=0.2).encode(
+            x='start:Q', x2='end:Q',
+            color=alt.Color('Periode:N', scale=alt.Scale(domain=['Rush Pagi', 'Rush Sore'], range=['orange', 'red']))
+        ))
+    return alt.layer(*layers, title=title)
+
+
+def weekday_hourly_line(hourly):
+    return _hourly_line(hourly, 'Pola Weekday - Commuting Pattern', '#3498db', rush_hours=True)
+
+
+def weekend_hourly_line(hourly):
+    return _hourly_line(hourly, 'Pola Weekend - Recreational Pattern', '#e74c3c')
+
+
+def users_pie(total_casual, total_registered):
+    frame = pd.DataFrame({'User': ['Casual', 'Registered'], 'Total': [float(total_casual), float(total_registered)]})
+    frame['Persen'] = frame['Total'] / frame['Total'].sum()
+    return alt.Chart(frame, title='Proporsi Total Penyewaan').mark_arc().encode(
+        theta='Total:Q', color=_user_color(),
+        tooltip=['User:N', alt.Tooltip('Total:Q', format=',.0f'), alt.Tooltip('Persen:Q', format='.1%')]
+    )
+
+
+def users_monthly_line(monthly_users):
+    frame = _users_frame(monthly_users, 'Bulan')
+    toggle = _legend_toggle('User')
+    chart = alt.Chart(frame, title='Trend Bulanan: Casual vs Registered').mark_line(point=True).encode(
+        x=alt.X('Bulan:Q', title='Bulan', scale=alt.Scale(domain=[1, 12])),
+        y=alt.Y('Rata-rata:Q', title='Rata-rata Penyewaan'), color=_user_color(),
+        opacity=alt.condition(toggle, alt.value(1.0), alt.value(0.15)),
+        tooltip=['Bulan:Q', 'User:N', alt.Tooltip('Rata-rata:Q', format=',.0f')]
+    )
+    return _with_selection(chart, toggle).interactive()
+
+
+def trend_line(trend, level_label):
+    frame = (trend[['cnt', 'casual', 'registered']]
+             .rename(columns={'cnt': 'Total', 'casual': 'Casual', 'registered': 'Registered'})
+             .rename_axis('Periode').reset_index()
+             .melt(id_vars='Periode', var_name='Seri', value_name='Penyewaan'))
+    toggle = _legend_toggle('Seri')
+    chart = alt.Chart(frame, title=f'Tren Penyewaan per {level_label}').mark_line(point=len(trend) <= 60).encode(
+        x=alt.X('Periode:T', title=level_label),
+        y=alt.Y('Penyewaan:Q', title='Total Penyewaan'),
+        color=alt.Color('Seri:N', scale=alt.Scale(domain=['Total', 'Casual', 'Registered'],
+                                                  range=['#3498db', *USER_COLORS])),
+        opacity=alt.condition(toggle, alt.value(1.0), alt.value(0.15)),
+        tooltip=[alt.Tooltip('Periode:T'), 'Seri:N', alt.Tooltip('Penyewaan:Q', format=',.0f')]
+    )
+    return _with_selection(chart, toggle).interactive()
+
+
+def rolling_line(rolling):
+    series = {'cnt': 'Harian', 'ma7': 'Rata-rata 7 Hari', 'ma28': 'Rata-rata 28 Hari'}
+    frame = (rolling[list(series)].rename(columns=series).rename_axis('Tanggal').reset_index()
+             .melt(id_vars='Tanggal', var_name='Seri', value_name='Penyewaan'))
+    toggle = _legend_toggle('Seri')
+    lines = alt.Chart(frame).mark_line().encode(
+        x=alt.X('Tanggal:T', title='Tanggal'),
+        y=alt.Y('Penyewaan:Q', title='Rata-rata Penyewaan/Hari'),
+        color=alt.Color('Seri:N', scale=alt.Scale(domain=list(series.values()),
+                                                  range=['#95a5a6', '#3498db', '#e74c3c'])),
+        opacity=alt.condition(toggle, alt.value(1.0), alt.value(0.15)),
+        tooltip=[alt.Tooltip('Tanggal:T'), 'Seri:N', alt.Tooltip('Penyewaan:Q', format=',.0f')]
+    )
+    share = alt.Chart(rolling['casual_share'].rename('Share').rename_axis('Tanggal').reset_index()).mark_line(
+        color='#f39c12', strokeDash=[4, 3]
+    ).encode(
+        x='Tanggal:T', y=alt.Y('Share:Q', title='Share Casual 28 Hari', axis=alt.Axis(format='%')),
+        tooltip=[alt.Tooltip('Tanggal:T'), alt.Tooltip('Share:Q', title='Share Casual', format='.1%')]
+    )
+    chart = alt.layer(_with_selection(lines, toggle), share, title='Rata-rata Bergerak Penyewaan & Share Casual')
+    return chart.resolve_scale(y='independent').interactive()
+
+
+def weather_users_bar(by_weather, title, ylabel, color):
+    return _bar(_series_frame(by_weather, 'Cuaca', 'Rata-rata'), 'Cuaca', 'Rata-rata',
+                title, None, ylabel, [color] * len(by_weather))
+
+
+def cluster_top_barh(cluster_means):
+    frame = _series_frame(cluster_means, 'Kondisi', 'Rata-rata')
+    base = alt.Chart(frame).encode(y=alt.Y('Kondisi:N', sort=None, title=None))
+    bars = base.mark_bar(color='#3498db').encode(
+        x=alt.X('Rata-rata:Q', title='Rata-rata Penyewaan'),
+        tooltip=['Kondisi:N', alt.Tooltip('Rata-rata:Q', format=',.0f')]
+    )
+    return bars + base.mark_text(align='left', dx=4, fontWeight='bold').encode(
+        x='Rata-rata:Q', text=alt.Text('Rata-rata:Q', format='.0f')
+    )
+
+
+def cluster_heatmap(heatmap_data):
+    return _heatmap(heatmap_data, 'Kualitas Cuaca', 'Level Suhu', 'Avg Rentals', 'redyellowgreen', '.0f').properties(
+        title='Rata-rata Penyewaan (Suhu × Cuaca)'
+    )
+
+
+SPECS = {
+    'overview_corr_day': partial(corr_heatmap, title='Correlation Matrix - Daily Data'),
+    'overview_corr_hour': partial(corr_heatmap, title='Correlation Matrix - Hourly Data'),
+    'season_bar': season_bar,
+    'temp_scatter_daily': temp_scatter_daily,
+    'weather_mean_bar': weather_mean_bar,
+    'demand_level_bar': demand_level_bar,
+    'demand_temp_bar': demand_temp_bar,
+    'daytype_bar': daytype_bar,
+    'daytype_users_bar': daytype_users_bar,
+    'weekday_hourly_line': weekday_hourly_line,
+    'weekend_hourly_line': weekend_hourly_line,
+    'users_pie': users_pie,
+    'users_monthly_line': users_monthly_line,
+    'trend_line': trend_line,
+    'rolling_line': rolling_line,
+    'weather_casual_bar': partial(weather_users_bar, title='Casual Users per Kondisi Cuaca',
+                                  ylabel='Rata-rata Casual', color='#f39c12'),
+    'weather_registered_bar': partial(weather_users_bar, title='Registered Users per Kondisi Cuaca',
+                                      ylabel='Rata-rata Registered', color='#2ecc71'),
+    'cluster_top_barh': cluster_top_barh,
+    'cluster_heatmap': cluster_heatmap,
+}
@@ -0,0 +1,213 @@
+"""
+Graph analisis Bike Sharing yang dipakai bersama dashboard & notebook.
+
+Source graph:
+    dataset  LiveDataset (fingerprint = versi data, hash isi CSV)
+    season   tuple kode musim terpilih
+    weather  tuple kode cuaca terpilih
+    dates    None (semua tanggal) atau (start, stop) rentang [start, stop)
+
+Tanpa rentang tanggal, moment, slice cube, dan threshold demand diambil dari
+struktur pra-agregasi per sel (season x weathersit). Dengan rentang tanggal
+struktur itu tidak cukup (tidak punya dimensi waktu), jadi node yang sama
+menghitungnya dari baris hasil filter (time index + bitmap index).
+
+Node turunan (filter, moment, slice cube, agregasi halaman) mendeklarasikan
+input-nya sendiri, sehingga misalnya period_moments (hanya bergantung pada
+hour_filtered -> dataset + season) tetap hit saat filter cuaca berubah.
+Kolom turunan per baris (temp_category, hour_category, day_type, temp_level,
+weather_quality, condition_cluster) sudah dihitung sekali di data layer
+(datastore.add_derived_columns) dan ikut tersimpan di store.
+
+Metrik rolling (rata-rata 7/28 hari, share casual, selisih minggu-ke-minggu)
+dibaca dari prefix sum harian (rolling.py); rentang tanggal hanya menentukan
+titik output, jadi prefix tidak dibangun ulang saat rentang berubah.
+
+Contoh (notebook):
+    import sys; sys.path.insert(0, 'dashboard')
+    from analysis import build_graph
+    from dataset import LiveDataset
+    graph = build_graph()
+    inputs = {'dataset': LiveDataset('data'), 'season': (1, 2, 3, 4), 'weather': (1, 2, 3),
+              'dates': ('2012-06-01', '2012-07-01')}
+    clusters = graph.compute('condition_clusters', inputs)
+    graph.stats_frame()
+"""
+import numpy as np
+import pandas as pd
+
+from backend import make_backend
+from cube import build_cube, filter_cube
+from dataset import CUBE_DIMS, TIME_UNIT
+from datastore import HOUR_CATEGORIES
+from graph import DEFAULT_MAX_BYTES, Graph
+from pyramid import DEFAULT_MAX_POINTS
+from rolling import PrefixSums
+from sketch import merge_sketches
+from stats import Moments, grouped_moments, merge_all
+
+DEMAND_LEVELS = ['Low Demand', 'Medium Demand', 'High Demand']
+
+
+def _where(season, weather=None, dates=None):
+    where = {'season': list(season)}
+    if weather is not None:
+        where['weathersit'] = list(weather)
+    if dates is not None:
+        where['dteday'] = slice(*dates)
+    return where
+
+
+def _select(state, dates, **criteria):
+    mask = state.index.select(**criteria)
+    if dates is not None:
+        # Rentang tanggal: dua binary search di time index, lalu AND dengan mask bitmap
+        mask = state.time_index.restrict(mask, *dates)
+    return state.take(mask)
+
+
+def build_graph(cache=None, max_entries=256, max_bytes=DEFAULT_MAX_BYTES):
+    graph = Graph(cache, max_entries, max_bytes)
+    graph.source('dataset', fingerprint=lambda dataset: dataset.version)
+    graph.source('season')
+    graph.source('weather')
+    graph.source('dates')
+
+    # Filter lewat bitmap index & time index (frame hasil filter read-only, jangan dimutasi).
+    # Frame hasil filter tidak disimpan di memo (memo=False): salinannya per kombinasi filter akan
+    # mendominasi memo, sedangkan agregat hilirnya (moment, slice cube, dst.) tetap di-memoize
+    @graph.node('day_filtered', inputs=['dataset', 'season', 'weather', 'dates'], memo=False)
+    def day_filtered(dataset, season, weather, dates):
+        return _select(dataset.tables['day'], dates, season=season, weathersit=weather)
+
+    @graph.node('hour_filtered', inputs=['dataset', 'season', 'dates'], memo=False)
+    def hour_filtered(dataset, season, dates):
+        return _select(dataset.tables['hour'], dates, season=season)
+
+    # Korelasi/regresi: gabungkan akumulator moment per sel (season, weathersit) yang terpilih
+    @graph.node('day_moments', inputs=['dataset', 'season', 'weather', 'dates', 'day_filtered'])
+    def day_moments(dataset, season, weather, dates, day_filtered):
+        state = dataset.tables['day']
+        if dates is not None:
+            return Moments.from_frame(day_filtered, state.moment_columns)
+        return merge_all(
+            [m for (s, w), m in state.moments.items() if s in season and w in weather], state.moment_columns
+        )
+
+    @graph.node('hour_moments', inputs=['dataset', 'season', 'dates', 'hour_filtered'])
+    def hour_moments(dataset, season, dates, hour_filtered):
+        state = dataset.tables['hour']
+        if dates is not None:
+            return Moments.from_frame(hour_filtered, state.moment_columns)
+        return merge_all([m for (s, w), m in state.moments.items() if s in season], state.moment_columns)
+
+    # Slice cube dengan filter yang sama, dipakai untuk semua agregasi aditif
+    @graph.node('day_cube_filtered', inputs=['dataset', 'season', 'weather', 'dates', 'day_filtered'])
+    def day_cube_filtered(dataset, season, weather, dates, day_filtered):
+        if dates is not None:
+            return build_cube(day_filtered, CUBE_DIMS['day'])
+        return filter_cube(dataset.tables['day'].cube, seasons=list(season), weathers=list(weather))
+
+    @graph.node('hour_cube_filtered', inputs=['dataset', 'season', 'dates', 'hour_filtered'])
+    def hour_cube_filtered(dataset, season, dates, hour_filtered):
+        if dates is not None:
+            return build_cube(hour_filtered, CUBE_DIMS['hour'])
+        return filter_cube(dataset.tables['hour'].cube, seasons=list(season))
+
+    # Backend query (DuckDB / pandas) satu per versi data
+    @graph.node('backend', inputs=['dataset'])
+    def backend(dataset):
+        return make_backend(dataset)
+
+    # Agregasi yang memindai baris: hasilnya juga disimpan di cache persisten
+    @graph.node('avg_by_temp', inputs=['backend', 'season', 'weather', 'dates'], persist=True)
+    def avg_by_temp(backend, season, weather, dates):
+        result = backend.aggregate('day', ['temp_category'], {'cnt': ('cnt', 'mean')}, _where(season, weather, dates))
+        return result['cnt'].sort_values(ascending=False)
+
+    @graph.node('demand_levels', inputs=['dataset', 'backend', 'season', 'weather', 'dates'], persist=True)
+    def demand_levels(dataset, backend, season, weather, dates):
+        """(q1, q2, frame jumlah hari & rata-rata suhu per level demand)."""
+        where = _where(season, weather, dates)
+        if dates is not None:
+            # Sketch per sel tidak punya dimensi waktu: quantile langsung dari baris dalam rentang
+            q1, q2, top = backend.quantiles('day', 'cnt', [0.33, 0.67, 1.0], where)
+        else:
+            # Threshold dari gabungan sketch quantile sel filter (tanpa mengurutkan baris)
+            demand_sketch = merge_sketches(
+                [sk for (s, w), sk in dataset.tables['day'].sketches.items() if s in season and w in weather]
+            )
+            (q1, q2), top = demand_sketch.quantiles([0.33, 0.67]), demand_sketch.max
+        if np.isnan([q1, q2, top]).any():
+            # Seleksi kosong (mis. rentang tanggal + cuaca tanpa baris): tidak ada threshold untuk binning
+            empty = pd.DataFrame({'days': 0, 'temp_celsius': np.nan},
+                                 index=pd.CategoricalIndex(DEMAND_LEVELS, categories=DEMAND_LEVELS, ordered=True,
+                                                           name='demand_level'))
+            return np.nan, np.nan, empty
+        # Jumlah hari & rata-rata suhu per level dalam satu pass binning
+        levels = backend.aggregate_bins('day', 'cnt', [0, q1, q2, top], DEMAND_LEVELS,
+                                        {'days': ('cnt', 'count'), 'temp_celsius': ('temp_celsius', 'mean')},
+                                        where).rename_axis('demand_level')
+        return q1, q2, levels
+
+    @graph.node('condition_clusters', inputs=['backend', 'season', 'weather', 'dates'], persist=True)
+    def condition_clusters(backend, season, weather, dates):
+        cluster_analysis = backend.aggregate('day', ['condition_cluster'], {
+            'cnt_count': ('cnt', 'count'),
+            'cnt_mean': ('cnt', 'mean'),
+            'casual_mean': ('casual', 'mean'),
+            'registered_mean': ('registered', 'mean')
+        }, _where(season, weather, dates))
+        return cluster_analysis.sort_values('cnt_mean', ascending=False)
+
+    @graph.node('cluster_heatmap', inputs=['backend', 'season', 'weather', 'dates'], persist=True)
+    def cluster_heatmap(backend, season, weather, dates):
+        result = backend.aggregate('day', ['temp_level', 'weather_quality'], {'cnt': ('cnt', 'mean')},
+                                   _where(season, weather, dates))
+        return result['cnt'].unstack()
+
+    # Prefix sum harian: tanpa filter musim/cuaca memakai prefix tabel (di-update inkremental saat
+    # append), dengan filter dibangun sekali per kombinasi filter dari baris terpilih
+    @graph.node('day_prefix', inputs=['dataset', 'season', 'weather'])
+    def day_prefix(dataset, season, weather):
+        state = dataset.tables['day']
+        mask = state.index.select(season=season, weathersit=weather)
+        if mask.all():
+            return state.prefix
+        return PrefixSums.from_frame(state.take(mask), TIME_UNIT['day'])
+
+    @graph.node('rolling_trend', inputs=['day_prefix', 'dates'])
+    def rolling_trend(day_prefix, dates):
+        """Penyewaan harian, rata-rata 7 & 28 hari, dan share casual 28 hari per titik dalam rentang."""
+        ends = day_prefix.ends(*(dates or (None, None)), max_points=DEFAULT_MAX_POINTS)
+        return pd.DataFrame({
+            'cnt': day_prefix.mean(ends, 1),
+            'ma7': day_prefix.mean(ends, 7),
+            'ma28': day_prefix.mean(ends, 28),
+            'casual_share': day_prefix.share(ends, 28),
+        })
+
+    @graph.node('rolling_kpis', inputs=['day_prefix', 'dates'])
+    def rolling_kpis(day_prefix, dates):
+        """KPI jendela yang berakhir di hari terakhir rentang beserta nilai jendela sebelumnya (None kalau kosong)."""
+        lo, hi = day_prefix.bounds(*(dates or (None, None)))
+        if hi == lo:
+            return None
+        end = hi - 1
+        return {
+            'end': day_prefix.periods([end])[0],
+            'ma7': day_prefix.mean([end], 7).iloc[0],
+            'ma7_prev': day_prefix.mean([end - 7], 7).iloc[0],
+            'ma28': day_prefix.mean([end], 28).iloc[0],
+            'ma28_prev': day_prefix.mean([end - 28], 28).iloc[0],
+            'share7': day_prefix.share([end], 7).iloc[0],
+            'share7_prev': day_prefix.share([end - 7], 7).iloc[0],
+        }
+
+    # Regresi & korelasi per periode dari akumulator moment (satu pass untuk semua periode)
+    @graph.node('period_moments', inputs=['hour_filtered'], persist=True)
+    def period_moments(hour_filtered):
+        codes = hour_filtered['hour_category'].cat.codes.to_numpy()
+        return grouped_moments(hour_filtered, ['temp_celsius', 'cnt'], codes, len(HOUR_CATEGORIES))
+
+    return graph
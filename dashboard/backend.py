@@ -0,0 +1,209 @@
+"""
+Backend query untuk agregasi halaman yang memindai baris.
+
+Agregasi aditif dijawab oleh cube (cube.py); agregasi lain (group-by kolom
+turunan, pivot, quantile, binning) ditulis sekali terhadap interface backend
+ini:
+
+    aggregate(table, by, aggs, where)                     -> DataFrame per grup
+    quantiles(table, column, qs, where)                   -> list float
+    aggregate_bins(table, column, edges, labels, aggs, where) -> DataFrame per bin
+
+aggs berbentuk {kolom_output: (kolom, fungsi)} dengan fungsi count / sum /
+mean / min / max, where berbentuk {kolom: [kode]} atau {'dteday': slice(start,
+stop)} untuk rentang tanggal [start, stop). DuckDBBackend menjalankan
+SQL vektor multi-core langsung di atas store Arrow yang di-memory-map (filter
+di-push down ke scan), PandasBackend memakai frame in-memory + bitmap index
+dan menjadi fallback kalau duckdb tidak terpasang.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from datastore import store_dir
+
+AGG_FUNCS = ('count', 'sum', 'mean', 'min', 'max')
+SQL_FUNCS = {'count': 'COUNT', 'sum': 'SUM', 'mean': 'AVG', 'min': 'MIN', 'max': 'MAX'}
+
+
+def _check_aggs(aggs):
+    for out, (column, func) in aggs.items():
+        if func not in AGG_FUNCS:
+            raise ValueError(f"Fungsi agregasi tidak dikenal: {func}")
+
+
+def _empty_bins(column, labels, aggs):
+    """Hasil aggregate_bins tanpa bin (mis. edge NaN dari quantile seleksi kosong)."""
+    index = pd.CategoricalIndex([], categories=labels, ordered=True, name=column)
+    return pd.DataFrame({out: pd.Series(dtype='float64') for out in aggs}, index=index)
+
+
+def _finite_edges(edges):
+    return bool(np.isfinite(np.asarray(edges, dtype='float64')).all())
+
+
+class PandasBackend:
+    name = 'pandas'
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def _rows(self, table, where):
+        state = self.dataset.tables[table]
+        if not where:
+            return state.frame
+        indexed = {col: values for col, values in where.items() if col in state.index.columns}
+        mask = state.index.select(**indexed)
+        for col, values in where.items():
+            if isinstance(values, slice):
+                # Rentang waktu lewat binary search di time index
+                mask = state.time_index.restrict(mask, values.start, values.stop)
+            elif col not in indexed:
+                mask &= state.segments.isin(col, values)
+        return state.take(mask)
+
+    def aggregate(self, table, by, aggs, where=None):
+        _check_aggs(aggs)
+        df = self._rows(table, where)
+        if by:
+            return df.groupby(by, observed=True).agg(**aggs)
+        return pd.DataFrame({out: [df[column].agg(func)] for out, (column, func) in aggs.items()})
+
+    def quantiles(self, table, column, qs, where=None):
+        return [float(v) for v in self._rows(table, where)[column].quantile(qs)]
+
+    def aggregate_bins(self, table, column, edges, labels, aggs, where=None):
+        _check_aggs(aggs)
+        if not _finite_edges(edges):
+            return _empty_bins(column, labels, aggs)
+        df = self._rows(table, where)
+        # Semantik pd.cut(include_lowest=True), tapi edge boleh kembar (mis. rentang satu hari):
+        # nilai jatuh ke bin pertama yang batas atasnya >= nilai, sama dengan CASE di DuckDB
+        values = df[column].to_numpy(dtype='float64')
+        codes = np.searchsorted(np.asarray(edges[1:], dtype='float64'), values, side='left')
+        codes[(values < edges[0]) | (values > edges[-1]) | np.isnan(values)] = -1
+        bins = pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+        return df.groupby(bins, observed=True).agg(**aggs).rename_axis(column)
+
+
+class DuckDBBackend:
+    name = 'duckdb'
+
+    def __init__(self, dataset, threads=None):
+        import duckdb
+        self.dataset = dataset
+        self.con = duckdb.connect()
+        if threads:
+            self.con.execute(f'SET threads = {int(threads)}')
+        self._registered = {}
+        # Satu koneksi dipakai bersama sesi; DuckDB sendiri tetap paralel per query
+        self._lock = threading.Lock()
+
+    def _source(self, table):
+        """Store Arrow (mmap, zero-copy) untuk tabel, atau frame in-memory kalau store tidak ada."""
+        state = self.dataset.tables[table]
+        paths = [os.path.join(store_dir(self.dataset.data_dir), seg) for seg in state.manifest.get('segments', [])]
+        if paths and all(os.path.exists(p) for p in paths):
+            tables = []
+            for path in paths:
+                with pa.memory_map(path, 'r') as source:
+                    tables.append(pa.ipc.open_file(source).read_all())
+            return pa.concat_tables(tables)
+        return state.frame
+
+    def _ensure_registered(self, table):
+        manifest = self.dataset.tables[table].manifest
+        if self._registered.get(table) is not manifest:
+            # Data berubah (append / reload): daftarkan ulang view tabel
+            self.con.register(table, self._source(table))
+            self._registered[table] = manifest
+
+    def _where_sql(self, where):
+        clauses = []
+        for col, values in (where or {}).items():
+            if isinstance(values, slice):
+                if values.start is not None:
+                    clauses.append(f'"{col}" >= TIMESTAMP \'{pd.Timestamp(values.start)}\'')
+                if values.stop is not None:
+                    clauses.append(f'"{col}" < TIMESTAMP \'{pd.Timestamp(values.stop)}\'')
+                continue
+            values = [int(v) for v in values]
+            clauses.append(f'"{col}" IN ({", ".join(map(str, values))})' if values else 'FALSE')
+        return f'WHERE {" AND ".join(clauses)}' if clauses else ''
+
+    def _query(self, table, sql, params=None):
+        with self._lock:
+            self._ensure_registered(table)
+            return self.con.execute(sql, params).df() if params else self.con.execute(sql).df()
+
+    def _select_aggs(self, aggs):
+        _check_aggs(aggs)
+        return ', '.join(f'{SQL_FUNCS[func]}("{column}") AS "{out}"' for out, (column, func) in aggs.items())
+
+    def _restore_dtypes(self, table, result, columns):
+        # Kolom grup dikembalikan ke dtype frame (categorical) supaya urutan sama dengan pandas
+        dtypes = self.dataset.tables[table].segments.dtypes
+        for col in columns:
+            result[col] = result[col].astype(dtypes[col])
+        return result.set_index(columns).sort_index()
+
+    def aggregate(self, table, by, aggs, where=None):
+        select = self._select_aggs(aggs)
+        if not by:
+            return self._query(table, f'SELECT {select} FROM "{table}" {self._where_sql(where)}')
+        group = ', '.join(f'"{col}"' for col in by)
+        result = self._query(
+            table, f'SELECT {group}, {select} FROM "{table}" {self._where_sql(where)} GROUP BY {group}'
+        )
+        return self._restore_dtypes(table, result, list(by))
+
+    def quantiles(self, table, column, qs, where=None):
+        qs_sql = ', '.join(str(float(q)) for q in qs)
+        result = self._query(
+            table, f'SELECT quantile_cont("{column}", [{qs_sql}]) AS q FROM "{table}" {self._where_sql(where)}'
+        )
+        values = result['q'].iloc[0]
+        # Tanpa baris terpilih DuckDB mengembalikan NULL, pandas NaN
+        if not isinstance(values, (list, np.ndarray)):
+            return [np.nan] * len(qs)
+        return [float(v) for v in values]
+
+    def aggregate_bins(self, table, column, edges, labels, aggs, where=None):
+        # Edge NaN (quantile seleksi kosong) tidak punya bin; NaN di DuckDB lebih besar dari semua angka
+        if not _finite_edges(edges):
+            _check_aggs(aggs)
+            return _empty_bins(column, labels, aggs)
+        # Sama dengan pd.cut(include_lowest=True): bin pertama [e0, e1], berikutnya (e_i, e_i+1].
+        # Edge dikirim sebagai parameter query, bukan ditempel ke SQL.
+        cases = [f'WHEN "{column}" >= ? AND "{column}" <= ? THEN 0']
+        cases += [f'WHEN "{column}" > ? AND "{column}" <= ? THEN {i}' for i in range(1, len(edges) - 1)]
+        params = [float(v) for i in range(len(edges) - 1) for v in (edges[i], edges[i + 1])]
+        bin_sql = f'CASE {" ".join(cases)} END'
+        result = self._query(
+            table,
+            f'SELECT * FROM (SELECT {bin_sql} AS bin, {self._select_aggs(aggs)} FROM "{table}" '
+            f'{self._where_sql(where)} GROUP BY bin) WHERE bin IS NOT NULL ORDER BY bin',
+            params
+        )
+        index = pd.CategoricalIndex(
+            np.asarray(labels)[result.pop('bin').astype('int64')], categories=labels, ordered=True, name=column
+        )
+        return result.set_index(index)
+
+
+def make_backend(dataset, name=None):
+    """
+    Backend sesuai env BIKE_QUERY_BACKEND (duckdb / pandas). Default duckdb
+    kalau terpasang, selain itu pandas.
+    """
+    name = name or os.environ.get('BIKE_QUERY_BACKEND', 'auto')
+    if name in ('duckdb', 'auto'):
+        try:
+            return DuckDBBackend(dataset)
+        except ImportError:
+            if name == 'duckdb':
+                raise
+    return PandasBackend(dataset)
@@ -0,0 +1,381 @@
+"""
+Renderer chart murni: data -> Figure / PNG bytes.
+
+Setiap chart dashboard adalah fungsi yang hanya menerima data hasil agregasi
+(Series / DataFrame / array kecil yang bisa di-pickle) dan tidak menyentuh
+state Streamlit, sehingga bisa dijalankan di worker process pool. Dashboard
+cukup mengirim chart id + data ke render_png() lewat executor.
+"""
+import time
+import warnings
+from functools import partial
+
+import numpy as np
+
+from lazy import LazyModule
+from palette import DEMAND_COLORS, PERIOD_COLORS, SEASON_COLORS, USER_COLORS, WEATHER_COLORS, WEATHER_ORDER
+from render import figure_to_png, pyplot
+
+plt = pyplot()
+from matplotlib.colors import LinearSegmentedColormap, LogNorm  # noqa: E402
+# seaborn (dan scipy di belakangnya) hanya di-import oleh chart heatmap / boxplot
+sns = LazyModule('seaborn')
+warnings.filterwarnings('ignore')  # Sama dengan dashboard.py, juga berlaku di worker process
+
+
+def corr_heatmap(corr, title):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax, fmt='.2f', cbar_kws={'shrink': 0.8})
+    ax.set_title(title)
+    return fig
+
+
+def season_bar(rentals_by_season):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.bar(rentals_by_season.index, rentals_by_season.values, color=SEASON_COLORS)
+    ax.set_title('Total Penyewaan Sepeda per Musim', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Musim', fontsize=12)
+    ax.set_ylabel('Total Penyewaan', fontsize=12)
+    ax.grid(axis='y', alpha=0.3)
+
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{int(height):,}',
+               ha='center', va='bottom', fontsize=10, fontweight='bold')
+
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    return fig
+
+
+def temp_scatter_daily(temp, cnt, slope, intercept):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.scatter(temp, cnt, alpha=0.5, s=30)
+
+    # Regression line
+    ax.plot(temp, intercept + slope * np.asarray(temp), "r-", linewidth=2)
+
+    ax.set_title('Pengaruh Suhu terhadap Total Penyewaan Harian', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Suhu (°C)', fontsize=12)
+    ax.set_ylabel('Total Penyewaan', fontsize=12)
+    ax.grid(alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def temp_by_period(categories, panels, fits, x_range, y_range, density):
+    """
+    Grid 2x2 suhu vs penyewaan per periode.
+
+    panels berisi raster density per periode (density=True) atau pasangan
+    (x, y) titik mentah; fits berisi (slope, intercept, korelasi) atau None.
+    """
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    fig.suptitle('Pengaruh Suhu terhadap Penyewaan per Periode Waktu', fontsize=16, fontweight='bold')
+
+    for idx, (category, color) in enumerate(zip(categories, PERIOD_COLORS)):
+        ax = axes[idx // 2, idx % 2]
+
+        if density:
+            grid = np.ma.masked_equal(panels[idx], 0)
+            cmap = LinearSegmentedColormap.from_list(f'density_{idx}', ['#ffffff', color])
+            if grid.count() > 0:
+                ax.imshow(grid, origin='lower', aspect='auto', cmap=cmap,
+                          extent=[*x_range, *y_range], norm=LogNorm(vmin=1))
+            ax.set_xlim(*x_range)
+            ax.set_ylim(*y_range)
+        else:
+            x, y = panels[idx]
+            ax.scatter(x, y, alpha=0.3, s=20, color=color)
+
+        # Regression line
+        if fits[idx] is not None:
+            slope, intercept, corr = fits[idx]
+            x_line = np.array(x_range, dtype='float64')
+            ax.plot(x_line, intercept + slope * x_line, "r-", linewidth=2)
+
+            ax.text(0.05, 0.95, f'Korelasi: {corr:.3f}',
+                   transform=ax.transAxes,
+                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5),
+                   verticalalignment='top')
+
+        ax.set_title(f'Periode: {category}', fontsize=11, fontweight='bold')
+        ax.set_xlabel('Suhu (°C)', fontsize=10)
+        ax.set_ylabel('Total Penyewaan', fontsize=10)
+        ax.grid(alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def weather_mean_bar(mean_by_weather):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    bars = ax.bar(mean_by_weather.index, mean_by_weather.values, color=WEATHER_COLORS[:len(mean_by_weather)])
+    ax.set_title('Rata-rata Penyewaan per Kondisi Cuaca', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Kondisi Cuaca', fontsize=11)
+    ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(axis='y', alpha=0.3)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{int(height):,}',
+               ha='center', va='bottom', fontsize=9, fontweight='bold')
+
+    plt.tight_layout()
+    return fig
+
+
+def weather_boxplot(data):
+    """data: frame dengan kolom weather_name & cnt."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    weather_order = [w for w in WEATHER_ORDER if w in data['weather_name'].unique()]
+
+    sns.boxplot(
+        x='weather_name', y='cnt', data=data, ax=ax,
+        order=weather_order,
+        hue='weather_name', palette=WEATHER_COLORS[:len(weather_order)], legend=False
+    )
+    ax.set_title('Distribusi Penyewaan per Kondisi Cuaca', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Kondisi Cuaca', fontsize=11)
+    ax.set_ylabel('Total Penyewaan', fontsize=11)
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(axis='y', alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def demand_level_bar(demand_counts):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.bar(demand_counts.index, demand_counts.values, color=DEMAND_COLORS)
+    ax.set_title('Distribusi Jumlah Hari per Demand Level', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Jumlah Hari', fontsize=11)
+    ax.grid(axis='y', alpha=0.3)
+
+    for i, (label, value) in enumerate(demand_counts.items()):
+        ax.text(i, value + 2, str(value), ha='center', fontweight='bold')
+
+    plt.xticks(rotation=15)
+    plt.tight_layout()
+    return fig
+
+
+def demand_temp_bar(temp_by_demand):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.bar(range(len(temp_by_demand)), temp_by_demand.values, color=DEMAND_COLORS)
+    ax.set_title('Rata-rata Suhu per Demand Level', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Suhu (°C)', fontsize=11)
+    ax.set_xticks(range(len(temp_by_demand)))
+    ax.set_xticklabels(temp_by_demand.index, rotation=15)
+    ax.grid(axis='y', alpha=0.3)
+
+    for i, value in enumerate(temp_by_demand.values):
+        ax.text(i, value + 0.5, f'{value:.1f}°C', ha='center', fontweight='bold')
+
+    plt.tight_layout()
+    return fig
+
+
+def daytype_bar(avg_by_type):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    avg_by_type.plot(kind='bar', ax=ax, color=['#3498db', '#e74c3c'])
+    ax.set_title('Rata-rata Penyewaan: Weekday vs Weekend', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=0)
+    ax.grid(axis='y', alpha=0.3)
+
+    for i, (label, value) in enumerate(avg_by_type.items()):
+        ax.text(i, value + 100, f'{value:.0f}', ha='center', fontweight='bold')
+
+    plt.tight_layout()
+    return fig
+
+
+def daytype_users_bar(casual_reg_data):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    x = range(len(casual_reg_data))
+    width = 0.35
+    ax.bar([i - width/2 for i in x], casual_reg_data['casual'], width, label='Casual', color='#f39c12')
+    ax.bar([i + width/2 for i in x], casual_reg_data['registered'], width, label='Registered', color='#2ecc71')
+    ax.set_title('Casual vs Registered: Weekday vs Weekend', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
+    ax.set_xticks(x)
+    ax.set_xticklabels(casual_reg_data.index)
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def weekday_hourly_line(hourly):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.plot(hourly.index, hourly.values, marker='o', linewidth=2, color='#3498db')
+    ax.fill_between(hourly.index, hourly.values, alpha=0.3, color='#3498db')
+    ax.axvspan(7, 9, alpha=0.2, color='orange', label='Rush Pagi')
+    ax.axvspan(17, 19, alpha=0.2, color='red', label='Rush Sore')
+    ax.set_title('Pola Weekday - Commuting Pattern', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Jam', fontsize=11)
+    ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
+    ax.set_xticks(range(0, 24, 2))
+    ax.legend()
+    ax.grid(alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def weekend_hourly_line(hourly):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.plot(hourly.index, hourly.values, marker='o', linewidth=2, color='#e74c3c')
+    ax.fill_between(hourly.index, hourly.values, alpha=0.3, color='#e74c3c')
+    ax.set_title('Pola Weekend - Recreational Pattern', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Jam', fontsize=11)
+    ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
+    ax.set_xticks(range(0, 24, 2))
+    ax.grid(alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def users_pie(total_casual, total_registered):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sizes = [total_casual, total_registered]
+    explode = (0.1, 0)
+    ax.pie(sizes, explode=explode, labels=['Casual', 'Registered'],
+           autopct='%1.1f%%', colors=USER_COLORS, startangle=90, textprops={'fontsize': 12, 'fontweight': 'bold'})
+    ax.set_title('Proporsi Total Penyewaan', fontsize=14, fontweight='bold')
+    return fig
+
+
+def users_monthly_line(monthly_users):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.plot(monthly_users.index, monthly_users['casual'], marker='o', label='Casual', color='#f39c12', linewidth=2)
+    ax.plot(monthly_users.index, monthly_users['registered'], marker='s', label='Registered', color='#2ecc71', linewidth=2)
+    ax.set_title('Trend Bulanan: Casual vs Registered', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Bulan', fontsize=11)
+    ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
+    ax.legend()
+    ax.grid(alpha=0.3)
+    ax.set_xticks(range(1, 13))
+    plt.tight_layout()
+    return fig
+
+
+def trend_line(trend, level_label):
+    fig, ax = plt.subplots(figsize=(14, 5))
+    # Penanda titik hanya kalau periode sedikit (level kasar / rentang sempit)
+    marker = 'o' if len(trend) <= 60 else None
+    ax.plot(trend.index, trend['cnt'], marker=marker, label='Total', color='#3498db', linewidth=2)
+    ax.plot(trend.index, trend['casual'], marker=marker, label='Casual', color='#f39c12', linewidth=1.5)
+    ax.plot(trend.index, trend['registered'], marker=marker, label='Registered', color='#2ecc71', linewidth=1.5)
+    ax.set_title(f'Tren Penyewaan per {level_label}', fontsize=14, fontweight='bold')
+    ax.set_xlabel(level_label, fontsize=11)
+    ax.set_ylabel('Total Penyewaan', fontsize=11)
+    ax.legend()
+    ax.grid(alpha=0.3)
+    fig.autofmt_xdate()
+    plt.tight_layout()
+    return fig
+
+
+def rolling_line(rolling):
+    fig, ax = plt.subplots(figsize=(14, 5))
+    ax.plot(rolling.index, rolling['cnt'], label='Harian', color='#95a5a6', linewidth=1, alpha=0.6)
+    ax.plot(rolling.index, rolling['ma7'], label='Rata-rata 7 Hari', color='#3498db', linewidth=2)
+    ax.plot(rolling.index, rolling['ma28'], label='Rata-rata 28 Hari', color='#e74c3c', linewidth=2)
+    ax.set_title('Rata-rata Bergerak Penyewaan & Share Casual', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Tanggal', fontsize=11)
+    ax.set_ylabel('Rata-rata Penyewaan/Hari', fontsize=11)
+    ax.grid(alpha=0.3)
+    # Share casual di sumbu kanan (persen)
+    ax2 = ax.twinx()
+    ax2.plot(rolling.index, rolling['casual_share'] * 100, label='Share Casual 28 Hari', color='#f39c12',
+             linewidth=1.5, linestyle='--')
+    ax2.set_ylabel('Share Casual (%)', fontsize=11)
+    lines, labels = ax.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax.legend(lines + lines2, labels + labels2, loc='upper left')
+    fig.autofmt_xdate()
+    plt.tight_layout()
+    return fig
+
+
+def weather_users_bar(by_weather, title, ylabel, color):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.bar(range(len(by_weather)), by_weather.values, color=color)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=11)
+    ax.set_xticks(range(len(by_weather)))
+    ax.set_xticklabels(by_weather.index, rotation=15, ha='right', fontsize=9)
+    ax.grid(axis='y', alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def cluster_top_barh(cluster_means):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.barh(range(len(cluster_means)), cluster_means.values, color='#3498db')
+    ax.set_yticks(range(len(cluster_means)))
+    ax.set_yticklabels(cluster_means.index, fontsize=9)
+    ax.set_xlabel('Rata-rata Penyewaan', fontsize=11)
+    ax.grid(axis='x', alpha=0.3)
+    ax.invert_yaxis()
+
+    for i, value in enumerate(cluster_means.values):
+        ax.text(value + 50, i, f'{value:.0f}', va='center', fontweight='bold', fontsize=9)
+
+    plt.tight_layout()
+    return fig
+
+
+def cluster_heatmap(heatmap_data):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.heatmap(heatmap_data, annot=True, fmt='.0f', cmap='RdYlGn', ax=ax,
+               cbar_kws={'label': 'Avg Rentals'})
+    ax.set_title('Rata-rata Penyewaan (Suhu × Cuaca)', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Kualitas Cuaca', fontsize=11)
+    ax.set_ylabel('Level Suhu', fontsize=11)
+    plt.tight_layout()
+    return fig
+
+
+RENDERERS = {
+    'overview_corr_day': partial(corr_heatmap, title='Correlation Matrix - Daily Data'),
+    'overview_corr_hour': partial(corr_heatmap, title='Correlation Matrix - Hourly Data'),
+    'season_bar': season_bar,
+    'temp_scatter_daily': temp_scatter_daily,
+    'temp_scatter_hourly': partial(temp_by_period, density=False),
+    'temp_density_hourly': partial(temp_by_period, density=True),
+    'weather_mean_bar': weather_mean_bar,
+    'weather_boxplot': weather_boxplot,
+    'demand_level_bar': demand_level_bar,
+    'demand_temp_bar': demand_temp_bar,
+    'daytype_bar': daytype_bar,
+    'daytype_users_bar': daytype_users_bar,
+    'weekday_hourly_line': weekday_hourly_line,
+    'weekend_hourly_line': weekend_hourly_line,
+    'users_pie': users_pie,
+    'users_monthly_line': users_monthly_line,
+    'trend_line': trend_line,
+    'rolling_line': rolling_line,
+    'weather_casual_bar': partial(weather_users_bar, title='Casual Users per Kondisi Cuaca',
+                                  ylabel='Rata-rata Casual', color='#f39c12'),
+    'weather_registered_bar': partial(weather_users_bar, title='Registered Users per Kondisi Cuaca',
+                                      ylabel='Rata-rata Registered', color='#2ecc71'),
+    'cluster_top_barh': cluster_top_barh,
+    'cluster_heatmap': cluster_heatmap,
+}
+
+
+def render_png(chart_id, data):
+    """Render satu chart menjadi (PNG bytes, detik render); aman dipanggil di worker process."""
+    start = time.perf_counter()
+    fig = RENDERERS[chart_id](**data)
+    try:
+        png = figure_to_png(fig)
+    finally:
+        # Selalu tutup figure supaya tidak menumpuk di proses server / worker
+        plt.close(fig)
+    return png, time.perf_counter() - start
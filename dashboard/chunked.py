@@ -0,0 +1,76 @@
+"""
+Mode out-of-core untuk CSV berukuran multi-GB.
+
+CSV dibaca per chunk berukuran tetap; setiap chunk di-dedupe (terhadap hash
+baris yang sudah pernah dilihat), dibersihkan dengan clean_frame yang sama,
+lalu langsung ditulis sebagai record batch Arrow dan di-agregasi ke cube &
+akumulator moment yang mergeable. Memori puncak dibatasi ukuran chunk
+(ditambah 8 byte hash per baris unik untuk dedupe), dan hasil agregasinya
+sama dengan yang dihitung dashboard dari frame penuh.
+
+Jalankan:
+    python dashboard/chunked.py {day|hour} [--chunksize N] [data_dir]
+"""
+import argparse
+import os
+
+from cube import build_cube, merge_cubes
+from dataset import CUBE_DIMS, MOMENT_CELLS
+from datastore import (
+    DEFAULT_CHUNKSIZE, _clean_chunks, find_data_dir, new_manifest, store_path, write_manifest, write_store_chunks
+)
+from stats import moments_by, numeric_columns
+
+
+def merge_moment_cells(total, cells):
+    for key, m in cells.items():
+        total[key] = total[key].merge(m) if key in total else m
+    return total
+
+
+def stream_table(data_dir, name, chunksize=DEFAULT_CHUNKSIZE, write=True):
+    """
+    Proses satu tabel per chunk.
+
+    Mengembalikan dict berisi jumlah baris, cube, dan akumulator moment per
+    sel (season, weathersit) - agregat yang sama dengan yang dipegang
+    LiveDataset. Kalau write=True, store Arrow + manifest juga ditulis
+    batch demi batch (write_store_chunks, tanpa pemadatan supaya memori
+    tetap sebatas satu chunk) sehingga dashboard bisa langsung memakainya.
+    """
+    csv_path = os.path.join(data_dir, f'{name}.csv')
+    dims = CUBE_DIMS[name]
+    result = {'rows': 0, 'cube': None, 'moments': {}, 'moment_columns': None}
+
+    def aggregated(chunks):
+        for chunk in chunks:
+            if len(chunk):
+                result['rows'] += len(chunk)
+                columns = result['moment_columns'] = result['moment_columns'] or numeric_columns(chunk)
+                chunk_cube = build_cube(chunk, dims)
+                result['cube'] = chunk_cube if result['cube'] is None else merge_cubes(result['cube'], chunk_cube, dims)
+                merge_moment_cells(result['moments'], moments_by(chunk, MOMENT_CELLS, columns))
+            yield chunk
+
+    if write:
+        manifest = new_manifest(data_dir, name)
+        write_store_chunks(aggregated(_clean_chunks(csv_path, chunksize)), store_path(data_dir, name), compact=False)
+        write_manifest(data_dir, name, manifest)
+    else:
+        for _ in aggregated(_clean_chunks(csv_path, chunksize)):
+            pass
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ingest + agregasi CSV per chunk (out-of-core)")
+    parser.add_argument('table', choices=['day', 'hour'])
+    parser.add_argument('data_dir', nargs='?', default=None)
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--no-write', action='store_true', help="Hanya hitung agregat, tanpa menulis store")
+    args = parser.parse_args()
+
+    target_dir = args.data_dir or find_data_dir()
+    result = stream_table(target_dir, args.table, args.chunksize, write=not args.no_write)
+    print(f"{args.table}: {result['rows']:,} baris, {len(result['cube']):,} sel cube, "
+          f"{len(result['moments'])} sel moment")
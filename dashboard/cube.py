@@ -0,0 +1,95 @@
+"""
+OLAP cube pra-agregasi untuk filter dashboard.
+
+Cube menyimpan measure aditif (n, sum, sum of squares, max) untuk setiap
+kombinasi dimensi (season, weathersit, hr, weekday, workingday, mnth, yr).
+Halaman dashboard cukup memfilter cube lalu roll-up ke dimensi yang
+dibutuhkan, sehingga biaya rerun bergantung pada jumlah sel cube, bukan
+jumlah baris hour.csv.
+"""
+import numpy as np
+import pandas as pd
+
+DAY_DIMS = ['season', 'weathersit', 'weekday', 'workingday', 'mnth', 'yr']
+HOUR_DIMS = DAY_DIMS + ['hr']
+MEASURES = ['cnt', 'casual', 'registered', 'temp']
+
+WEEKEND_DAYS = [0, 6]
+
+
+def build_cube(df, dims, measures=MEASURES):
+    """Agregasi frame baris menjadi cube dengan measure n/sum/sumsq/max per sel."""
+    base = df[dims + measures].copy()
+    base['season'] = base['season'].astype('int64')
+    # Akumulasi selalu di float64 walaupun kolom sumbernya int8 / uint32 / float32
+    base[measures] = base[measures].astype('float64')
+    for m in measures:
+        base[f'{m}_sq'] = base[m] ** 2
+
+    agg = {'n': (measures[0], 'size')}
+    for m in measures:
+        agg[f'{m}_sum'] = (m, 'sum')
+        agg[f'{m}_sumsq'] = (f'{m}_sq', 'sum')
+        agg[f'{m}_max'] = (m, 'max')
+    cube = base.groupby(dims, observed=True, sort=False).agg(**agg).reset_index()
+
+    # Dimensi turunan dari weekday, tidak menambah jumlah sel
+    cube['day_type'] = np.where(cube['weekday'].isin(WEEKEND_DAYS), 'Weekend', 'Weekday')
+    return cube
+
+
+def merge_cubes(cube, delta, dims):
+    """Gabungkan cube delta (dari baris baru) ke cube lama; biaya sebanding jumlah sel."""
+    merged = pd.concat([cube, delta], ignore_index=True)
+    value_cols = [c for c in cube.columns if c not in dims and c != 'day_type']
+    agg = {c: ('max' if c.endswith('_max') else 'sum') for c in value_cols}
+    merged = merged.groupby(dims, observed=True, sort=False).agg(agg).reset_index()
+    merged['day_type'] = np.where(merged['weekday'].isin(WEEKEND_DAYS), 'Weekend', 'Weekday')
+    return merged
+
+
+def filter_cube(cube, seasons=None, weathers=None):
+    """Slice cube berdasarkan kode musim / cuaca (None = tanpa filter)."""
+    mask = np.ones(len(cube), dtype=bool)
+    if seasons is not None:
+        mask &= cube['season'].isin(seasons).to_numpy()
+    if weathers is not None:
+        mask &= cube['weathersit'].isin(weathers).to_numpy()
+    return cube[mask]
+
+
+def rollup(cube, by=None, measures=('cnt',), stats=('mean',)):
+    """
+    Roll-up cube ke dimensi `by` (None = grand total).
+
+    Statistik yang didukung: count, sum, mean, std (ddof=1, sama dengan pandas), max.
+    Hasilnya DataFrame dengan kolom '<measure>_<stat>', atau kolom '<stat>'
+    kalau hanya satu measure yang diminta.
+    """
+    cols = ['n'] + [f'{m}_{s}' for m in measures for s in ('sum', 'sumsq', 'max')]
+    if by:
+        grouped = cube.groupby(by, observed=True)
+        totals = grouped[[c for c in cols if not c.endswith('_max')]].sum()
+        totals = totals.join(grouped[[c for c in cols if c.endswith('_max')]].max())
+    else:
+        totals = cube[cols].agg({c: ('max' if c.endswith('_max') else 'sum') for c in cols}).to_frame().T
+
+    n = totals['n'].astype('float64')
+    out = pd.DataFrame(index=totals.index)
+    for m in measures:
+        s, ss = totals[f'{m}_sum'].astype('float64'), totals[f'{m}_sumsq']
+        for stat in stats:
+            if stat == 'count':
+                value = totals['n']
+            elif stat == 'sum':
+                value = totals[f'{m}_sum']
+            elif stat == 'mean':
+                value = s / n
+            elif stat == 'std':
+                value = np.sqrt(((ss - s * s / n) / (n - 1)).clip(lower=0))
+            elif stat == 'max':
+                value = totals[f'{m}_max']
+            else:
+                raise ValueError(f"Statistik tidak dikenal: {stat}")
+            out[stat if len(measures) == 1 else f'{m}_{stat}'] = value
+    return out
@@ -1,12 +1,29 @@
+import importlib.machinery
+# Streamlit menjalankan script ini sebagai modul __main__ tanpa spec. Worker render spawn
+# (render.py) menjalankan ulang __main__ tanpa spec saat bootstrap; spec bernama '__main__'
+# membuat bootstrap itu dilewati, cukup di namespace script tanpa menyentuh sys.modules.
+__spec__ = importlib.machinery.ModuleSpec('__main__', None)
 import pandas as pd
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend untuk Streamlit Cloud
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-import numpy as np
+import os
 import warnings
+from datastore import find_data_dir, SEASON_LABELS, WEATHER_LABELS, HOUR_CATEGORIES
+from dataset import LiveDataset
+from cube import rollup
+from render import FigureCache, ParallelRenderer, make_render_pool
+from density import bin_density
+from stats import merge_all
+from profiling import RunProfile, StageStats
+from lazy import IMPORT_TIMES, LazyModule, run_in_background, timed_import
+from persist import open_cache
+from pyramid import LEVEL_LABELS
+from analysis import build_graph
 warnings.filterwarnings('ignore')
+# Spec chart interaktif (altair) baru di-import kalau mode interaktif dipakai
+altair_charts = LazyModule('altair_charts')
+
+# Di atas jumlah baris ini scatter per jam otomatis memakai mode density
+DENSITY_THRESHOLD = 50_000
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -16,6 +33,29 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Profiling per stage (load, filter, agregasi, chart). Aktif lewat env BIKE_PROFILE=1,
+# BIKE_PROFILE_METRICS=<path file .prom>, atau URL ?debug=1 (sekaligus menampilkan panel debug).
+debug_mode = st.query_params.get('debug') == '1'
+metrics_path = os.environ.get('BIKE_PROFILE_METRICS')
+profile = RunProfile(enabled=debug_mode or bool(metrics_path) or os.environ.get('BIKE_PROFILE') == '1')
+
+# Fast start: saat proses pertama kali menjalankan script, dataset mulai dimuat dan library
+# plotting (matplotlib, seaborn) mulai di-import di thread background, sementara header &
+# sidebar sudah di-render. Tanpa warm-up, plotting baru di-import saat chart pertama.
+# Agregat turunan & PNG chart juga disimpan di cache persisten (SQLite di data/store) yang
+# dipakai bersama replika lain & notebook, sehingga request pertama setelah restart tetap cepat.
+@st.cache_resource
+def start_warmup():
+    data_dir = find_data_dir()
+    cache = open_cache(data_dir) if data_dir else None
+    return {
+        'cache': cache,
+        'dataset': run_in_background(LiveDataset, data_dir, cache, name='warmup-dataset') if data_dir else None,
+        'plotting': run_in_background(timed_import, 'charts', name='warmup-plotting'),
+    }
+
+warmup = start_warmup()
+
 # Custom CSS
 st.markdown("""
     <style>
@@ -69,124 +109,289 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("### Filter Data")
     
-# Load data dengan path yang fleksibel
-@st.cache_data
-def load_data():
-    import os
-    
-    # Coba beberapa kemungkinan path
-    possible_paths = [
-        'data/day.csv',  # Untuk Streamlit Cloud (root repo)
-        './data/day.csv',
-        '../data/day.csv',
-        os.path.join(os.path.dirname(__file__), '..', 'data', 'day.csv'),  # Relative to dashboard.py
-    ]
+profile.context['page'] = page
     
-    day_df = None
-    hour_df = None
-    
-    for path in possible_paths:
+# Load data dari store kolumnar (fallback ke CSV kalau store belum ada / usang).
+# Dataset read-only dipegang sekali per proses dan dibagi ke semua sesi (kolom numerik
+# zero-copy dari file store yang di-mmap); refresh() hanya membaca segment baru hasil append.
+# State per sesi hanya pilihan filter + selection mask dari bitmap index.
+@st.cache_resource
+def load_data():
+    if warmup['dataset'] is not None:
         try:
-            day_df = pd.read_csv(path)
-            hour_df = pd.read_csv(path.replace('day.csv', 'hour.csv'))
-            break
-        except Exception as e:
-            continue
+            return warmup['dataset'].result()
+        except Exception:
+            # Warm-up gagal (mis. CSV sedang ditulis): jangan simpan Future gagal itu selamanya,
+            # load ulang secara sinkron di bawah; rerun berikutnya memulai warm-up baru
+            start_warmup.clear()
+
+    data_dir = find_data_dir()
     
-    if day_df is None:
+    if data_dir is None:
         st.error("❌ File data tidak ditemukan! Pastikan file day.csv dan hour.csv ada di folder 'data/'")
-        st.error(f"Tried paths: {possible_paths}")
         st.stop()
     
-    # Data cleaning
-    day_df = day_df.drop_duplicates()
-    hour_df = hour_df.drop_duplicates()
-    day_df = day_df.copy()  # Ensure we have a copy
-    hour_df = hour_df.copy()
-    
-    # Konversi datetime
-    day_df['dteday'] = pd.to_datetime(day_df['dteday'], errors='coerce')
-    hour_df['dteday'] = pd.to_datetime(hour_df['dteday'], errors='coerce')
-    day_df['season'] = day_df['season'].astype('category')
-    hour_df['season'] = hour_df['season'].astype('category')
-    
-    # Konversi suhu ke Celsius
-    day_df['temp_celsius'] = day_df['temp'] * 41
-    hour_df['temp_celsius'] = hour_df['temp'] * 41
-    
-    # Mapping musim dan cuaca
-    season_labels = {1: 'Spring', 2: 'Summer', 3: 'Fall', 4: 'Winter'}
-    weather_labels = {
-        1: 'Clear/Partly Cloudy',
-        2: 'Mist/Cloudy',
-        3: 'Light Snow/Rain',
-        4: 'Heavy Rain/Snow'
-    }
-    
-    day_df['season_name'] = day_df['season'].map(season_labels)
-    day_df['weather_name'] = day_df['weathersit'].map(weather_labels)
-    hour_df['season_name'] = hour_df['season'].map(season_labels)
-    
-    return day_df, hour_df
+    return LiveDataset(data_dir, open_cache(data_dir))
 
-day_df, hour_df = load_data()
+with profile.stage('load'):
+    dataset = load_data()
+    dataset.refresh()
+day_state, hour_state = dataset.tables['day'], dataset.tables['hour']
+day_cube, hour_cube = day_state.cube, hour_state.cube
 
-# Filter di sidebar
+# Filter di sidebar, dikirim sekaligus lewat form: mengubah beberapa pilihan hanya memicu
+# satu rerun saat tombol ditekan
 with st.sidebar:
-    selected_season = st.multiselect(
-        "Pilih Musim:",
-        options=['Spring', 'Summer', 'Fall', 'Winter'],
-        default=['Spring', 'Summer', 'Fall', 'Winter']
-    )
+    with st.form('filter_form', border=False):
+        selected_season = st.multiselect(
+            "Pilih Musim:",
+            options=['Spring', 'Summer', 'Fall', 'Winter'],
+            default=['Spring', 'Summer', 'Fall', 'Winter']
+        )
+        
+        selected_weather = st.multiselect(
+            "Pilih Kondisi Cuaca:",
+            options=['Clear/Partly Cloudy', 'Mist/Cloudy', 'Light Snow/Rain'],
+            default=['Clear/Partly Cloudy', 'Mist/Cloudy', 'Light Snow/Rain']
+        )
+        
+        # Rentang tanggal difilter lewat time index terurut (binary search, bukan scan per baris)
+        first_day, last_day = day_state.time_index.start.date(), day_state.time_index.end.date()
+        selected_dates = st.date_input(
+            "Rentang Tanggal:",
+            value=(first_day, last_day),
+            min_value=first_day,
+            max_value=last_day
+        )
+        
+        st.form_submit_button("Terapkan Filter", width='stretch')
     
-    selected_weather = st.multiselect(
-        "Pilih Kondisi Cuaca:",
-        options=['Clear/Partly Cloudy', 'Mist/Cloudy', 'Light Snow/Rain'],
-        default=['Clear/Partly Cloudy', 'Mist/Cloudy', 'Light Snow/Rain']
+    st.markdown("---")
+    # Mode interaktif: data pra-agregasi dikirim ke Vega-Lite, hover/zoom/toggle legend tanpa rerun.
+    # Default bisa diatur dengan env BIKE_CHART_MODE=interactive.
+    chart_modes = ["🖼️ Gambar (PNG)", "🖱️ Interaktif"]
+    chart_mode = st.radio(
+        "Mode Chart:", chart_modes,
+        index=1 if os.environ.get('BIKE_CHART_MODE') == 'interactive' else 0,
+        horizontal=True
     )
+interactive_charts = chart_mode == chart_modes[1]
+
+season_codes = [code for code, name in SEASON_LABELS.items() if name in selected_season]
+weather_codes = [code for code, name in WEATHER_LABELS.items() if name in selected_weather]
+
+# Rentang [start, stop) untuk graph; None = semua tanggal (tetap memakai struktur pra-agregasi per sel)
+if isinstance(selected_dates, (tuple, list)):
+    date_start, date_end = (tuple(selected_dates) * 2)[:2] if selected_dates else (first_day, last_day)
+else:
+    date_start = date_end = selected_dates
+if date_start <= first_day and date_end >= last_day:
+    date_range = None
+else:
+    date_range = (date_start.isoformat(), (date_end + pd.Timedelta(days=1)).isoformat())
+
+# Filter, moment, slice cube & agregasi halaman adalah node graph (analysis.py) yang di-memo per
+# fingerprint input (versi data, musim, cuaca, rentang tanggal) dan dibagi antar sesi: hanya node di hilir input
+# yang berubah yang dihitung ulang. Agregasi yang memindai baris dijalankan lewat backend query
+# (DuckDB di atas store Arrow kalau terpasang, selain itu pandas; env BIKE_QUERY_BACKEND=duckdb|pandas)
+# dan hasilnya juga disimpan di cache persisten.
+@st.cache_resource
+def get_graph():
+    return build_graph(warmup['cache'])
+
+graph = get_graph()
+graph_inputs = {'dataset': dataset, 'season': tuple(season_codes), 'weather': tuple(weather_codes),
+                'dates': date_range}
+
+def node(name):
+    return graph.compute(name, graph_inputs)
+
+# Frame hasil filter (bitmap index) read-only, jangan dimutasi
+with profile.stage('filter'):
+    day_filtered, hour_filtered = node('day_filtered'), node('hour_filtered')
 
-# Filter data
-day_filtered = day_df[
-    (day_df['season_name'].isin(selected_season)) &
-    (day_df['weather_name'].isin(selected_weather))
-].copy()
-hour_filtered = hour_df[hour_df['season_name'].isin(selected_season)].copy()
+# Kombinasi filter tanpa baris (mis. rentang tanggal pendek + satu kondisi cuaca): halaman analisis
+# tidak punya data untuk dihitung. Kesimpulan memakai seluruh data, jadi tetap ditampilkan.
+if len(day_filtered) == 0 and page != "📝 Kesimpulan":
+    st.warning("⚠️ Tidak ada data untuk kombinasi filter ini. Ubah musim, cuaca, atau rentang tanggal.")
+    st.stop()
+
+# Korelasi/regresi: gabungan akumulator moment per sel (season, weathersit) yang terpilih
+with profile.stage('moments'):
+    day_moments, hour_moments = node('day_moments'), node('hour_moments')
+
+# Cache gambar chart & process pool render, dipakai bersama oleh semua sesi
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(disk=warmup['cache'])
+
+@st.cache_resource
+def get_render_pool():
+    return make_render_pool()
+
+figure_cache = get_figure_cache()
+renderer = ParallelRenderer(figure_cache, get_render_pool())
+data_version = dataset.version
+
+# Filter yang dipakai tiap chart: key cache chart hanya memuat filter yang benar-benar
+# dipakai, jadi chart data per jam (hanya musim) tetap hit saat filter cuaca berubah
+DAY_DEPS = ('season', 'weather', 'dates')
+HOUR_DEPS = ('season', 'dates')
+filter_values = {'season': tuple(selected_season), 'weather': tuple(selected_weather), 'dates': date_range}
+
+def filter_key(deps):
+    return tuple(filter_values[dep] for dep in deps)
+
+def show_chart(chart_id, prepare=None, deps=DAY_DEPS, variant=None, **data):
+    # Chart yang belum ada di cache di-render paralel dan baru ditampilkan di placeholder
+    # saat renderer.flush() di akhir halaman; prepare() (opsional) hanya dipanggil kalau miss.
+    # variant membedakan key cache untuk state widget di luar filter (mis. rentang zoom).
+    placeholder = st.empty()
+    if interactive_charts and chart_id in altair_charts.SPECS:
+        # Chart tanpa versi interaktif (scatter per jam, boxplot) tetap PNG
+        placeholder.altair_chart(altair_charts.SPECS[chart_id](**(prepare() if prepare else data)), width='stretch')
+        return
+    key = (chart_id, filter_key(deps), variant, data_version)
+    renderer.request(key, chart_id, prepare or data, lambda png: placeholder.image(png, width='stretch'))
+
+def fragment(func):
+    # Section yang bisa dijalankan ulang sendiri: widget di dalamnya hanya me-rerun section itu.
+    # Chart yang diminta section harus di-flush di dalam section (flush akhir halaman tidak ikut jalan).
+    decorator = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    return decorator(func) if decorator else func
+
+def lazy_tabs(labels, key):
+    # Tab dengan state: hanya tab aktif yang .open == True, pindah tab memicu rerun
+    try:
+        return st.tabs(labels, key=key, on_change='rerun')
+    except TypeError:
+        # Streamlit lama belum punya state tab: pilihan tab lewat radio horizontal
+        active = st.radio("Tab:", labels, horizontal=True, key=key, label_visibility='collapsed')
+        containers = [st.container() for _ in labels]
+        for label, container in zip(labels, containers):
+            container.open = label == active
+        return containers
+
+# Slice cube dengan filter yang sama, dipakai untuk semua agregasi aditif
+with profile.stage('filter_cube'):
+    day_cube_filtered, hour_cube_filtered = node('day_cube_filtered'), node('hour_cube_filtered')
 
 # ========== HALAMAN OVERVIEW ==========
 if page == "📊 Overview":
     st.markdown('<h2 class="sub-header">📊 Overview Dataset</h2>', unsafe_allow_html=True)
     
     # Metrics
+    with profile.stage('agg.overview_metrics'):
+        daily_stats = rollup(day_cube_filtered, stats=('count', 'sum', 'mean', 'std', 'max')).iloc[0]
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric(
             label="Total Penyewaan (2 Tahun)",
-            value=f"{day_filtered['cnt'].sum():,.0f}",
+            value=f"{daily_stats['sum']:,.0f}",
             delta="Data Harian"
         )
     
     with col2:
         st.metric(
             label="Rata-rata Penyewaan/Hari",
-            value=f"{day_filtered['cnt'].mean():,.0f}",
-            delta=f"{day_filtered['cnt'].std():.0f} std"
+            value=f"{daily_stats['mean']:,.0f}",
+            delta=f"{daily_stats['std']:.0f} std"
         )
     
     with col3:
         st.metric(
             label="Penyewaan Tertinggi",
-            value=f"{day_filtered['cnt'].max():,.0f}",
+            value=f"{daily_stats['max']:,.0f}",
             delta="Dalam 1 Hari"
         )
     
     with col4:
         st.metric(
             label="Total Data Harian",
-            value=f"{len(day_filtered)}",
-            delta=f"{len(hour_filtered)} jam"
+            value=f"{daily_stats['count']:.0f}",
+            delta=f"{hour_cube_filtered['n'].sum()} jam"
         )
     
+    # KPI rolling dari prefix sum harian (rolling.py): jendela 7/28 hari yang berakhir di hari
+    # terakhir rentang, delta dibanding jendela sebelumnya (minggu lalu / 28 hari sebelumnya)
+    with profile.stage('agg.rolling_kpis'):
+        kpis = node('rolling_kpis')
+    
+    def change(current, previous, points=False):
+        if pd.isna(current) or pd.isna(previous) or (not points and previous == 0):
+            return None
+        return f"{(current - previous) * 100:+.1f} pp" if points else f"{current / previous - 1:+.1%}"
+    
+    if kpis is not None:
+        st.caption(f"Jendela rolling berakhir {kpis['end']:%d %b %Y}")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric(
+                label="Rata-rata 7 Hari",
+                value=f"{kpis['ma7']:,.0f}" if pd.notna(kpis['ma7']) else "-",
+                delta=change(kpis['ma7'], kpis['ma7_prev']),
+                help="Dibanding 7 hari sebelumnya (week-over-week)"
+            )
+        
+        with col2:
+            st.metric(
+                label="Rata-rata 28 Hari",
+                value=f"{kpis['ma28']:,.0f}" if pd.notna(kpis['ma28']) else "-",
+                delta=change(kpis['ma28'], kpis['ma28_prev']),
+                help="Dibanding 28 hari sebelumnya"
+            )
+        
+        with col3:
+            st.metric(
+                label="Share Casual 7 Hari",
+                value=f"{kpis['share7']:.1%}" if pd.notna(kpis['share7']) else "-",
+                delta=change(kpis['share7'], kpis['share7_prev'], points=True),
+                delta_color="off",
+                help="Dibanding 7 hari sebelumnya (week-over-week)"
+            )
+    
+    st.markdown("---")
+    
+    # Tren multi-resolusi dari piramida rollup (pyramid.py): level (jam/hari/minggu/bulan/tahun)
+    # dipilih otomatis sebagai level terhalus yang muat di lebar chart untuk rentang zoom
+    st.subheader("📈 Tren Penyewaan")
+    
+    @fragment
+    def trend_section():
+        pyramid = hour_state.pyramid
+        if date_range is None:
+            range_start, range_end = hour_state.time_index.start.date(), hour_state.time_index.end.date()
+        else:
+            range_start = pd.Timestamp(date_range[0]).date()
+            range_end = (pd.Timestamp(date_range[1]) - pd.Timedelta(days=1)).date()
+        if range_start < range_end:
+            zoom_start, zoom_end = st.slider(
+                "Zoom rentang:",
+                min_value=range_start,
+                max_value=range_end,
+                value=(range_start, range_end),
+                format="YYYY-MM-DD"
+            )
+        else:
+            zoom_start, zoom_end = range_start, range_end
+        start, stop = zoom_start.isoformat(), (zoom_end + pd.Timedelta(days=1)).isoformat()
+        level = pyramid.choose_level(start, stop)
+        st.caption(f"Resolusi: per {LEVEL_LABELS[level].lower()} ({pyramid.n_points(level, start, stop)} titik)")
+        
+        def prepare_trend():
+            return {'trend': pyramid.series(level, season_codes, start, stop), 'level_label': LEVEL_LABELS[level]}
+        
+        show_chart('trend_line', prepare=prepare_trend, deps=HOUR_DEPS, variant=(start, stop))
+        renderer.flush()
+    
+    trend_section()
+    
+    # Rata-rata bergerak & share casual: tiap titik = selisih dua prefix sum (O(1) per titik)
+    st.subheader("📉 Rata-rata Bergerak")
+    show_chart('rolling_line', prepare=lambda: {'rolling': node('rolling_trend')})
+    
     st.markdown("---")
     
     # Data Preview
@@ -207,19 +412,11 @@ if page == "📊 Overview":
     
     with col1:
         st.write("**Korelasi - Data Harian**")
-        fig, ax = plt.subplots(figsize=(8, 6))
-        numerical_cols = day_filtered.select_dtypes(include=['float64', 'int64'])
-        sns.heatmap(numerical_cols.corr(), annot=True, cmap='coolwarm', ax=ax, fmt='.2f', cbar_kws={'shrink': 0.8})
-        ax.set_title('Correlation Matrix - Daily Data')
-        st.pyplot(fig)
+        show_chart('overview_corr_day', corr=day_moments.corr())
     
     with col2:
         st.write("**Korelasi - Data Per Jam**")
-        fig, ax = plt.subplots(figsize=(8, 6))
-        numerical_cols = hour_filtered.select_dtypes(include=['float64', 'int64'])
-        sns.heatmap(numerical_cols.corr(), annot=True, cmap='coolwarm', ax=ax, fmt='.2f', cbar_kws={'shrink': 0.8})
-        ax.set_title('Correlation Matrix - Hourly Data')
-        st.pyplot(fig)
+        show_chart('overview_corr_hour', deps=HOUR_DEPS, corr=hour_moments.corr())
 
 # ========== HALAMAN ANALISIS UTAMA ==========
 elif page == "📈 Analisis Utama":
@@ -228,28 +425,13 @@ elif page == "📈 Analisis Utama":
     # Pertanyaan 1: Musim
     st.markdown("### 1️⃣ Musim dengan Total Penyewaan Tertinggi")
     
-    rentals_by_season = day_filtered.groupby('season_name')['cnt'].sum().sort_values(ascending=False)
+    with profile.stage('agg.rentals_by_season'):
+        rentals_by_season = rollup(day_cube_filtered, by='season', stats=('sum',))['sum'].rename(index=SEASON_LABELS).sort_values(ascending=False)
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
-        bars = ax.bar(rentals_by_season.index, rentals_by_season.values, color=colors)
-        ax.set_title('Total Penyewaan Sepeda per Musim', fontsize=16, fontweight='bold')
-        ax.set_xlabel('Musim', fontsize=12)
-        ax.set_ylabel('Total Penyewaan', fontsize=12)
-        ax.grid(axis='y', alpha=0.3)
-        
-        for i, bar in enumerate(bars):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height):,}',
-                   ha='center', va='bottom', fontsize=10, fontweight='bold')
-        
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        st.pyplot(fig)
+        show_chart('season_bar', rentals_by_season=rentals_by_season)
     
     with col2:
         st.markdown("#### 📊 Insight:")
@@ -270,23 +452,12 @@ elif page == "📈 Analisis Utama":
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.scatter(day_filtered['temp_celsius'], day_filtered['cnt'], alpha=0.5, s=30)
-        
-        # Regression line
-        z = np.polyfit(day_filtered['temp_celsius'], day_filtered['cnt'], 1)
-        p = np.poly1d(z)
-        ax.plot(day_filtered['temp_celsius'], p(day_filtered['temp_celsius']), "r-", linewidth=2)
-        
-        ax.set_title('Pengaruh Suhu terhadap Total Penyewaan Harian', fontsize=16, fontweight='bold')
-        ax.set_xlabel('Suhu (°C)', fontsize=12)
-        ax.set_ylabel('Total Penyewaan', fontsize=12)
-        ax.grid(alpha=0.3)
-        plt.tight_layout()
-        st.pyplot(fig)
+        slope, intercept = day_moments.linear_fit('temp_celsius', 'cnt')
+        show_chart('temp_scatter_daily', temp=day_filtered['temp_celsius'].to_numpy(), cnt=day_filtered['cnt'].to_numpy(),
+                   slope=slope, intercept=intercept)
     
     with col2:
-        correlation = day_filtered['temp'].corr(day_filtered['cnt'])
+        correlation = day_moments.corr_of('temp', 'cnt')
         st.markdown("#### 📊 Insight:")
         st.success(f"""
         - **Korelasi:** {correlation:.4f}
@@ -295,13 +466,9 @@ elif page == "📈 Analisis Utama":
         Suhu memiliki pengaruh positif yang signifikan terhadap penyewaan. Semakin tinggi suhu (hingga batas optimal), semakin banyak penyewaan.
         """)
         
-        # Kategori suhu
-        day_filtered['temp_category'] = pd.cut(
-            day_filtered['temp_celsius'], 
-            bins=[0, 10, 20, 30, 41],
-            labels=['Dingin', 'Sejuk', 'Hangat', 'Panas']
-        )
-        avg_by_temp = day_filtered.groupby('temp_category', observed=True)['cnt'].mean().sort_values(ascending=False)
+        # Kategori suhu (kolom temp_category dari data layer)
+        with profile.stage('agg.avg_by_temp'):
+            avg_by_temp = node('avg_by_temp')
         
         st.write("**Rata-rata per Kategori:**")
         for cat, val in avg_by_temp.items():
@@ -312,98 +479,67 @@ elif page == "📈 Analisis Utama":
     # Pertanyaan 3: Pengaruh Suhu per Periode Waktu
     st.markdown("### 3️⃣ Pengaruh Suhu pada Jam Tertentu")
     
-    hour_filtered['hour_category'] = pd.cut(
-        hour_filtered['hr'], 
-        bins=[-1, 6, 12, 18, 24],
-        labels=['Malam (00-06)', 'Pagi (07-12)', 'Siang (13-18)', 'Sore (19-24)']
-    )
-    
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-    fig.suptitle('Pengaruh Suhu terhadap Penyewaan per Periode Waktu', fontsize=16, fontweight='bold')
-    
-    hour_categories = ['Malam (00-06)', 'Pagi (07-12)', 'Siang (13-18)', 'Sore (19-24)']
-    colors_period = ['#3498db', '#e74c3c', '#f39c12', '#9b59b6']
+    # Section per jam sebagai fragment: toggle density hanya menjalankan ulang section ini
+    @fragment
+    def question3():
+        hour_category = hour_filtered['hour_category']
+        hour_categories = HOUR_CATEGORIES
+    
+        # Mode density otomatis untuk data besar, scatter biasa untuk data kecil
+        density_mode = st.toggle(
+            "Mode density (binning 2D)",
+            value=len(hour_filtered) > DENSITY_THRESHOLD,
+            help="Titik di-binning menjadi raster berukuran tetap sehingga waktu render tidak bergantung jumlah baris"
+        )
     
-    for idx, (category, color) in enumerate(zip(hour_categories, colors_period)):
-        ax = axes[idx // 2, idx % 2]
-        data = hour_filtered[hour_filtered['hour_category'] == category]
-        
-        ax.scatter(data['temp_celsius'], data['cnt'], alpha=0.3, s=20, color=color)
-        
-        # Regression line
-        if len(data) > 0:
-            z = np.polyfit(data['temp_celsius'], data['cnt'], 1)
-            p = np.poly1d(z)
-            ax.plot(data['temp_celsius'], p(data['temp_celsius']), "r-", linewidth=2)
-            
-            corr = data['temp_celsius'].corr(data['cnt'])
-            ax.text(0.05, 0.95, f'Korelasi: {corr:.3f}', 
-                   transform=ax.transAxes,
-                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5),
-                   verticalalignment='top')
-        
-        ax.set_title(f'Periode: {category}', fontsize=11, fontweight='bold')
-        ax.set_xlabel('Suhu (°C)', fontsize=10)
-        ax.set_ylabel('Total Penyewaan', fontsize=10)
-        ax.grid(alpha=0.3)
+        # Data panel & regresi hanya disiapkan kalau chart belum ada di cache
+        def prepare_hourly():
+            period_codes = hour_category.cat.codes.to_numpy()
+            # Regresi & korelasi per periode (node period_moments, hanya bergantung pada musim)
+            with profile.stage('agg.period_moments'):
+                period_moments = node('period_moments')
+            x_range = (0, 41)
+            y_range = (0, max(float(hour_filtered['cnt'].max()), 1.0) if len(hour_filtered) else 1.0)
+            if density_mode:
+                panels = list(bin_density(hour_filtered['temp_celsius'], hour_filtered['cnt'], period_codes,
+                                          len(hour_categories), x_range, y_range))
+            else:
+                temp, cnt = hour_filtered['temp_celsius'].to_numpy(), hour_filtered['cnt'].to_numpy()
+                panels = [(temp[period_codes == idx], cnt[period_codes == idx]) for idx in range(len(hour_categories))]
+            fits = [
+                (*m.linear_fit('temp_celsius', 'cnt'), m.corr_of('temp_celsius', 'cnt')) if m.n > 1 else None
+                for m in period_moments
+            ]
+            return dict(categories=list(hour_categories), panels=panels, fits=fits, x_range=x_range, y_range=y_range)
+        show_chart('temp_density_hourly' if density_mode else 'temp_scatter_hourly', prepare=prepare_hourly, deps=HOUR_DEPS)
     
-    plt.tight_layout()
-    st.pyplot(fig)
+        st.info("""
+        **Insight:**
+        - Pengaruh suhu bervariasi per periode waktu
+        - Korelasi paling kuat terjadi pada periode Siang dan Sore
+        - Pada malam hari, pengaruh suhu lebih lemah karena volume penyewaan rendah
+        """)
+        renderer.flush()
     
-    st.info("""
-    **Insight:**
-    - Pengaruh suhu bervariasi per periode waktu
-    - Korelasi paling kuat terjadi pada periode Siang dan Sore
-    - Pada malam hari, pengaruh suhu lebih lemah karena volume penyewaan rendah
-    """)
+    question3()
     
     st.markdown("---")
     
     # Pertanyaan 4: Kondisi Cuaca
     st.markdown("### 4️⃣ Pengaruh Kondisi Cuaca")
     
-    rentals_by_weather = day_filtered.groupby('weather_name')['cnt'].agg(['mean', 'sum', 'count']).sort_values('mean', ascending=False)
+    with profile.stage('agg.rentals_by_weather'):
+        rentals_by_weather = rollup(day_cube_filtered, by='weathersit', stats=('mean', 'sum', 'count')).rename(index=WEATHER_LABELS).sort_values('mean', ascending=False)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.write("**Rata-rata Penyewaan per Kondisi Cuaca**")
-        fig, ax = plt.subplots(figsize=(8, 6))
-        colors_weather = ['#2ECC71', '#F39C12', '#E74C3C']
-        bars = ax.bar(rentals_by_weather.index, rentals_by_weather['mean'], color=colors_weather[:len(rentals_by_weather)])
-        ax.set_title('Rata-rata Penyewaan per Kondisi Cuaca', fontsize=14, fontweight='bold')
-        ax.set_xlabel('Kondisi Cuaca', fontsize=11)
-        ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
-        ax.tick_params(axis='x', rotation=45)
-        ax.grid(axis='y', alpha=0.3)
-        
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height):,}',
-                   ha='center', va='bottom', fontsize=9, fontweight='bold')
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        show_chart('weather_mean_bar', mean_by_weather=rentals_by_weather['mean'])
     
     with col2:
         st.write("**Distribusi Penyewaan per Kondisi Cuaca**")
-        fig, ax = plt.subplots(figsize=(8, 6))
-        
-        weather_order = [w for w in ['Clear/Partly Cloudy', 'Mist/Cloudy', 'Light Snow/Rain'] if w in day_filtered['weather_name'].unique()]
-        
-        sns.boxplot(
-            x='weather_name', y='cnt', data=day_filtered, ax=ax,
-            order=weather_order,
-            hue='weather_name', palette=colors_weather[:len(weather_order)], legend=False
-        )
-        ax.set_title('Distribusi Penyewaan per Kondisi Cuaca', fontsize=14, fontweight='bold')
-        ax.set_xlabel('Kondisi Cuaca', fontsize=11)
-        ax.set_ylabel('Total Penyewaan', fontsize=11)
-        ax.tick_params(axis='x', rotation=45)
-        ax.grid(axis='y', alpha=0.3)
-        plt.tight_layout()
-        st.pyplot(fig)
+        show_chart('weather_boxplot', data=day_filtered[['weather_name', 'cnt']])
     
     st.success(f"""
     **Insight:**
@@ -416,346 +552,221 @@ elif page == "📈 Analisis Utama":
 elif page == "🔍 Analisis Lanjutan":
     st.markdown('<h2 class="sub-header">🔍 Teknik Analisis Lanjutan</h2>', unsafe_allow_html=True)
     
-    # Tab untuk berbagai analisis lanjutan
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Segmentasi Demand", "📅 Weekday vs Weekend", "👥 Casual vs Registered", "🎯 Multi-Dimensional Clustering"])
-    
-    # TAB 1: Manual Grouping - Segmentasi Demand
-    with tab1:
-        st.markdown("### Manual Grouping: Segmentasi Hari Berdasarkan Demand")
-        
-        # Clustering berdasarkan demand level
-        q1 = day_filtered['cnt'].quantile(0.33)
-        q2 = day_filtered['cnt'].quantile(0.67)
-        
-        day_filtered['demand_level'] = pd.cut(day_filtered['cnt'], 
-                                              bins=[0, q1, q2, day_filtered['cnt'].max()],
-                                              labels=['Low Demand', 'Medium Demand', 'High Demand'],
-                                              include_lowest=True)
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            low_count = len(day_filtered[day_filtered['demand_level'] == 'Low Demand'])
-            st.metric("Low Demand Days", low_count, f"< {q1:.0f} penyewaan")
-        
-        with col2:
-            med_count = len(day_filtered[day_filtered['demand_level'] == 'Medium Demand'])
-            st.metric("Medium Demand Days", med_count, f"{q1:.0f}-{q2:.0f}")
-        
-        with col3:
-            high_count = len(day_filtered[day_filtered['demand_level'] == 'High Demand'])
-            st.metric("High Demand Days", high_count, f"> {q2:.0f} penyewaan")
-        
-        # Visualisasi
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            demand_counts = day_filtered['demand_level'].value_counts()
-            colors = ['#E74C3C', '#F39C12', '#2ECC71']
-            ax.bar(demand_counts.index, demand_counts.values, color=colors)
-            ax.set_title('Distribusi Jumlah Hari per Demand Level', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Jumlah Hari', fontsize=11)
-            ax.grid(axis='y', alpha=0.3)
-            
-            for i, (label, value) in enumerate(demand_counts.items()):
-                ax.text(i, value + 2, str(value), ha='center', fontweight='bold')
-            
-            plt.xticks(rotation=15)
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        with col2:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            temp_by_demand = day_filtered.groupby('demand_level', observed=True)['temp_celsius'].mean()
-            ax.bar(range(len(temp_by_demand)), temp_by_demand.values, color=colors)
-            ax.set_title('Rata-rata Suhu per Demand Level', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Suhu (°C)', fontsize=11)
-            ax.set_xticks(range(len(temp_by_demand)))
-            ax.set_xticklabels(temp_by_demand.index, rotation=15)
-            ax.grid(axis='y', alpha=0.3)
-            
-            for i, value in enumerate(temp_by_demand.values):
-                ax.text(i, value + 0.5, f'{value:.1f}°C', ha='center', fontweight='bold')
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        st.success("""
-        **Insight:**
-        - Hari dengan **High Demand** cenderung memiliki suhu lebih tinggi (optimal)
-        - Hari dengan **Low Demand** terjadi saat cuaca buruk atau suhu ekstrem
-        - Segmentasi ini berguna untuk **perencanaan operasional** dan **pricing dinamis**
-        """)
-    
-    # TAB 2: Weekday vs Weekend
-    with tab2:
-        st.markdown("### Analisis Weekday vs Weekend")
-        
-        # Tambahkan kolom day_type
-        day_filtered['day_type'] = day_filtered['weekday'].apply(lambda x: 'Weekend' if x in [0, 6] else 'Weekday')
-        hour_filtered['day_type'] = hour_filtered['weekday'].apply(lambda x: 'Weekend' if x in [0, 6] else 'Weekday')
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            avg_by_type = day_filtered.groupby('day_type')['cnt'].mean()
-            st.metric("Rata-rata Weekday", f"{avg_by_type.get('Weekday', 0):.0f}", "penyewaan/hari")
-        
-        with col2:
-            st.metric("Rata-rata Weekend", f"{avg_by_type.get('Weekend', 0):.0f}", "penyewaan/hari")
-        
-        # Visualisasi perbandingan
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            avg_by_type.plot(kind='bar', ax=ax, color=['#3498db', '#e74c3c'])
-            ax.set_title('Rata-rata Penyewaan: Weekday vs Weekend', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
-            ax.set_xticklabels(ax.get_xticklabels(), rotation=0)
-            ax.grid(axis='y', alpha=0.3)
-            
-            for i, (label, value) in enumerate(avg_by_type.items()):
-                ax.text(i, value + 100, f'{value:.0f}', ha='center', fontweight='bold')
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        with col2:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            casual_reg_data = day_filtered.groupby('day_type')[['casual', 'registered']].mean()
-            x = range(len(casual_reg_data))
-            width = 0.35
-            ax.bar([i - width/2 for i in x], casual_reg_data['casual'], width, label='Casual', color='#f39c12')
-            ax.bar([i + width/2 for i in x], casual_reg_data['registered'], width, label='Registered', color='#2ecc71')
-            ax.set_title('Casual vs Registered: Weekday vs Weekend', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
-            ax.set_xticks(x)
-            ax.set_xticklabels(casual_reg_data.index)
-            ax.legend()
-            ax.grid(axis='y', alpha=0.3)
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        # Pola per jam
-        st.markdown("### Pola Per Jam: Weekday vs Weekend")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            weekday_hourly = hour_filtered[hour_filtered['day_type'] == 'Weekday'].groupby('hr')['cnt'].mean()
-            fig, ax = plt.subplots(figsize=(8, 6))
-            ax.plot(weekday_hourly.index, weekday_hourly.values, marker='o', linewidth=2, color='#3498db')
-            ax.fill_between(weekday_hourly.index, weekday_hourly.values, alpha=0.3, color='#3498db')
-            ax.axvspan(7, 9, alpha=0.2, color='orange', label='Rush Pagi')
-            ax.axvspan(17, 19, alpha=0.2, color='red', label='Rush Sore')
-            ax.set_title('Pola Weekday - Commuting Pattern', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Jam', fontsize=11)
-            ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
-            ax.set_xticks(range(0, 24, 2))
-            ax.legend()
-            ax.grid(alpha=0.3)
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        with col2:
-            weekend_hourly = hour_filtered[hour_filtered['day_type'] == 'Weekend'].groupby('hr')['cnt'].mean()
-            fig, ax = plt.subplots(figsize=(8, 6))
-            ax.plot(weekend_hourly.index, weekend_hourly.values, marker='o', linewidth=2, color='#e74c3c')
-            ax.fill_between(weekend_hourly.index, weekend_hourly.values, alpha=0.3, color='#e74c3c')
-            ax.set_title('Pola Weekend - Recreational Pattern', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Jam', fontsize=11)
-            ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
-            ax.set_xticks(range(0, 24, 2))
-            ax.grid(alpha=0.3)
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        st.info("""
-        **Insight:**
-        - **Weekday**: Pola commuting jelas dengan 2 puncak (07-08 & 17-18)
-        - **Weekend**: Pola rekreasi tersebar merata sepanjang siang hari
-        - **Casual users** lebih dominan di weekend
-        - **Registered users** lebih konsisten di weekday (commuters)
-        """)
-    
-    # TAB 3: Casual vs Registered
-    with tab3:
-        st.markdown("### Segmentasi Pengguna: Casual vs Registered")
-        
-        total_casual = day_filtered['casual'].sum()
-        total_registered = day_filtered['registered'].sum()
-        total_all = day_filtered['cnt'].sum()
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Total Casual", f"{total_casual:,.0f}", f"{total_casual/total_all*100:.1f}%")
-        
-        with col2:
-            st.metric("Total Registered", f"{total_registered:,.0f}", f"{total_registered/total_all*100:.1f}%")
-        
-        with col3:
-            st.metric("Total Semua", f"{total_all:,.0f}", "100%")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Pie chart
-            fig, ax = plt.subplots(figsize=(8, 6))
-            sizes = [total_casual, total_registered]
-            colors = ['#f39c12', '#2ecc71']
-            explode = (0.1, 0)
-            ax.pie(sizes, explode=explode, labels=['Casual', 'Registered'], 
-                   autopct='%1.1f%%', colors=colors, startangle=90, textprops={'fontsize': 12, 'fontweight': 'bold'})
-            ax.set_title('Proporsi Total Penyewaan', fontsize=14, fontweight='bold')
-            st.pyplot(fig)
-        
-        with col2:
-            # Trend bulanan
-            day_filtered['month'] = day_filtered['dteday'].dt.month
-            monthly_users = day_filtered.groupby('month')[['casual', 'registered']].mean()
-            
-            fig, ax = plt.subplots(figsize=(8, 6))
-            ax.plot(monthly_users.index, monthly_users['casual'], marker='o', label='Casual', color='#f39c12', linewidth=2)
-            ax.plot(monthly_users.index, monthly_users['registered'], marker='s', label='Registered', color='#2ecc71', linewidth=2)
-            ax.set_title('Trend Bulanan: Casual vs Registered', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Bulan', fontsize=11)
-            ax.set_ylabel('Rata-rata Penyewaan', fontsize=11)
-            ax.legend()
-            ax.grid(alpha=0.3)
-            ax.set_xticks(range(1, 13))
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        # Pengaruh cuaca
-        st.markdown("### Pengaruh Kondisi Cuaca pada Tipe Pengguna")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            weather_casual = day_filtered.groupby('weather_name')['casual'].mean().sort_values(ascending=False)
-            fig, ax = plt.subplots(figsize=(8, 6))
-            ax.bar(range(len(weather_casual)), weather_casual.values, color='#f39c12')
-            ax.set_title('Casual Users per Kondisi Cuaca', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Rata-rata Casual', fontsize=11)
-            ax.set_xticks(range(len(weather_casual)))
-            ax.set_xticklabels(weather_casual.index, rotation=15, ha='right', fontsize=9)
-            ax.grid(axis='y', alpha=0.3)
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        with col2:
-            weather_registered = day_filtered.groupby('weather_name')['registered'].mean().sort_values(ascending=False)
-            fig, ax = plt.subplots(figsize=(8, 6))
-            ax.bar(range(len(weather_registered)), weather_registered.values, color='#2ecc71')
-            ax.set_title('Registered Users per Kondisi Cuaca', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Rata-rata Registered', fontsize=11)
-            ax.set_xticks(range(len(weather_registered)))
-            ax.set_xticklabels(weather_registered.index, rotation=15, ha='right', fontsize=9)
-            ax.grid(axis='y', alpha=0.3)
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        # Korelasi
-        corr_casual = day_filtered['casual'].corr(day_filtered['temp'])
-        corr_registered = day_filtered['registered'].corr(day_filtered['temp'])
-        
-        st.success(f"""
-        **Insight:**
-        - **Registered users** mendominasi (~{total_registered/total_all*100:.0f}%) dan lebih konsisten
-        - **Casual users** lebih sensitif terhadap cuaca (Korelasi suhu: {corr_casual:.3f})
-        - **Registered users** lebih stabil (Korelasi suhu: {corr_registered:.3f}) - commuters reguler
-        - Casual users meningkat signifikan di musim hangat & weekend
-        """)
-    
-    # TAB 4: Multi-Dimensional Clustering
-    with tab4:
-        st.markdown("### Clustering Multi-Dimensional (Kombinasi Faktor)")
-        
-        # Buat kategori
-        day_filtered['temp_level'] = pd.cut(day_filtered['temp_celsius'], 
-                                            bins=[0, 15, 25, 41], 
-                                            labels=['Cold', 'Moderate', 'Hot'])
-        
-        day_filtered['weather_quality'] = day_filtered['weathersit'].apply(
-            lambda x: 'Good' if x == 1 else ('Fair' if x == 2 else 'Bad')
-        )
-        
-        day_filtered['condition_cluster'] = day_filtered['temp_level'].astype(str) + ' + ' + day_filtered['weather_quality']
-        
-        # Analisis cluster
-        cluster_analysis = day_filtered.groupby('condition_cluster', observed=True).agg({
-            'cnt': ['count', 'mean'],
-            'casual': 'mean',
-            'registered': 'mean'
-        })
-        
-        cluster_analysis.columns = ['_'.join(col).strip() for col in cluster_analysis.columns.values]
-        cluster_analysis = cluster_analysis.sort_values('cnt_mean', ascending=False)
-        
-        # Top clusters
-        top_clusters = cluster_analysis.nlargest(8, 'cnt_mean')
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### Top Kondisi dengan Penyewaan Tertinggi")
-            fig, ax = plt.subplots(figsize=(8, 6))
-            ax.barh(range(len(top_clusters)), top_clusters['cnt_mean'].values, color='#3498db')
-            ax.set_yticks(range(len(top_clusters)))
-            ax.set_yticklabels(top_clusters.index, fontsize=9)
-            ax.set_xlabel('Rata-rata Penyewaan', fontsize=11)
-            ax.grid(axis='x', alpha=0.3)
-            ax.invert_yaxis()
-            
-            for i, value in enumerate(top_clusters['cnt_mean'].values):
-                ax.text(value + 50, i, f'{value:.0f}', va='center', fontweight='bold', fontsize=9)
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        with col2:
-            st.markdown("#### Heatmap: Suhu × Cuaca")
-            heatmap_data = day_filtered.pivot_table(values='cnt', index='temp_level', 
-                                                    columns='weather_quality', aggfunc='mean')
-            
-            fig, ax = plt.subplots(figsize=(8, 6))
-            sns.heatmap(heatmap_data, annot=True, fmt='.0f', cmap='RdYlGn', ax=ax, 
-                       cbar_kws={'label': 'Avg Rentals'})
-            ax.set_title('Rata-rata Penyewaan (Suhu × Cuaca)', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Kualitas Cuaca', fontsize=11)
-            ax.set_ylabel('Level Suhu', fontsize=11)
-            plt.tight_layout()
-            st.pyplot(fig)
-        
-        # Summary
-        best_condition = cluster_analysis['cnt_mean'].idxmax()
-        best_avg = cluster_analysis['cnt_mean'].max()
-        worst_condition = cluster_analysis['cnt_mean'].idxmin()
-        worst_avg = cluster_analysis['cnt_mean'].min()
-        
-        st.info(f"""
-        **Insight:**
-        - **Kondisi Terbaik**: {best_condition} → {best_avg:.0f} penyewaan/hari
-        - **Kondisi Terburuk**: {worst_condition} → {worst_avg:.0f} penyewaan/hari
-        - **Selisih**: {best_avg - worst_avg:.0f} penyewaan
-        - **Efek Sinergis**: Kombinasi suhu optimal + cuaca baik memaksimalkan demand
-        - Berguna untuk: prediksi demand, pricing dinamis, & perencanaan operasional
-        """)
-        
-        # Top 5 clusters detail
-        st.markdown("#### Detail Top 5 Kondisi")
-        st.dataframe(
-            top_clusters.head().style.format({
-                'cnt_count': '{:.0f}',
-                'cnt_mean': '{:.0f}',
-                'casual_mean': '{:.0f}',
-                'registered_mean': '{:.0f}'
-            }),
-            width='stretch'
-        )
+    # Isi tab adalah fragment: pindah tab hanya menjalankan ulang bagian ini, bukan seluruh halaman
+    @fragment
+    def advanced_tabs():
+        # Tab untuk berbagai analisis lanjutan
+        # Hanya isi tab yang aktif yang dihitung & di-render; tab lain menunggu sampai dibuka
+        tab1, tab2, tab3, tab4 = lazy_tabs(["📊 Segmentasi Demand", "📅 Weekday vs Weekend", "👥 Casual vs Registered", "🎯 Multi-Dimensional Clustering"], key='advanced_tab')
+    
+        # TAB 1: Manual Grouping - Segmentasi Demand
+        with tab1:
+            if tab1.open:
+                st.markdown("### Manual Grouping: Segmentasi Hari Berdasarkan Demand")
+            
+                # Clustering berdasarkan demand level: threshold dari sketch quantile, jumlah hari &
+                # rata-rata suhu per level dari satu pass binning (node demand_levels)
+                with profile.stage('agg.demand_level'):
+                    q1, q2, demand_levels = node('demand_levels')
+                demand_counts = demand_levels['days']
+            
+                col1, col2, col3 = st.columns(3)
+            
+                with col1:
+                    low_count = int(demand_counts.get('Low Demand', 0))
+                    st.metric("Low Demand Days", low_count, f"< {q1:.0f} penyewaan")
+            
+                with col2:
+                    med_count = int(demand_counts.get('Medium Demand', 0))
+                    st.metric("Medium Demand Days", med_count, f"{q1:.0f}-{q2:.0f}")
+            
+                with col3:
+                    high_count = int(demand_counts.get('High Demand', 0))
+                    st.metric("High Demand Days", high_count, f"> {q2:.0f} penyewaan")
+            
+                # Visualisasi
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    show_chart('demand_level_bar', demand_counts=demand_counts.rename('count').sort_values(ascending=False))
+            
+                with col2:
+                    temp_by_demand = demand_levels['temp_celsius']
+                    show_chart('demand_temp_bar', temp_by_demand=temp_by_demand)
+            
+                st.success("""
+                **Insight:**
+                - Hari dengan **High Demand** cenderung memiliki suhu lebih tinggi (optimal)
+                - Hari dengan **Low Demand** terjadi saat cuaca buruk atau suhu ekstrem
+                - Segmentasi ini berguna untuk **perencanaan operasional** dan **pricing dinamis**
+                """)
+        
+        # TAB 2: Weekday vs Weekend
+        with tab2:
+            if tab2.open:
+                st.markdown("### Analisis Weekday vs Weekend")
+            
+                # day_type sudah menjadi dimensi turunan di cube
+                with profile.stage('agg.day_type'):
+                    type_stats = rollup(day_cube_filtered, by='day_type', measures=('cnt', 'casual', 'registered'))
+            
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    avg_by_type = type_stats['cnt_mean']
+                    st.metric("Rata-rata Weekday", f"{avg_by_type.get('Weekday', 0):.0f}", "penyewaan/hari")
+            
+                with col2:
+                    st.metric("Rata-rata Weekend", f"{avg_by_type.get('Weekend', 0):.0f}", "penyewaan/hari")
+            
+                # Visualisasi perbandingan
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    show_chart('daytype_bar', avg_by_type=avg_by_type)
+            
+                with col2:
+                    show_chart('daytype_users_bar', casual_reg_data=type_stats[['casual_mean', 'registered_mean']].rename(columns=lambda c: c[:-len('_mean')]))
+            
+                # Pola per jam
+                st.markdown("### Pola Per Jam: Weekday vs Weekend")
+            
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    with profile.stage('agg.weekday_hourly'):
+                        weekday_hourly = rollup(hour_cube_filtered[hour_cube_filtered['day_type'] == 'Weekday'], by='hr')['mean']
+                    show_chart('weekday_hourly_line', deps=HOUR_DEPS, hourly=weekday_hourly)
+            
+                with col2:
+                    with profile.stage('agg.weekend_hourly'):
+                        weekend_hourly = rollup(hour_cube_filtered[hour_cube_filtered['day_type'] == 'Weekend'], by='hr')['mean']
+                    show_chart('weekend_hourly_line', deps=HOUR_DEPS, hourly=weekend_hourly)
+            
+                st.info("""
+                **Insight:**
+                - **Weekday**: Pola commuting jelas dengan 2 puncak (07-08 & 17-18)
+                - **Weekend**: Pola rekreasi tersebar merata sepanjang siang hari
+                - **Casual users** lebih dominan di weekend
+                - **Registered users** lebih konsisten di weekday (commuters)
+                """)
+        
+        # TAB 3: Casual vs Registered
+        with tab3:
+            if tab3.open:
+                st.markdown("### Segmentasi Pengguna: Casual vs Registered")
+            
+                with profile.stage('agg.user_totals'):
+                    user_totals = rollup(day_cube_filtered, measures=('cnt', 'casual', 'registered'), stats=('sum',)).iloc[0]
+                total_casual = user_totals['casual_sum']
+                total_registered = user_totals['registered_sum']
+                total_all = user_totals['cnt_sum']
+            
+                col1, col2, col3 = st.columns(3)
+            
+                with col1:
+                    st.metric("Total Casual", f"{total_casual:,.0f}", f"{total_casual/total_all*100:.1f}%")
+            
+                with col2:
+                    st.metric("Total Registered", f"{total_registered:,.0f}", f"{total_registered/total_all*100:.1f}%")
+            
+                with col3:
+                    st.metric("Total Semua", f"{total_all:,.0f}", "100%")
+            
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    # Pie chart
+                    show_chart('users_pie', total_casual=total_casual, total_registered=total_registered)
+            
+                with col2:
+                    # Trend bulanan
+                    with profile.stage('agg.monthly_users'):
+                        monthly_users = rollup(day_cube_filtered, by='mnth', measures=('casual', 'registered')).rename(columns=lambda c: c[:-len('_mean')])
+                
+                    show_chart('users_monthly_line', monthly_users=monthly_users)
+            
+                # Pengaruh cuaca
+                st.markdown("### Pengaruh Kondisi Cuaca pada Tipe Pengguna")
+            
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    with profile.stage('agg.weather_casual'):
+                        weather_casual = rollup(day_cube_filtered, by='weathersit', measures=('casual',))['mean'].rename(index=WEATHER_LABELS).sort_values(ascending=False)
+                    show_chart('weather_casual_bar', by_weather=weather_casual)
+            
+                with col2:
+                    with profile.stage('agg.weather_registered'):
+                        weather_registered = rollup(day_cube_filtered, by='weathersit', measures=('registered',))['mean'].rename(index=WEATHER_LABELS).sort_values(ascending=False)
+                    show_chart('weather_registered_bar', by_weather=weather_registered)
+            
+                # Korelasi
+                corr_casual = day_moments.corr_of('casual', 'temp')
+                corr_registered = day_moments.corr_of('registered', 'temp')
+            
+                st.success(f"""
+                **Insight:**
+                - **Registered users** mendominasi (~{total_registered/total_all*100:.0f}%) dan lebih konsisten
+                - **Casual users** lebih sensitif terhadap cuaca (Korelasi suhu: {corr_casual:.3f})
+                - **Registered users** lebih stabil (Korelasi suhu: {corr_registered:.3f}) - commuters reguler
+                - Casual users meningkat signifikan di musim hangat & weekend
+                """)
+        
+        # TAB 4: Multi-Dimensional Clustering
+        with tab4:
+            if tab4.open:
+                st.markdown("### Clustering Multi-Dimensional (Kombinasi Faktor)")
+            
+                # Kategori temp_level, weather_quality & condition_cluster sudah dihitung di data layer
+                with profile.stage('agg.condition_clusters'):
+                    cluster_analysis = node('condition_clusters')
+            
+                # Top clusters
+                top_clusters = cluster_analysis.nlargest(8, 'cnt_mean')
+            
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    st.markdown("#### Top Kondisi dengan Penyewaan Tertinggi")
+                    show_chart('cluster_top_barh', cluster_means=top_clusters['cnt_mean'])
+            
+                with col2:
+                    st.markdown("#### Heatmap: Suhu × Cuaca")
+                    with profile.stage('agg.cluster_heatmap'):
+                        heatmap_data = node('cluster_heatmap')
+                
+                    show_chart('cluster_heatmap', heatmap_data=heatmap_data)
+            
+                # Summary
+                best_condition = cluster_analysis['cnt_mean'].idxmax()
+                best_avg = cluster_analysis['cnt_mean'].max()
+                worst_condition = cluster_analysis['cnt_mean'].idxmin()
+                worst_avg = cluster_analysis['cnt_mean'].min()
+            
+                st.info(f"""
+                **Insight:**
+                - **Kondisi Terbaik**: {best_condition} → {best_avg:.0f} penyewaan/hari
+                - **Kondisi Terburuk**: {worst_condition} → {worst_avg:.0f} penyewaan/hari
+                - **Selisih**: {best_avg - worst_avg:.0f} penyewaan
+                - **Efek Sinergis**: Kombinasi suhu optimal + cuaca baik memaksimalkan demand
+                - Berguna untuk: prediksi demand, pricing dinamis, & perencanaan operasional
+                """)
+            
+                # Top 5 clusters detail
+                st.markdown("#### Detail Top 5 Kondisi")
+                st.dataframe(
+                    top_clusters.head().style.format({
+                        'cnt_count': '{:.0f}',
+                        'cnt_mean': '{:.0f}',
+                        'casual_mean': '{:.0f}',
+                        'registered_mean': '{:.0f}'
+                    }),
+                    width='stretch'
+                )
+        renderer.flush()
+    
+    advanced_tabs()
 
 # ========== HALAMAN KESIMPULAN ==========
 elif page == "📝 Kesimpulan":
@@ -891,24 +902,25 @@ elif page == "📝 Kesimpulan":
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
-    with col1:
-        best_season = day_df.groupby('season_name')['cnt'].sum().idxmax()
+    with col1, profile.stage('agg.best_season'):
+        best_season = SEASON_LABELS[rollup(day_cube, by='season', stats=('sum',))['sum'].idxmax()]
         st.metric("Musim Terbaik", best_season, "🍂")
     
-    with col2:
-        correlation = day_df['temp'].corr(day_df['cnt'])
+    with col2, profile.stage('agg.overall_corr'):
+        correlation = merge_all(day_state.moments.values(), day_state.moment_columns).corr_of('temp', 'cnt')
         st.metric("Korelasi Suhu", f"{correlation:.3f}", "Positif Kuat")
     
-    with col3:
-        best_weather = day_df.groupby('weather_name')['cnt'].mean().idxmax()
+    with col3, profile.stage('agg.best_weather'):
+        best_weather = WEATHER_LABELS[rollup(day_cube, by='weathersit')['mean'].idxmax()]
         st.metric("Cuaca Terbaik", "Clear", "☀️")
     
-    with col4:
-        rush_hour = hour_df.groupby('hr')['cnt'].mean().idxmax()
+    with col4, profile.stage('agg.rush_hour'):
+        rush_hour = rollup(hour_cube, by='hr')['mean'].idxmax()
         st.metric("Jam Tersibuk", f"{rush_hour}:00", "🚴")
     
-    with col5:
-        reg_pct = (day_df['registered'].sum() / day_df['cnt'].sum()) * 100
+    with col5, profile.stage('agg.registered_share'):
+        all_totals = rollup(day_cube, measures=('cnt', 'registered'), stats=('sum',)).iloc[0]
+        reg_pct = (all_totals['registered_sum'] / all_totals['cnt_sum']) * 100
         st.metric("Registered %", f"{reg_pct:.0f}%", "Dominan")
     
     st.success("✅ **Dashboard berhasil menampilkan semua analisis utama dan lanjutan dengan teknik clustering, segmentasi, dan binning!**")
@@ -927,6 +939,12 @@ elif page == "📝 Kesimpulan":
     ✅ **Statistical Aggregation**: Mean, std, quartiles untuk segmentasi
     """)
 
+# Render semua chart halaman ini (paralel) lalu isi placeholder-nya
+with profile.stage('charts'):
+    renderer.flush()
+for chart_id, seconds in renderer.render_seconds.items():
+    profile.record(f'chart.{chart_id}', seconds)
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -938,3 +956,36 @@ st.markdown("""
         </p>
     </div>
 """, unsafe_allow_html=True)
+
+# Statistik stage kumulatif untuk seluruh proses (sumber metrik Prometheus)
+@st.cache_resource
+def get_stage_stats():
+    return StageStats()
+
+stage_stats = get_stage_stats()
+run_seconds = profile.finish(stage_stats, metrics_path)
+
+# Panel debug tersembunyi, hanya muncul dengan ?debug=1
+if debug_mode:
+    with st.sidebar:
+        st.markdown("---")
+        with st.expander("🐞 Debug: Waktu per Stage", expanded=True):
+            st.caption(f"Rerun ini: {run_seconds * 1000:.1f} ms | Figure cache: {figure_cache.hits} hit / {figure_cache.misses} miss")
+            run_timings = pd.Series(profile.timings, name='ms').mul(1000).sort_values(ascending=False)
+            st.dataframe(run_timings.to_frame().style.format('{:.2f}'), width='stretch')
+            
+            cumulative = pd.DataFrame({
+                'calls': pd.Series(stage_stats.counts),
+                'mean_ms': pd.Series(stage_stats.seconds) / pd.Series(stage_stats.counts) * 1000,
+            }).sort_values('mean_ms', ascending=False)
+            st.write(f"**Kumulatif proses ({stage_stats.runs} rerun)**")
+            st.dataframe(cumulative.style.format({'calls': '{:.0f}', 'mean_ms': '{:.2f}'}), width='stretch')
+            
+            st.write("**Import lazy (ms, import pertama di proses ini)**")
+            import_times = pd.Series(IMPORT_TIMES, name='ms', dtype='float64').mul(1000).sort_values(ascending=False)
+            st.dataframe(import_times.to_frame().style.format('{:.1f}'), width='stretch')
+            
+            st.write("**Node graph analisis (hit / miss, total ms hitung)**")
+            node_stats = graph.stats_frame().assign(ms=lambda df: df.pop('seconds') * 1000)
+            st.dataframe(node_stats.style.format({'hits': '{:.0f}', 'misses': '{:.0f}', 'ms': '{:.1f}'}), width='stretch')
+            st.caption(f"Memo graph: {len(graph._memo)} entry, {graph.total_bytes / 2**20:.1f} / {graph.max_bytes / 2**20:.0f} MB")
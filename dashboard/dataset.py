@@ -0,0 +1,168 @@
+"""
+Dataset in-memory yang bisa di-refresh secara inkremental.
+
+LiveDataset memegang frame bersih (per segment store, lihat
+selection.Segments), cube, bitmap index, dan time index (filter rentang
+tanggal) untuk day & hour.
+refresh() membandingkan manifest store dengan state saat ini: kalau hanya ada
+segment baru (hasil append_rows), hanya segment itu yang dibaca lalu cube &
+akumulator moment di-merge dan bitmap / time key untuk segment itu
+ditambahkan. Frame lama tidak disalin, jadi biaya refresh sebanding dengan
+delta.
+Kalau CSV diganti di luar append_rows, tabel di-load ulang penuh.
+Sketch quantile kolom cnt (sketch.py) juga dipegang per sel filter dan
+di-merge saat append, begitu juga piramida rollup waktu (pyramid.py) untuk
+chart tren dan prefix sum per periode (rolling.py) untuk metrik rolling.
+Ketiganya hanya dibangun untuk tabel yang dibaca dashboard (lihat
+SKETCH_TABLES, PYRAMID_TABLES, PREFIX_TABLES); tabel lain berisi None.
+Dengan PersistentCache (persist.py), cube/index/moment/sketch hasil load penuh
+disimpan di disk per hash isi data sehingga restart tidak membangunnya ulang.
+"""
+import os
+import threading
+from collections import namedtuple
+
+from cube import build_cube, merge_cubes, DAY_DIMS, HOUR_DIMS
+from datastore import (
+    TABLES, STORE_VERSION, append_rows, is_store_fresh, load_table_segments, read_manifest, read_segment_frames
+)
+from pyramid import RollupPyramid
+from rolling import PrefixSums
+from selection import BitmapIndex, Segments, TimeIndex, DAY_INDEX_COLUMNS, HOUR_INDEX_COLUMNS
+from sketch import sketches_by
+from stats import moments_by, numeric_columns
+
+CUBE_DIMS = {'day': DAY_DIMS, 'hour': HOUR_DIMS}
+INDEX_COLUMNS = {'day': DAY_INDEX_COLUMNS, 'hour': HOUR_INDEX_COLUMNS}
+# Akumulator moment disimpan per sel filter sidebar
+MOMENT_CELLS = ['season', 'weathersit']
+# Kolom yang punya sketch quantile per sel (threshold segmentasi demand)
+SKETCH_COLUMN = 'cnt'
+# Resolusi waktu tabel: level terhalus piramida rollup & periode prefix sum
+TIME_UNIT = {'day': 'day', 'hour': 'hour'}
+# Tabel yang punya sketch (threshold demand harian), piramida (chart tren per jam), dan prefix sum
+# (metrik rolling harian); struktur yang tidak dibaca dashboard tidak dibangun
+SKETCH_TABLES = {'day'}
+PYRAMID_TABLES = {'hour'}
+PREFIX_TABLES = {'day'}
+# Naikkan kalau isi tuple turunan berubah supaya entry cache persisten lama tidak dipakai
+DERIVED_VERSION = 7
+
+_TableState = namedtuple('TableState', [
+    'segments', 'manifest', 'cube', 'index', 'moments', 'moment_columns', 'sketches', 'time_index', 'pyramid',
+    'prefix'
+])
+
+
+class TableState(_TableState):
+    """State satu tabel; di-swap utuh supaya pembaca selalu melihat kombinasi yang konsisten."""
+    __slots__ = ()
+
+    @property
+    def frame(self):
+        """Frame utuh (segment digabung sekali per generasi data kalau lebih dari satu)."""
+        return self.segments.frame
+
+    def take(self, mask):
+        """Baris terpilih menurut mask (hanya baris terpilih yang disalin)."""
+        return self.segments.take(mask)
+
+
+def derive(name, df):
+    """Struktur turunan (cube, index, moment, sketch, time index, piramida, prefix) dari satu frame."""
+    columns = numeric_columns(df)
+    return (build_cube(df, CUBE_DIMS[name]), BitmapIndex(df, INDEX_COLUMNS[name]),
+            moments_by(df, MOMENT_CELLS, columns),
+            columns,
+            sketches_by(df, MOMENT_CELLS, SKETCH_COLUMN) if name in SKETCH_TABLES else None,
+            TimeIndex(df),
+            RollupPyramid.from_frame(df, TIME_UNIT[name]) if name in PYRAMID_TABLES else None,
+            PrefixSums.from_frame(df, TIME_UNIT[name]) if name in PREFIX_TABLES else None)
+
+
+def extend_derived(name, derived, delta):
+    """Struktur turunan untuk data lama + baris `delta`; biaya sebanding dengan delta."""
+    cube, index, moments, columns, sketches, time_index, pyramid, prefix = derived
+    cube = merge_cubes(cube, build_cube(delta, CUBE_DIMS[name]), CUBE_DIMS[name])
+    moments = dict(moments)
+    for key, m in moments_by(delta, MOMENT_CELLS, columns).items():
+        moments[key] = moments[key].merge(m) if key in moments else m
+    if sketches is not None:
+        sketches = dict(sketches)
+        for key, sk in sketches_by(delta, MOMENT_CELLS, SKETCH_COLUMN).items():
+            sketches[key] = sketches[key].merge(sk) if key in sketches else sk
+    if pyramid is not None:
+        pyramid = pyramid.extended(delta)
+    if prefix is not None:
+        prefix = prefix.extended(delta)
+    return cube, index.extended(delta), moments, columns, sketches, time_index.extended(delta), pyramid, prefix
+
+
+class LiveDataset:
+    def __init__(self, data_dir, cache=None):
+        self.data_dir = data_dir
+        self.cache = cache
+        self.tables = {}
+        self._lock = threading.Lock()
+        for name in TABLES:
+            self._load_full(name)
+
+    @property
+    def version(self):
+        """Versi data gabungan, dipakai sebagai bagian key cache turunan."""
+        return ':'.join(self.tables[name].manifest['source_hash'] for name in TABLES)
+
+    def _load_full(self, name):
+        frames, manifest = load_table_segments(self.data_dir, name)
+
+        def build():
+            derived = derive(name, frames[0])
+            for delta in frames[1:]:
+                derived = extend_derived(name, derived, delta)
+            return derived
+
+        if self.cache is not None:
+            derived = self.cache.memoize(
+                f'derived.{name}', (STORE_VERSION, DERIVED_VERSION, manifest['source_hash']),
+                sum(len(f) for f in frames), build
+            )
+        else:
+            derived = build()
+        self.tables[name] = TableState(Segments(frames, manifest['source_hash']), manifest, *derived)
+
+    def _apply_segments(self, name, manifest, segments):
+        state = self.tables[name]
+        frames = state.segments
+        derived = tuple(state)[2:]
+        for delta in read_segment_frames(self.data_dir, segments):
+            frames = frames.extended(delta, manifest['source_hash'])
+            derived = extend_derived(name, derived, delta)
+        self.tables[name] = TableState(frames, manifest, *derived)
+
+    def refresh(self):
+        """Sinkronkan dengan store. Mengembalikan True kalau ada tabel yang berubah."""
+        changed = False
+        with self._lock:
+            for name in TABLES:
+                current = self.tables[name].manifest
+                manifest = read_manifest(self.data_dir, name)
+                csv_path = os.path.join(self.data_dir, f'{name}.csv')
+                if manifest == current and is_store_fresh(csv_path, manifest):
+                    continue
+
+                known = current.get('segments', [])
+                if (manifest is not None and manifest.get('store_version') == STORE_VERSION
+                        and manifest['segments'][:len(known)] == known
+                        and is_store_fresh(csv_path, manifest)):
+                    # Hanya ada segment baru hasil append
+                    self._apply_segments(name, manifest, manifest['segments'][len(known):])
+                else:
+                    self._load_full(name)
+                changed = True
+        return changed
+
+    def append(self, name, rows):
+        """append_rows() lalu langsung sinkronkan state in-memory."""
+        delta = append_rows(self.data_dir, name, rows)
+        self.refresh()
+        return delta
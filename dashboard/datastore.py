@@ -0,0 +1,561 @@
+"""
+Data store kolumnar untuk dataset Bike Sharing.
+
+CSV mentah (day.csv & hour.csv) di-ingest sekali, per chunk, menjadi file
+Arrow IPC (tanpa kompresi) yang sudah bersih: duplikat dibuang, dteday sudah datetime,
+label musim/cuaca sudah categorical, dan kolom turunan (temp_celsius,
+season_name, weather_name, serta dimensi analisis seperti day_type,
+temp_level, weather_quality, condition_cluster) sudah dihitung sebagai
+categorical (kode int8), dan semua kolom numerik memakai schema kompak
+(int8 / uint32 / float32) alih-alih default int64 / float64. Hash konten CSV sumber disimpan di
+manifest JSON per tabel sehingga load berikutnya cukup memory-map file store
+dan hanya jatuh kembali ke parsing CSV kalau CSV-nya berubah.
+
+Baris baru bisa ditambahkan lewat append_rows(): hanya baris baru yang
+divalidasi, di-dedupe, dan dibersihkan, lalu ditulis sebagai segment Arrow
+tambahan (dan di-append ke CSV) tanpa menyentuh histori.
+
+Jalankan ingest manual / append / laporan memori:
+    python dashboard/datastore.py [data_dir]
+    python dashboard/datastore.py memory [data_dir]
+    python dashboard/datastore.py append {day|hour} new_rows.csv [data_dir]
+"""
+import contextlib
+import hashlib
+import itertools
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Naikkan versi ini setiap kali logika cleaning / kolom turunan / format store berubah
+STORE_VERSION = '5'
+STORE_DIRNAME = 'store'
+TABLES = ('day', 'hour')
+# Baris per chunk saat parsing CSV (memori puncak ingest dibatasi ukuran chunk)
+DEFAULT_CHUNKSIZE = 200_000
+
+SEASON_LABELS = {1: 'Spring', 2: 'Summer', 3: 'Fall', 4: 'Winter'}
+WEATHER_LABELS = {
+    1: 'Clear/Partly Cloudy',
+    2: 'Mist/Cloudy',
+    3: 'Light Snow/Rain',
+    4: 'Heavy Rain/Snow'
+}
+
+
+# Dimensi turunan untuk halaman analisis (dihitung sekali di data layer)
+WEEKEND_DAYS = [0, 6]
+DAY_TYPES = ['Weekday', 'Weekend']
+TEMP_CATEGORY_BINS = [0, 10, 20, 30, 41]
+TEMP_CATEGORIES = ['Dingin', 'Sejuk', 'Hangat', 'Panas']
+TEMP_LEVEL_BINS = [0, 15, 25, 41]
+TEMP_LEVELS = ['Cold', 'Moderate', 'Hot']
+HOUR_CATEGORY_BINS = [-1, 6, 12, 18, 24]
+HOUR_CATEGORIES = ['Malam (00-06)', 'Pagi (07-12)', 'Siang (13-18)', 'Sore (19-24)']
+# Urutan alfabet, sama dengan urutan kolom pivot_table versi sebelumnya
+WEATHER_QUALITIES = ['Bad', 'Fair', 'Good']
+# Index = weathersit: 1 -> Good, 2 -> Fair, 3/4 -> Bad
+WEATHER_QUALITY_CODES = np.array([-1, 2, 1, 0, 0], dtype='int8')
+CONDITION_CLUSTERS = [f'{t} + {w}' for t in TEMP_LEVELS for w in WEATHER_QUALITIES]
+
+
+def find_data_dir():
+    """Cari folder data yang berisi day.csv dan hour.csv (None kalau tidak ada)."""
+    possible_dirs = [
+        os.environ.get('BIKE_DATA_DIR', ''),  # Override, mis. untuk benchmark dengan data sintetis
+        'data',  # Untuk Streamlit Cloud (root repo)
+        './data',
+        '../data',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data'),  # Relative to dashboard/
+    ]
+    for data_dir in possible_dirs:
+        if data_dir and all(os.path.isfile(os.path.join(data_dir, f'{name}.csv')) for name in TABLES):
+            return data_dir
+    return None
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 dari isi file, dibaca per chunk supaya memori tetap kecil."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def clean_frame(df):
+    """Cleaning + kolom turunan, sama seperti di notebook."""
+    df = df.drop_duplicates().reset_index(drop=True)
+
+    # Konversi datetime
+    df['dteday'] = pd.to_datetime(df['dteday'], format='%Y-%m-%d', errors='coerce')
+    # Kategori tetap supaya setiap chunk / segment punya dictionary yang sama
+    df['season'] = pd.Categorical(df['season'], categories=list(SEASON_LABELS))
+
+    # Konversi suhu ke Celsius
+    df['temp_celsius'] = df['temp'] * 41
+
+    # Mapping musim dan cuaca sebagai categorical dengan urutan tetap
+    df['season_name'] = pd.Categorical(
+        df['season'].astype('int64').map(SEASON_LABELS),
+        categories=list(SEASON_LABELS.values())
+    )
+    df['weather_name'] = pd.Categorical(
+        df['weathersit'].map(WEATHER_LABELS),
+        categories=list(WEATHER_LABELS.values())
+    )
+    df = add_derived_columns(df)
+    return df.astype({c: t for c, t in COMPACT_DTYPES.items() if c in df.columns})
+
+
+def add_derived_columns(df):
+    """Dimensi analisis turunan, semuanya vectorized sebagai categorical."""
+    weekend = np.isin(df['weekday'].to_numpy(), WEEKEND_DAYS)
+    df['day_type'] = pd.Categorical.from_codes(weekend.astype('int8'), categories=DAY_TYPES)
+
+    df['temp_category'] = pd.cut(df['temp_celsius'], bins=TEMP_CATEGORY_BINS, labels=TEMP_CATEGORIES)
+    df['temp_level'] = pd.cut(df['temp_celsius'], bins=TEMP_LEVEL_BINS, labels=TEMP_LEVELS)
+
+    weathersit = df['weathersit'].to_numpy().clip(0, len(WEATHER_QUALITY_CODES) - 1)
+    quality_codes = WEATHER_QUALITY_CODES[weathersit]
+    df['weather_quality'] = pd.Categorical.from_codes(quality_codes, categories=WEATHER_QUALITIES)
+
+    # Kombinasi suhu x cuaca langsung dari kode, tanpa konkatenasi string per baris
+    level_codes = df['temp_level'].cat.codes.to_numpy()
+    cluster_codes = np.where(
+        (level_codes >= 0) & (quality_codes >= 0),
+        level_codes * len(WEATHER_QUALITIES) + quality_codes, -1
+    ).astype('int8')
+    df['condition_cluster'] = pd.Categorical.from_codes(cluster_codes, categories=CONDITION_CLUSTERS)
+
+    if 'hr' in df.columns:
+        df['hour_category'] = pd.cut(df['hr'], bins=HOUR_CATEGORY_BINS, labels=HOUR_CATEGORIES)
+    return df
+
+
+# Dtype eksplisit saat parsing CSV supaya setiap chunk punya schema yang sama
+CSV_DTYPES = {
+    'instant': 'int64', 'dteday': 'str', 'season': 'int64', 'yr': 'int64', 'mnth': 'int64',
+    'hr': 'int64', 'holiday': 'int64', 'weekday': 'int64', 'workingday': 'int64',
+    'weathersit': 'int64', 'temp': 'float64', 'atemp': 'float64', 'hum': 'float64',
+    'windspeed': 'float64', 'casual': 'int64', 'registered': 'int64', 'cnt': 'int64',
+}
+
+# Schema kompak yang diterapkan saat load; label teks disimpan sebagai categorical
+COMPACT_DTYPES = {
+    'instant': 'uint32', 'yr': 'int8', 'mnth': 'int8', 'hr': 'int8', 'holiday': 'int8',
+    'weekday': 'int8', 'workingday': 'int8', 'weathersit': 'int8',
+    'temp': 'float32', 'atemp': 'float32', 'hum': 'float32', 'windspeed': 'float32',
+    'temp_celsius': 'float32', 'casual': 'uint32', 'registered': 'uint32', 'cnt': 'uint32',
+}
+
+# Tahun pertama dataset (yr = 0)
+FIRST_YEAR = 2011
+
+# Kolom kunci untuk dedupe: instant dan (dteday[, hr])
+KEY_COLUMNS = {'day': ['dteday'], 'hour': ['dteday', 'hr']}
+
+# Rentang valid kolom kode untuk validasi baris baru (yr & mnth dicek terhadap dteday)
+VALID_RANGES = {
+    'season': (1, 4), 'mnth': (1, 12), 'hr': (0, 23),
+    'holiday': (0, 1), 'weekday': (0, 6), 'workingday': (0, 1), 'weathersit': (1, 4),
+}
+
+
+def pandas_default_dtypes(df):
+    """Frame yang sama dengan dtype default pandas (int64 / float64 / object), sebagai pembanding."""
+    out = df.copy()
+    for col in out.columns:
+        if isinstance(out[col].dtype, pd.CategoricalDtype) and col != 'season':
+            out[col] = out[col].astype(object)
+        elif pd.api.types.is_integer_dtype(out[col]):
+            out[col] = out[col].astype('int64')
+        elif pd.api.types.is_float_dtype(out[col]):
+            out[col] = out[col].astype('float64')
+    return out
+
+
+def memory_report(df):
+    """Footprint per kolom sebelum (dtype default pandas) dan sesudah schema kompak."""
+    before = pandas_default_dtypes(df)
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'bytes_before': before.memory_usage(index=False, deep=True),
+        'dtype_after': df.dtypes.astype(str),
+        'bytes_after': df.memory_usage(index=False, deep=True),
+    })
+    report.loc['TOTAL'] = ['', report['bytes_before'].sum(), '', report['bytes_after'].sum()]
+    return report
+
+
+def store_dir(data_dir):
+    return os.path.join(data_dir, STORE_DIRNAME)
+
+
+def store_path(data_dir, name, segment=0):
+    suffix = '' if segment == 0 else f'.{segment:05d}'
+    return os.path.join(store_dir(data_dir), f'{name}{suffix}.arrow')
+
+
+def manifest_path(data_dir, name):
+    return os.path.join(store_dir(data_dir), f'{name}.json')
+
+
+def _source_info(csv_path):
+    stat = os.stat(csv_path)
+    return {'source_size': str(stat.st_size), 'source_mtime_ns': str(stat.st_mtime_ns)}
+
+
+def _remove_if_exists(path):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def _write_table(table, path):
+    tmp_path = f'{path}.tmp'
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)  # atomic, reader lain tidak pernah melihat file setengah jadi
+    finally:
+        _remove_if_exists(tmp_path)
+
+
+def write_store(df, path):
+    """Tulis frame ke Arrow IPC (atomic)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write_table(table, path)
+
+
+def write_store_chunks(chunks, path, compact=True):
+    """
+    Tulis chunk frame berurutan ke satu file Arrow IPC (atomic).
+
+    Chunk ditulis dulu sebagai record batch terpisah, lalu kalau lebih dari
+    satu batch dipadatkan menjadi satu batch: kolom yang terpecah di beberapa
+    batch disalin oleh to_pandas, sehingga read_store tidak lagi zero-copy.
+    compact=False melewati pemadatan (memori puncak tetap sebatas satu chunk,
+    untuk mode out-of-core).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    batches_path = f'{path}.batches'
+    try:
+        writer = schema = None
+        with pa.OSFile(batches_path, 'wb') as sink:
+            try:
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        schema = table.schema
+                        writer = pa.ipc.new_file(sink, schema)
+                    writer.write_table(table if table.schema.equals(schema) else table.cast(schema))
+            finally:
+                if writer is not None:
+                    writer.close()
+
+        table = None
+        if compact:
+            with pa.memory_map(batches_path, 'r') as source:
+                reader = pa.ipc.open_file(source)
+                # Satu salinan tabel penuh di memori, hanya selama pemadatan
+                table = reader.read_all().combine_chunks() if reader.num_record_batches > 1 else None
+        if table is None:
+            os.replace(batches_path, path)
+        else:
+            _write_table(table, path)
+    finally:
+        # File sementara tidak tertinggal, juga kalau penulisan gagal di tengah jalan
+        _remove_if_exists(batches_path)
+
+
+def new_manifest(data_dir, name):
+    """Manifest store satu segment untuk CSV tabel `name` saat ini."""
+    csv_path = os.path.join(data_dir, f'{name}.csv')
+    return {
+        'store_version': STORE_VERSION,
+        'source_hash': file_hash(csv_path),
+        **_source_info(csv_path),
+        'segments': [os.path.basename(store_path(data_dir, name))],
+    }
+
+
+def read_manifest(data_dir, name):
+    """Manifest store (None kalau tidak ada / rusak)."""
+    try:
+        with open(manifest_path(data_dir, name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(data_dir, name, manifest):
+    path = manifest_path(data_dir, name)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_store(path):
+    """
+    Memory-map store Arrow IPC lalu konversi ke DataFrame.
+
+    Dengan split_blocks=True kolom numerik menjadi view read-only langsung ke
+    buffer hasil mmap (zero-copy), sehingga semua sesi dan semua proses worker
+    di node yang sama berbagi page cache file store yang sama. Hanya kode
+    categorical (1 byte/baris) yang disalin.
+    """
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def read_segment_frames(data_dir, segments):
+    """Satu frame (mmap) per file segment, tanpa digabung."""
+    return [read_store(os.path.join(store_dir(data_dir), seg)) for seg in segments]
+
+
+def read_segments(data_dir, name, segments):
+    frames = read_segment_frames(data_dir, segments)
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def is_store_fresh(csv_path, manifest):
+    """Store valid kalau versinya cocok dan isi CSV sumber belum berubah."""
+    if manifest is None or manifest.get('store_version') != STORE_VERSION:
+        return False
+    # Fast path: ukuran & mtime sama, tidak perlu hashing ulang
+    info = _source_info(csv_path)
+    if all(manifest.get(k) == v for k, v in info.items()):
+        return True
+    return manifest.get('source_hash') == file_hash(csv_path)
+
+
+class RowDeduper:
+    """Dedupe lintas chunk berdasarkan hash seluruh isi baris (setara drop_duplicates)."""
+
+    def __init__(self):
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    def filter(self, chunk):
+        hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        first = ~pd.Series(hashes).duplicated().to_numpy()
+        pos = np.searchsorted(self.seen, hashes).clip(max=max(len(self.seen) - 1, 0))
+        already = (self.seen[pos] == hashes) if len(self.seen) else np.zeros(len(hashes), dtype=bool)
+        keep = first & ~already
+        # Merge terurut: hanya hash baru yang diurutkan, lalu disisipkan di posisinya
+        # (tanpa mengurutkan ulang semua hash yang sudah terlihat)
+        added = np.sort(hashes[keep])
+        self.seen = np.insert(self.seen, np.searchsorted(self.seen, added), added)
+        return chunk[keep]
+
+
+def iter_clean_chunks(csv_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield chunk bersih (sudah dedupe + kolom turunan) dari CSV mentah."""
+    reader = iter(pd.read_csv(csv_path, dtype=CSV_DTYPES, chunksize=chunksize))
+    deduper = None
+    raw = next(reader, None)
+    while raw is not None:
+        following = next(reader, None)
+        # CSV yang muat satu chunk cukup memakai drop_duplicates di clean_frame, tanpa hash baris
+        if deduper is None and following is not None:
+            deduper = RowDeduper()
+        if deduper is not None:
+            raw = deduper.filter(raw)
+        if len(raw):
+            yield clean_frame(raw)
+        raw = following
+
+
+def _clean_chunks(csv_path, chunksize):
+    chunks = iter_clean_chunks(csv_path, chunksize)
+    first = next(chunks, None)
+    if first is None:
+        # CSV tanpa baris data: tetap satu frame kosong dengan schema lengkap
+        first = clean_frame(pd.read_csv(csv_path, dtype=CSV_DTYPES))
+    return itertools.chain([first], chunks)
+
+
+def ingest_table(data_dir, name, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Parse CSV mentah per chunk, bersihkan, lalu tulis ke store batch demi
+    batch. Mengembalikan (frame bersih, manifest).
+    """
+    csv_path = os.path.join(data_dir, f'{name}.csv')
+    manifest = new_manifest(data_dir, name)
+    try:
+        write_store_chunks(_clean_chunks(csv_path, chunksize), store_path(data_dir, name))
+        write_manifest(data_dir, name, manifest)
+        # Baca balik dari mmap supaya proses ini juga memakai buffer bersama
+        df = read_store(store_path(data_dir, name))
+    except OSError:
+        # Filesystem read-only (mis. di deployment), pakai hasil in-memory saja
+        df = pd.concat(list(_clean_chunks(csv_path, chunksize)), ignore_index=True)
+    df.attrs['source_hash'] = manifest['source_hash']
+    return df, manifest
+
+
+def load_table_segments(data_dir, name):
+    """Seperti load_table, tapi frame per segment store tidak digabung: ([frame, ...], manifest)."""
+    csv_path = os.path.join(data_dir, f'{name}.csv')
+    manifest = read_manifest(data_dir, name)
+    if is_store_fresh(csv_path, manifest):
+        return read_segment_frames(data_dir, manifest['segments']), manifest
+    df, manifest = ingest_table(data_dir, name)
+    return [df], manifest
+
+
+def load_table(data_dir, name):
+    """Load satu tabel beserta manifest-nya, re-ingest dari CSV kalau hash berbeda."""
+    frames, manifest = load_table_segments(data_dir, name)
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    # Versi data untuk key cache turunan (chart, agregat)
+    df.attrs['source_hash'] = manifest['source_hash']
+    return df, manifest
+
+
+def load_dataset(data_dir):
+    """Load (day_df, hour_df) dari store, re-ingest dari CSV kalau hash berbeda."""
+    return tuple(load_table(data_dir, name)[0] for name in TABLES)
+
+
+def validate_rows(rows, name, columns):
+    """
+    Validasi baris mentah baru terhadap schema CSV.
+
+    Mengembalikan frame dengan urutan kolom sama seperti CSV, atau
+    ValueError kalau ada kolom hilang / nilai tidak valid.
+    """
+    missing = [c for c in columns if c not in rows.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada untuk {name}: {missing}")
+    rows = rows[columns].copy()
+
+    numeric_cols = [c for c in columns if c != 'dteday']
+    try:
+        rows[numeric_cols] = rows[numeric_cols].apply(pd.to_numeric, errors='raise')
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Nilai non-numerik pada baris baru {name}: {e}") from e
+    if rows[numeric_cols].isna().any().any():
+        raise ValueError(f"Terdapat nilai kosong pada baris baru {name}")
+    dates = pd.to_datetime(rows['dteday'], format='%Y-%m-%d', errors='coerce')
+    if dates.isna().any():
+        raise ValueError(f"Format dteday tidak valid pada baris baru {name} (harus YYYY-MM-DD)")
+    # yr = tahun sejak awal dataset (2011 -> 0), jadi data 2013 ke atas tetap valid
+    if not (rows['yr'] == dates.dt.year - FIRST_YEAR).all():
+        raise ValueError(f"yr harus sama dengan tahun dteday - {FIRST_YEAR} pada baris baru {name}")
+    if not (rows['mnth'] == dates.dt.month).all():
+        raise ValueError(f"mnth harus sama dengan bulan dteday pada baris baru {name}")
+
+    for col, (low, high) in VALID_RANGES.items():
+        if col in rows.columns and not rows[col].between(low, high).all():
+            raise ValueError(f"Nilai {col} di luar rentang {low}-{high} pada baris baru {name}")
+    if not (rows['casual'] + rows['registered'] == rows['cnt']).all():
+        raise ValueError(f"cnt harus sama dengan casual + registered pada baris baru {name}")
+    return rows
+
+
+def _row_keys(df, name):
+    """Kunci integer (hari sejak epoch [* 24 + hr]) untuk dedupe dteday(+hr)."""
+    days = pd.to_datetime(df['dteday'], format='%Y-%m-%d').to_numpy().astype('datetime64[D]').astype('int64')
+    if 'hr' in KEY_COLUMNS[name]:
+        return days * 24 + np.asarray(df['hr'], dtype='int64')
+    return days
+
+
+def _read_key_columns(data_dir, manifest):
+    """Baca hanya kolom kunci dari semua segment (memory-mapped, tanpa kolom lain)."""
+    tables = []
+    for seg in manifest['segments']:
+        with pa.memory_map(os.path.join(store_dir(data_dir), seg), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        tables.append(table.select([c for c in ('instant', 'dteday', 'hr') if c in table.schema.names]))
+    return pa.concat_tables(tables).to_pandas()
+
+
+def append_rows(data_dir, name, rows):
+    """
+    Tambahkan baris mentah baru ke tabel `name`.
+
+    Hanya baris baru yang divalidasi, di-dedupe (berdasarkan instant dan
+    dteday[+hr], terhadap histori maupun di dalam batch), dan dibersihkan.
+    Hasilnya ditulis sebagai segment Arrow baru + di-append ke CSV, lalu
+    manifest di-update. Mengembalikan frame bersih berisi baris yang benar-benar
+    ditambahkan (kosong kalau semuanya duplikat).
+    """
+    csv_path = os.path.join(data_dir, f'{name}.csv')
+    manifest = read_manifest(data_dir, name)
+    if not is_store_fresh(csv_path, manifest):
+        _, manifest = ingest_table(data_dir, name)
+
+    with open(csv_path) as f:
+        columns = f.readline().strip().split(',')
+    rows = validate_rows(rows, name, columns)
+
+    # Dedupe di dalam batch, lalu terhadap histori
+    rows = rows.drop_duplicates()
+    rows = rows[~rows['instant'].duplicated().to_numpy() & ~pd.Series(_row_keys(rows, name)).duplicated().to_numpy()]
+    new_keys = _row_keys(rows, name)
+    existing = _read_key_columns(data_dir, manifest)
+    is_new = (
+        ~np.isin(rows['instant'].to_numpy(), existing['instant'].to_numpy())
+        & ~np.isin(new_keys, _row_keys(existing, name))
+    )
+    rows = rows[is_new]
+    if rows.empty:
+        return clean_frame(rows)
+
+    # Kolom turunan hanya untuk baris baru
+    delta = clean_frame(rows)
+    segment = len(manifest['segments'])
+    write_store(delta, store_path(data_dir, name, segment))
+
+    # CSV tetap menjadi sumber kebenaran supaya re-ingest penuh tidak kehilangan data
+    appended = rows.to_csv(header=False, index=False, lineterminator='\n')
+    with open(csv_path, 'a', newline='') as f:
+        f.write(appended)
+
+    # Hash versi berantai: hash lama + byte baru, tanpa membaca ulang seluruh CSV.
+    # Kalau CSV disentuh di luar append_rows, fast path size/mtime gagal dan store di-ingest ulang.
+    manifest = {
+        **manifest,
+        'source_hash': hashlib.sha256((manifest['source_hash'] + appended).encode()).hexdigest(),
+        **_source_info(csv_path),
+        'segments': manifest['segments'] + [os.path.basename(store_path(data_dir, name, segment))],
+    }
+    write_manifest(data_dir, name, manifest)
+    delta.attrs['source_hash'] = manifest['source_hash']
+    return delta
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'append':
+        if len(sys.argv) < 4 or sys.argv[2] not in TABLES:
+            sys.exit("Usage: python dashboard/datastore.py append {day|hour} new_rows.csv [data_dir]")
+        target_dir = sys.argv[4] if len(sys.argv) > 4 else find_data_dir()
+        added = append_rows(target_dir, sys.argv[2], pd.read_csv(sys.argv[3]))
+        print(f"{sys.argv[2]}: {len(added):,} baris baru ditambahkan")
+        sys.exit(0)
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'memory':
+        target_dir = sys.argv[2] if len(sys.argv) > 2 else find_data_dir()
+        for table_name in TABLES:
+            report = memory_report(load_table(target_dir, table_name)[0])
+            before, after = report.loc['TOTAL', 'bytes_before'], report.loc['TOTAL', 'bytes_after']
+            print(f"\n=== {table_name} ===")
+            print(report.to_string())
+            print(f"{before / 1024:,.1f} KB -> {after / 1024:,.1f} KB ({after / before * 100:.0f}%)")
+        sys.exit(0)
+
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else find_data_dir()
+    if target_dir is None:
+        sys.exit("File data tidak ditemukan! Pastikan day.csv dan hour.csv ada di folder 'data/'")
+    for table_name in TABLES:
+        frame, _ = ingest_table(target_dir, table_name)
+        print(f"{table_name}: {len(frame):,} baris -> {store_path(target_dir, table_name)}")
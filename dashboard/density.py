@@ -0,0 +1,30 @@
+"""
+Mode density untuk scatter suhu vs penyewaan per jam.
+
+Alih-alih menggambar satu titik per baris, titik-titik di-binning di server
+menjadi raster 2D berukuran tetap (satu raster per kategori) dalam satu
+pass np.bincount. Garis regresi dan korelasi diambil dari akumulator moment
+per kategori (lihat stats.py), bukan dari titik mentah, sehingga waktu
+render dan ukuran gambar tidak bergantung jumlah baris.
+"""
+import numpy as np
+
+
+def bin_density(x, y, codes, n_groups, x_range, y_range, bins=(60, 40)):
+    """
+    Raster count per grup dalam satu pass.
+
+    codes adalah kode grup 0..n_groups-1 per baris (baris dengan kode < 0
+    diabaikan). Mengembalikan array (n_groups, ny, nx).
+    """
+    nx, ny = bins
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    codes = np.asarray(codes)
+
+    bx = ((x - x_range[0]) / (x_range[1] - x_range[0]) * nx).astype('int64').clip(0, nx - 1)
+    by = ((y - y_range[0]) / (y_range[1] - y_range[0]) * ny).astype('int64').clip(0, ny - 1)
+    valid = codes >= 0
+    flat = (codes[valid] * ny + by[valid]) * nx + bx[valid]
+    counts = np.bincount(flat, minlength=n_groups * ny * nx)
+    return counts.reshape(n_groups, ny, nx)
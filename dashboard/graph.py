@@ -0,0 +1,183 @@
+"""
+Graph komputasi kecil dengan memoization per fingerprint input.
+
+Setiap node dideklarasikan dengan input berupa source (frame dasar, state
+filter, dataset) atau node lain. Fingerprint node = hash(nama, versi,
+fingerprint semua input), jadi saat satu input berubah hanya node di hilir
+input itu yang dihitung ulang; node lain tetap hit. Hasil disimpan di memo
+in-memory (LRU, dibagi antar sesi, dibatasi jumlah entry dan total byte)
+dan, untuk node persist=True, di PersistentCache sehingga ikut bertahan
+setelah restart. Node memo=False (mis. frame hasil filter yang besar dan
+murah dibuat ulang) tidak disimpan di memo: hasilnya hanya dibagi di dalam
+satu compute(), dan node hilir yang hit tidak memerlukannya sama sekali.
+
+Contoh:
+    graph = Graph()
+    graph.source('day')
+    graph.source('season')
+
+    @graph.node('day_filtered', inputs=['day', 'season'])
+    def day_filtered(day, season):
+        return day[day['season'].isin(season)]
+
+    graph.compute('day_filtered', {'day': day_df, 'season': (1, 2)})
+    graph.stats_frame()   # hit / miss / waktu per node
+"""
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+from persist import make_key
+
+Node = namedtuple('Node', ['name', 'func', 'inputs', 'version', 'persist', 'memo'])
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def value_nbytes(value):
+    """Perkiraan ukuran hasil node di memori (frame/array dihitung dari buffer datanya)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(value_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(value_nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+def default_fingerprint(value):
+    """Fingerprint stabil untuk nilai source: frame/series di-hash isinya, lainnya lewat repr."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        source_hash = value.attrs.get('source_hash')
+        if source_hash is not None:
+            return f'frame:{source_hash}:{len(value)}'
+        return f'frame:{int(pd.util.hash_pandas_object(value, index=True).sum())}:{len(value)}'
+    return repr(value)
+
+
+class Graph:
+    def __init__(self, cache=None, max_entries=256, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache = cache
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.sources = {}
+        self.nodes = {}
+        self.stats = {}
+        # fingerprint -> (hasil, ukuran byte)
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def source(self, name, fingerprint=default_fingerprint):
+        """Deklarasikan input dari luar graph (nilainya diberikan saat compute())."""
+        self.sources[name] = fingerprint
+
+    def node(self, name, inputs, version=1, persist=False, memo=True):
+        """Decorator untuk mendaftarkan node; fungsi dipanggil dengan input sebagai keyword argument."""
+        def register(func):
+            unknown = [i for i in inputs if i not in self.sources and i not in self.nodes]
+            if unknown:
+                raise ValueError(f"Input node {name} belum dideklarasikan: {unknown}")
+            self.nodes[name] = Node(name, func, list(inputs), version, persist, memo)
+            self.stats[name] = {'hits': 0, 'misses': 0, 'seconds': 0.0}
+            return func
+        return register
+
+    def _count(self, name, hit, seconds=0.0):
+        with self._lock:
+            stats = self.stats[name]
+            stats['hits' if hit else 'misses'] += 1
+            stats['seconds'] += seconds
+
+    def _fingerprint(self, name, values, fingerprints):
+        if name in fingerprints:
+            return fingerprints[name]
+        if name in self.sources:
+            if name not in values:
+                raise KeyError(f"Source {name} tidak diberikan")
+            fp = self.sources[name](values[name])
+        else:
+            node = self.nodes[name]
+            parts = [self._fingerprint(i, values, fingerprints) for i in node.inputs]
+            fp = hashlib.sha256(repr((name, node.version, parts)).encode()).hexdigest()
+        fingerprints[name] = fp
+        return fp
+
+    def _evaluate(self, name, values, fingerprints, results):
+        if name in results:
+            return results[name]
+        if name in self.sources:
+            results[name] = values[name]
+            return results[name]
+
+        node = self.nodes[name]
+        fp = self._fingerprint(name, values, fingerprints)
+        with self._lock:
+            if node.memo and fp in self._memo:
+                self._memo.move_to_end(fp)
+                results[name] = self._memo[fp][0]
+                hit = True
+            else:
+                hit = False
+        if hit:
+            self._count(name, True)
+            return results[name]
+
+        missing = object()
+        value = missing
+        if node.persist and self.cache is not None:
+            value = self.cache.get(make_key(f'node.{name}', fp), missing)
+        if value is missing:
+            # Input hanya dievaluasi kalau node ini benar-benar harus dihitung
+            kwargs = {i: self._evaluate(i, values, fingerprints, results) for i in node.inputs}
+            start = time.perf_counter()
+            value = node.func(**kwargs)
+            self._count(name, False, time.perf_counter() - start)
+            if node.persist and self.cache is not None:
+                self.cache.put(make_key(f'node.{name}', fp), value)
+        else:
+            self._count(name, True)
+
+        results[name] = value
+        if not node.memo:
+            return value
+        nbytes = value_nbytes(value)
+        with self._lock:
+            if fp not in self._memo:
+                self._memo[fp] = (value, nbytes)
+                self.total_bytes += nbytes
+            # Entry terlama dibuang sampai jumlah entry & total byte di bawah batas (minimal satu tersisa)
+            while len(self._memo) > 1 and (len(self._memo) > self.max_entries or self.total_bytes > self.max_bytes):
+                _, (_, evicted) = self._memo.popitem(last=False)
+                self.total_bytes -= evicted
+        return value
+
+    def compute(self, names, values):
+        """
+        Hitung satu node (nama str) atau beberapa node (list) untuk nilai source
+        `values`. Hasil dibagi antar pemanggil: jangan dimutasi.
+        """
+        fingerprints, results = {}, {}
+        if isinstance(names, str):
+            return self._evaluate(names, values, fingerprints, results)
+        return [self._evaluate(name, values, fingerprints, results) for name in names]
+
+    def stats_frame(self):
+        """Statistik hit / miss / total detik hitung per node."""
+        with self._lock:
+            stats = {name: dict(s) for name, s in self.stats.items()}
+        return pd.DataFrame.from_dict(stats, orient='index', columns=['hits', 'misses', 'seconds'])
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+            self.total_bytes = 0
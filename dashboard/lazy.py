@@ -0,0 +1,149 @@
+"""
+Import lazy & warm-up di background untuk start dashboard yang cepat.
+
+Library plotting (matplotlib, seaborn) tidak di-import di top-level
+dashboard: timed_import() / LazyModule baru meng-import modul saat pertama
+dipakai dan mencatat waktunya di IMPORT_TIMES (ditampilkan di panel debug).
+run_in_background() menjalankan pekerjaan (load dataset, import plotting) di
+thread daemon dan mengembalikan Future.
+
+Laporan waktu import per modul untuk cold start (proses baru):
+    python dashboard/lazy.py [--top 20]
+"""
+import argparse
+import ast
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+# Modul -> detik import pertama di proses ini (termasuk dependency yang belum ter-load)
+IMPORT_TIMES = {}
+_lock = threading.Lock()
+
+
+def timed_import(name):
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Proxy modul yang baru di-import saat atributnya pertama kali diakses."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(timed_import(self._name), attr)
+
+
+def run_in_background(func, *args, name='warmup'):
+    """Jalankan func(*args) di thread daemon; hasil/exception tersedia lewat Future."""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
+
+
+def import_report(modules):
+    """
+    Waktu import cold (proses Python baru, -X importtime) untuk `modules`.
+
+    Mengembalikan list (modul, self detik, kumulatif detik) untuk import
+    langsung (bukan dependency bertingkat) sesuai urutan import.
+    """
+    code = '; '.join(f'import {m}' for m in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6, module))
+    # Modul top-level (tanpa indentasi) menunjukkan biaya total tiap import langsung;
+    # modul bawaan start interpreter (site, encodings, ...) tidak dihitung
+    roots = {m.split('.')[0] for m in modules}
+    return [(m, s, c) for m, s, c, raw in rows if not raw[1:].startswith(' ') and m.split('.')[0] in roots]
+
+
+def _top_level_imports(path):
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    names = []
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Import):
+            names += [alias.name for alias in stmt.names]
+        elif isinstance(stmt, ast.ImportFrom) and stmt.level == 0:
+            names.append(stmt.module)
+    return names
+
+
+def startup_modules(script='dashboard.py'):
+    """
+    Modul yang di-import saat start dashboard, diturunkan dari import
+    top-level `script` dan modul lokal yang di-import-nya (rekursif). Urutan
+    dependency dulu, jadi biaya tiap modul lokal tercatat di barisnya sendiri.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    order = []
+    seen = set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        path = os.path.join(here, f'{name}.py')
+        if os.path.exists(path):
+            for dep in _top_level_imports(path):
+                visit(dep)
+        order.append(name)
+
+    for name in _top_level_imports(os.path.join(here, script)):
+        visit(name)
+    # Modul plotting di-import lazy (chart pertama), dilaporkan terpisah
+    plotting_roots = {m.split('.')[0] for m in PLOTTING_MODULES}
+    return [m for m in order if m.split('.')[0] not in plotting_roots]
+
+
+# Import yang ditunda sampai chart pertama (startup_modules() = yang dibayar saat start dashboard)
+PLOTTING_MODULES = ['matplotlib.pyplot', 'seaborn', 'charts']
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Laporan waktu import cold start dashboard")
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    # Satu proses: modul startup dulu, lalu plotting (biaya plotting = yang belum ter-load)
+    report = import_report(startup_modules() + PLOTTING_MODULES)
+    plotting_roots = {m.split('.')[0] for m in PLOTTING_MODULES}
+    groups = {'Start dashboard': [], 'Plotting (lazy, chart pertama)': []}
+    for row in report:
+        lazy_group = row[0].split('.')[0] in plotting_roots
+        groups['Plotting (lazy, chart pertama)' if lazy_group else 'Start dashboard'].append(row)
+
+    for title, rows in groups.items():
+        print(f"\n== {title}: {sum(c for m, s, c in rows):.2f}s ==")
+        print(f"{'modul':40s} {'self':>8s} {'kumulatif':>10s}")
+        for module, self_s, cumulative_s in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+            print(f"{module:40s} {self_s:8.3f} {cumulative_s:10.3f}")
@@ -0,0 +1,12 @@
+"""
+Warna & urutan kategori yang dipakai bersama renderer matplotlib (charts.py)
+dan Vega-Lite (altair_charts.py). Sengaja tanpa import matplotlib supaya mode
+chart interaktif tidak ikut memuatnya.
+"""
+SEASON_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
+PERIOD_COLORS = ['#3498db', '#e74c3c', '#f39c12', '#9b59b6']
+WEATHER_COLORS = ['#2ECC71', '#F39C12', '#E74C3C']
+DEMAND_COLORS = ['#E74C3C', '#F39C12', '#2ECC71']
+# Casual, registered
+USER_COLORS = ['#f39c12', '#2ecc71']
+WEATHER_ORDER = ['Clear/Partly Cloudy', 'Mist/Cloudy', 'Light Snow/Rain']
@@ -0,0 +1,140 @@
+"""
+Cache persisten di disk (SQLite) untuk agregat turunan.
+
+Berbeda dengan st.cache_data / FigureCache yang hilang saat proses restart,
+isi cache ini disimpan di satu file SQLite (default data/store/cache.sqlite)
+sehingga bisa dipakai bersama oleh semua replika di node yang sama dan oleh
+notebook. Key dibentuk dari id agregasi + versi data (hash isi CSV) + state
+filter, jadi data baru otomatis memakai key baru. Total ukuran dibatasi
+dengan eviction LRU berdasarkan waktu akses terakhir.
+
+Contoh (notebook):
+    cache = open_cache('data')
+    stats = cache.memoize('hourly_pattern', version, {}, lambda: hour_df.groupby('hr')['cnt'].mean())
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from datastore import store_dir
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+CACHE_FILENAME = 'cache.sqlite'
+
+
+def make_key(namespace, *parts):
+    """Key stabil antar proses (repr bagian key harus deterministik: str, int, tuple, ...)."""
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()
+    return f'{namespace}:{digest}'
+
+
+class PersistentCache:
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Koneksi SQLite tidak boleh dipakai lintas thread, jadi satu koneksi per thread
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)')
+
+    @classmethod
+    def for_data_dir(cls, data_dir, max_bytes=None):
+        """Cache di folder store data (bisa dioverride env BIKE_CACHE_PATH / BIKE_CACHE_MAX_MB)."""
+        path = os.environ.get('BIKE_CACHE_PATH') or os.path.join(store_dir(data_dir), CACHE_FILENAME)
+        if max_bytes is None:
+            max_mb = os.environ.get('BIKE_CACHE_MAX_MB')
+            max_bytes = int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+        return cls(path, max_bytes)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # WAL: pembaca dari proses lain tidak terblokir saat ada yang menulis
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        conn = self._connect()
+        row = conn.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        with conn:
+            conn.execute('UPDATE entries SET last_access = ? WHERE key = ?', (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)',
+                (key, blob, len(blob), time.time())
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Hapus entry yang paling lama tidak diakses sampai total di bawah batas
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY last_access'):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+
+    def memoize(self, namespace, version, params, compute):
+        """Ambil hasil agregasi `namespace` untuk versi data + parameter, atau hitung lalu simpan."""
+        key = make_key(namespace, version, params)
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    @property
+    def total_bytes(self):
+        return self._connect().execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM entries')
+
+
+def open_cache(data_dir):
+    """
+    PersistentCache untuk data_dir, atau None kalau dimatikan dengan BIKE_CACHE=0
+    atau file cache tidak bisa dibuat (mis. filesystem read-only di deployment).
+    Dengan None pemanggil cukup memakai cache in-memory.
+    """
+    if os.environ.get('BIKE_CACHE') == '0':
+        return None
+    try:
+        return PersistentCache.for_data_dir(data_dir)
+    except (OSError, sqlite3.Error):
+        return None
@@ -0,0 +1,125 @@
+"""
+Instrumentasi waktu per stage untuk rerun dashboard.
+
+Setiap rerun memakai satu RunProfile: blok yang dibungkus `with
+profile.stage('nama')` dicatat durasinya (load, filter, agregasi, chart).
+Di akhir rerun finish() menggabungkan hasilnya ke StageStats milik proses
+(count & total detik per stage, bisa diekspor sebagai metrik Prometheus)
+dan menulis satu baris log JSON ke stderr (handler & level INFO dipasang
+saat profiling aktif; logger tanpa konfigurasi membuang level INFO).
+Kalau profiling mati, stage() hanya mengembalikan context manager kosong
+yang sama sehingga overhead-nya sebatas satu pengecekan atribut.
+"""
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger('bike_dashboard.profile')
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def enable_logging():
+    """Pasang handler stderr & level INFO untuk log profiling (sekali per proses)."""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+        # Tidak diteruskan ke root supaya tidak tercetak dua kali kalau root juga punya handler
+        logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+
+class StageStats:
+    """Statistik kumulatif per stage untuk seluruh proses (dibagi antar sesi)."""
+
+    def __init__(self):
+        self.counts = {}
+        self.seconds = {}
+        self.runs = 0
+        self._lock = threading.Lock()
+
+    def add_run(self, timings):
+        with self._lock:
+            self.runs += 1
+            for name, elapsed in timings.items():
+                self.counts[name] = self.counts.get(name, 0) + 1
+                self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+
+    def to_prometheus(self, prefix='bike_dashboard'):
+        """Format teks exposition Prometheus (mis. untuk textfile collector node_exporter)."""
+        with self._lock:
+            counts, seconds, runs = dict(self.counts), dict(self.seconds), self.runs
+        lines = [
+            f'# HELP {prefix}_runs_total Jumlah rerun dashboard yang diprofile.',
+            f'# TYPE {prefix}_runs_total counter',
+            f'{prefix}_runs_total {runs}',
+            f'# HELP {prefix}_stage_seconds_total Total waktu per stage.',
+            f'# TYPE {prefix}_stage_seconds_total counter',
+        ]
+        lines += [f'{prefix}_stage_seconds_total{{stage="{name}"}} {seconds[name]:.6f}' for name in sorted(seconds)]
+        lines += [
+            f'# HELP {prefix}_stage_calls_total Jumlah eksekusi per stage.',
+            f'# TYPE {prefix}_stage_calls_total counter',
+        ]
+        lines += [f'{prefix}_stage_calls_total{{stage="{name}"}} {counts[name]}' for name in sorted(counts)]
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        # Tulis atomik supaya scraper tidak membaca file setengah jadi
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+class RunProfile:
+    """Pencatat waktu untuk satu rerun (satu sesi)."""
+
+    def __init__(self, enabled=False, context=None):
+        self.enabled = enabled
+        self.context = context or {}
+        self.timings = OrderedDict()
+        self._start = time.perf_counter()
+        if enabled:
+            enable_logging()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        """Catat durasi yang diukur di tempat lain (mis. waktu render di worker)."""
+        if self.enabled:
+            # Stage yang sama dalam satu rerun (mis. di dalam loop) dijumlahkan
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def finish(self, stats=None, metrics_path=None):
+        """Gabungkan ke statistik proses, tulis log terstruktur & file metrik (opsional)."""
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._start
+        if stats is not None:
+            stats.add_run(self.timings)
+            if metrics_path:
+                stats.write_prometheus(metrics_path)
+        logger.info(json.dumps({
+            'event': 'rerun',
+            **self.context,
+            'total_s': round(total, 6),
+            'stages': {name: round(elapsed, 6) for name, elapsed in self.timings.items()},
+        }, ensure_ascii=False))
+        return total
@@ -0,0 +1,150 @@
+"""
+Piramida rollup waktu multi-resolusi (jam -> hari -> minggu -> bulan -> tahun).
+
+Total cnt/casual/registered (plus jumlah baris) disimpan per periode dan per
+musim di setiap level. Level dasar dibangun sekali dari baris, level yang
+lebih kasar dari level induknya (minggu tidak nested di bulan, jadi bulan
+dibangun dari hari). Chart tren memilih level terhalus yang jumlah titiknya
+dalam rentang terlihat masih muat di budget titik (kira-kira lebar chart
+dalam pixel), jadi biaya query & render bergantung pada jumlah pixel, bukan
+jumlah baris.
+
+Semua ukuran aditif: piramida dari baris hasil append cukup dijumlahkan ke
+piramida lama (periode yang sama digabung), seperti merge_cubes.
+"""
+import numpy as np
+import pandas as pd
+
+from selection import _hour_key, time_keys
+
+MEASURES = ('cnt', 'casual', 'registered')
+GROUP_COLUMN = 'season'
+N_GROUPS = 4
+# Titik maksimum per chart tren (~lebar chart dalam pixel)
+DEFAULT_MAX_POINTS = 400
+
+
+def _week_start(keys):
+    # Minggu mulai Senin; 1970-01-01 (hari 0) adalah Kamis
+    days = keys // 24
+    return (days - (days + 3) % 7) * 24
+
+
+def _calendar_start(unit):
+    def start(keys):
+        return keys.astype('datetime64[h]').astype(f'datetime64[{unit}]').astype('datetime64[h]').astype('int64')
+    return start
+
+
+# Fungsi jam sejak epoch -> awal periode (juga dalam jam sejak epoch), dari terhalus ke terkasar
+LEVELS = {
+    'hour': lambda keys: keys,
+    'day': lambda keys: keys // 24 * 24,
+    'week': _week_start,
+    'month': _calendar_start('M'),
+    'year': _calendar_start('Y'),
+}
+# Level sumber untuk membangun tiap level (periode level harus nested di periode induknya)
+PARENTS = {'day': 'hour', 'week': 'day', 'month': 'day', 'year': 'month'}
+LEVEL_LABELS = {'hour': 'Jam', 'day': 'Hari', 'week': 'Minggu', 'month': 'Bulan', 'year': 'Tahun'}
+
+
+def _combine(starts, sums):
+    """Jumlahkan baris `sums` dengan awal periode yang sama; hasil terurut per periode."""
+    if len(starts) == 0:
+        return starts, sums
+    order = np.argsort(starts, kind='stable')
+    starts, sums = starts[order], sums[order]
+    unique, first = np.unique(starts, return_index=True)
+    return unique, np.add.reduceat(sums, first, axis=0)
+
+
+class RollupPyramid:
+    def __init__(self, levels):
+        # {nama level: (awal periode int64 terurut, total float64 [periode, musim, ukuran + n])}
+        self.levels = levels
+
+    @classmethod
+    def from_frame(cls, df, base='hour'):
+        names = list(LEVELS)[list(LEVELS).index(base):]
+        keys = LEVELS[base](time_keys(df))
+        groups = df[GROUP_COLUMN].to_numpy().astype('int64') - 1
+        values = np.column_stack([df[m].to_numpy(dtype='float64') for m in MEASURES] + [np.ones(len(df))])
+
+        # Level dasar: satu pass bincount per ukuran atas (periode, musim)
+        starts, inverse = np.unique(keys, return_inverse=True)
+        cells = inverse.reshape(-1) * N_GROUPS + groups
+        size = len(starts) * N_GROUPS
+        sums = np.stack(
+            [np.bincount(cells, weights=values[:, j], minlength=size) for j in range(values.shape[1])], axis=-1
+        ).reshape(len(starts), N_GROUPS, values.shape[1])
+
+        levels = {names[0]: (starts, sums)}
+        for name in names[1:]:
+            starts, sums = levels[PARENTS[name]]
+            levels[name] = _combine(LEVELS[name](starts), sums)
+        return cls(levels)
+
+    @property
+    def base(self):
+        return next(iter(self.levels))
+
+    def merge(self, other):
+        """Piramida gabungan (periode yang muncul di keduanya dijumlahkan)."""
+        return RollupPyramid({
+            name: _combine(np.concatenate([starts, other.levels[name][0]]),
+                           np.concatenate([sums, other.levels[name][1]]))
+            for name, (starts, sums) in self.levels.items()
+        })
+
+    def extended(self, df):
+        """Piramida baru dengan baris tambahan (hasil append)."""
+        return self.merge(RollupPyramid.from_frame(df, self.base))
+
+    def _bounds(self, level, start, stop):
+        # Periode yang beririsan dengan [start, stop): awal periode < stop dan periode berisi / setelah start
+        starts = self.levels[level][0]
+        lo = 0 if start is None else int(np.searchsorted(starts, LEVELS[level](_hour_key(start)), side='left'))
+        hi = len(starts) if stop is None else int(np.searchsorted(starts, _hour_key(stop), side='left'))
+        return lo, max(lo, hi)
+
+    def n_points(self, level, start=None, stop=None):
+        lo, hi = self._bounds(level, start, stop)
+        return hi - lo
+
+    def choose_level(self, start=None, stop=None, max_points=DEFAULT_MAX_POINTS):
+        """Level terhalus yang jumlah periodenya dalam [start, stop) <= max_points."""
+        for level in self.levels:
+            if self.n_points(level, start, stop) <= max_points:
+                return level
+        return level
+
+    def _base_sum(self, start_key, stop_key):
+        starts, sums = self.levels[self.base]
+        lo, hi = np.searchsorted(starts, [start_key, stop_key], side='left')
+        return sums[lo:hi].sum(axis=0)
+
+    def series(self, level, seasons=None, start=None, stop=None):
+        """
+        DataFrame total cnt/casual/registered & jumlah baris (n) per periode
+        level `level` untuk musim terpilih dalam [start, stop). Periode di
+        tepi rentang yang hanya sebagian masuk dihitung ulang dari level
+        dasar, jadi total tetap eksak.
+        """
+        starts, sums = self.levels[level]
+        lo, hi = self._bounds(level, start, stop)
+        starts, sums = starts[lo:hi], sums[lo:hi]
+        if level != self.base and len(starts) and (start is not None or stop is not None):
+            start_key = -np.inf if start is None else _hour_key(start)
+            stop_key = np.inf if stop is None else _hour_key(stop)
+            ends = np.append(starts[1:], self.levels[level][0][hi] if hi < len(self.levels[level][0]) else np.inf)
+            sums = sums.copy()
+            for i in {0, len(starts) - 1}:
+                if starts[i] < start_key or ends[i] > stop_key:
+                    sums[i] = self._base_sum(max(starts[i], start_key), min(ends[i], stop_key))
+
+        groups = list(range(N_GROUPS)) if seasons is None else [int(s) - 1 for s in seasons]
+        totals = sums[:, groups, :].sum(axis=1)
+        frame = pd.DataFrame(totals, columns=list(MEASURES) + ['n'],
+                             index=pd.DatetimeIndex(starts.astype('datetime64[h]'), name='period'))
+        return frame[frame['n'] > 0]
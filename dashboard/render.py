@@ -0,0 +1,237 @@
+"""
+Cache hasil render chart matplotlib.
+
+Chart di-render menjadi PNG bytes satu kali per key (chart id + state filter
++ versi data), figure langsung ditutup, lalu bytes-nya disimpan di cache LRU
+yang dibatasi total ukuran. Rerun dengan kombinasi yang sama cukup
+mengirim ulang bytes tanpa layout matplotlib. Kalau diberi PersistentCache,
+PNG juga disimpan di disk sehingga tetap tersedia setelah proses restart.
+
+Chart yang belum ada di cache dikumpulkan dulu selama satu rerun lalu
+di-render bersamaan di process pool (lihat charts.py), sehingga latensi
+halaman mendekati chart paling lambat, bukan jumlah semua chart.
+"""
+import io
+import multiprocessing
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from lazy import timed_import
+from persist import make_key
+
+
+def pyplot():
+    """matplotlib.pyplot dengan backend Agg, baru di-import saat chart pertama di-render."""
+    if 'matplotlib.pyplot' not in sys.modules:
+        timed_import('matplotlib').use('Agg')  # Non-interactive backend untuk Streamlit Cloud
+    return timed_import('matplotlib.pyplot')
+
+
+# Lebar maksimum gambar di st.image (2 x lebar konten Streamlit). PNG yang lebih lebar
+# di-decode, di-resize, dan di-encode ulang oleh Streamlit di setiap rerun, juga saat cache hit.
+MAX_PNG_WIDTH = 2 * 730
+# Naikkan kalau format PNG berubah supaya PNG lama di cache disk tidak dipakai lagi
+FIGURE_VERSION = 2
+
+
+def figure_to_png(fig, dpi=200):
+    """
+    Simpan figure ke PNG bytes (setting sama dengan default st.pyplot), dengan
+    dpi diturunkan seperlunya supaya lebarnya tidak melebihi MAX_PNG_WIDTH.
+    """
+    buf = io.BytesIO()
+    dpi = min(dpi, MAX_PNG_WIDTH / fig.get_size_inches()[0])
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+    return buf.getvalue()
+
+
+class FigureCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk=None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """PNG untuk key (memori, lalu disk), atau None (dihitung sebagai miss)."""
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return png
+        if self.disk is not None:
+            png = self.disk.get(make_key('figure', FIGURE_VERSION, key))
+            if png is not None:
+                self._remember(key, png)
+                with self._lock:
+                    self.hits += 1
+                return png
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, png):
+        self._remember(key, png)
+        if self.disk is not None:
+            self.disk.put(make_key('figure', FIGURE_VERSION, key), png)
+
+    def _remember(self, key, png):
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = png
+                self.total_bytes += len(png)
+            self._evict()
+
+    def get_or_render(self, key, draw):
+        """Ambil PNG dari cache, atau panggil draw() -> Figure lalu render dan simpan."""
+        png = self.get(key)
+        if png is not None:
+            return png
+
+        fig = draw()
+        try:
+            png = figure_to_png(fig)
+        finally:
+            # Selalu tutup figure supaya tidak menumpuk di proses server
+            pyplot().close(fig)
+        self.put(key, png)
+        return png
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, png = self._entries.popitem(last=False)
+            self.total_bytes -= len(png)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Batas default worker render: tiap worker spawn memuat matplotlib sendiri (~puluhan MB)
+MAX_DEFAULT_WORKERS = 4
+
+
+def render_workers():
+    """Jumlah worker render: env BIKE_RENDER_WORKERS, default min(4, jumlah CPU) (0 / 1 = render serial)."""
+    value = os.environ.get('BIKE_RENDER_WORKERS')
+    return int(value) if value else min(MAX_DEFAULT_WORKERS, os.cpu_count() or 1)
+
+
+def init_worker():
+    """Initializer worker render: matplotlib (backend Agg) & modul chart di-import sekali per worker."""
+    pyplot()
+    timed_import('charts')
+
+
+class RenderPool:
+    """
+    Process pool render yang dibuat lazy dan bisa dibangun ulang.
+
+    Executor baru dibuat saat chart pertama dikirim, dan worker spawn baru
+    dijalankan saat dibutuhkan. Kalau pool rusak (worker mati), executor
+    dibuang; submit berikutnya membuat executor baru.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """Future hasil func(*args); BrokenProcessPool / RuntimeError diteruskan ke pemanggil."""
+        with self._lock:
+            if self._executor is None:
+                # spawn: fork dari server Streamlit yang multi-thread tidak aman. Worker spawn
+                # menjalankan ulang modul __main__ saat bootstrap kecuali __main__.__spec__ bernama
+                # '__main__'; script dashboard memasang spec itu sendiri (lihat dashboard.py), jadi
+                # sys.modules['__main__'] yang juga diganti Streamlit tiap rerun tidak disentuh di sini
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=init_worker
+                )
+            return self._executor.submit(func, *args)
+
+    def reset(self):
+        """Buang executor (mis. setelah BrokenProcessPool); executor baru dibuat saat submit berikutnya."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        self.reset()
+
+
+def make_render_pool(workers=None):
+    """RenderPool untuk render chart, atau None kalau hanya satu worker (render serial)."""
+    workers = render_workers() if workers is None else workers
+    if workers <= 1:
+        return None
+    return RenderPool(workers)
+
+
+class ParallelRenderer:
+    """
+    Antrian chart satu rerun.
+
+    request() langsung menampilkan chart yang ada di cache; sisanya dikirim ke
+    pool (atau di-render serial kalau pool None) dan ditampilkan saat flush().
+    """
+
+    def __init__(self, cache, pool=None):
+        self.cache = cache
+        self.pool = pool
+        self.render_seconds = {}
+        self._pending = []
+
+    def request(self, key, chart_id, data, show):
+        """
+        show(png) dipanggil begitu PNG tersedia (mis. placeholder.image).
+
+        data berupa dict argumen renderer, atau fungsi yang mengembalikan dict
+        tersebut (dipanggil hanya kalau chart belum ada di cache).
+        """
+        png = self.cache.get(key)
+        if png is not None:
+            show(png)
+            return
+        if callable(data):
+            data = data()
+        future = None
+        if self.pool is not None:
+            # Import lokal: charts.py sendiri mengimpor figure_to_png dari modul ini
+            from charts import render_png
+            try:
+                future = self.pool.submit(render_png, chart_id, data)
+            except (BrokenProcessPool, RuntimeError):
+                # Pool rusak / sudah shutdown: bangun ulang untuk request berikutnya,
+                # chart ini di-render di proses ini saat flush()
+                self.pool.reset()
+        self._pending.append((key, chart_id, data, future, show))
+
+    def flush(self):
+        """Tunggu semua chart yang di-render lalu tampilkan sesuai urutan request."""
+        from charts import render_png
+        pending, self._pending = self._pending, []
+        for key, chart_id, data, future, show in pending:
+            try:
+                png, seconds = future.result() if future is not None else render_png(chart_id, data)
+            except BrokenProcessPool:
+                # Worker mati (mis. OOM): render di proses ini saja, pool dibangun ulang
+                self.pool.reset()
+                png, seconds = render_png(chart_id, data)
+            self.render_seconds[chart_id] = seconds
+            self.cache.put(key, png)
+            show(png)
@@ -0,0 +1,113 @@
+"""
+Prefix sum per periode untuk rata-rata bergerak & KPI jendela waktu.
+
+PrefixSums menyimpan jumlah kumulatif cnt/casual/registered dan jumlah baris
+(n) di grid periode yang rapat (hari atau jam, periode tanpa baris bernilai
+0), berurutan menurut waktu. Total jendela w periode yang berakhir di periode
+t cukup C[t + 1] - C[t + 1 - w], jadi rata-rata 7/28 hari, share casual, atau
+selisih minggu-ke-minggu untuk jendela mana pun di rentang mana pun O(1) per
+titik output.
+
+Rata-rata jendela = total cnt / jumlah baris dalam jendela, sehingga dengan
+filter musim/cuaca hari yang tidak terpilih tidak ikut dihitung. Saat append,
+hanya bagian prefix mulai periode delta pertama yang ditambah (tanpa cumsum
+ulang seluruh frame).
+"""
+import numpy as np
+import pandas as pd
+
+from selection import _hour_key, time_keys
+
+MEASURES = ('cnt', 'casual', 'registered')
+# Panjang satu periode dalam jam
+UNITS = {'day': 24, 'hour': 1}
+
+
+def _period_values(keys, df, first, n_periods):
+    columns = [df[m].to_numpy(dtype='float64') for m in MEASURES] + [np.ones(len(df))]
+    return np.stack(
+        [np.bincount(keys - first, weights=values, minlength=n_periods) for values in columns], axis=-1
+    )
+
+
+class PrefixSums:
+    def __init__(self, first, unit, cumulative):
+        # first: periode pertama (jumlah periode sejak epoch); cumulative: [periode + 1, ukuran + n]
+        self.first = first
+        self.unit = unit
+        self.cumulative = cumulative
+
+    @classmethod
+    def from_frame(cls, df, unit='day'):
+        keys = time_keys(df) // UNITS[unit]
+        if len(keys) == 0:
+            return cls(0, unit, np.zeros((1, len(MEASURES) + 1)))
+        first = int(keys.min())
+        values = _period_values(keys, df, first, int(keys.max()) - first + 1)
+        return cls(first, unit, np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)]))
+
+    def __len__(self):
+        return len(self.cumulative) - 1
+
+    def extended(self, df):
+        """Prefix baru dengan baris tambahan; hanya bagian mulai periode delta pertama yang dihitung."""
+        keys = time_keys(df) // UNITS[self.unit]
+        if len(keys) == 0:
+            return self
+        if len(self) == 0 or keys.min() < self.first:
+            # Data sebelum periode pertama: susun ulang dari nilai per periode
+            values = np.diff(self.cumulative, axis=0)
+            first = int(min(keys.min(), self.first)) if len(self) else int(keys.min())
+            last = int(max(keys.max(), self.first + len(self) - 1))
+            merged = np.zeros((last - first + 1, values.shape[1]))
+            merged[self.first - first:self.first - first + len(values)] += values
+            merged += _period_values(keys, df, first, len(merged))
+            cumulative = np.vstack([np.zeros((1, merged.shape[1])), np.cumsum(merged, axis=0)])
+            return PrefixSums(first, self.unit, cumulative)
+
+        lo = int(keys.min()) - self.first
+        n_periods = max(len(self), int(keys.max()) - self.first + 1)
+        # Periode baru di akhir melanjutkan nilai kumulatif terakhir, lalu delta ditambahkan mulai lo
+        cumulative = np.vstack([self.cumulative, np.repeat(self.cumulative[-1:], n_periods - len(self), axis=0)])
+        cumulative[lo + 1:] += np.cumsum(_period_values(keys, df, self.first + lo, n_periods - lo), axis=0)
+        return PrefixSums(self.first, self.unit, cumulative)
+
+    def position(self, timestamp):
+        """Indeks periode untuk timestamp (bisa di luar 0..len-1)."""
+        return int(_hour_key(timestamp) // UNITS[self.unit]) - self.first
+
+    def periods(self, positions):
+        hours = (np.asarray(positions, dtype='int64') + self.first) * UNITS[self.unit]
+        return pd.DatetimeIndex(hours.astype('datetime64[h]'), name='period')
+
+    def bounds(self, start=None, stop=None):
+        """Posisi [lo, hi) periode dalam rentang [start, stop), dipotong ke grid."""
+        lo = 0 if start is None else max(0, self.position(start))
+        hi = len(self) if stop is None else min(len(self), self.position(stop))
+        return lo, max(lo, hi)
+
+    def ends(self, start=None, stop=None, max_points=None):
+        """Posisi periode di [start, stop); kalau lebih dari max_points diambil dengan langkah tetap."""
+        lo, hi = self.bounds(start, stop)
+        if hi == lo:
+            return np.zeros(0, dtype='int64')
+        step = 1 if not max_points else max(1, -(-(hi - lo) // max_points))
+        # Langkah dihitung mundur dari titik terakhir supaya nilai di akhir rentang sama dengan KPI
+        return np.arange(hi - 1, lo - 1, -step)[::-1]
+
+    def window(self, ends, width):
+        """Total tiap ukuran dalam jendela `width` periode yang berakhir di tiap posisi `ends` (inklusif)."""
+        ends = np.asarray(ends, dtype='int64')
+        upper = np.clip(ends + 1, 0, len(self))
+        lower = np.clip(ends + 1 - width, 0, len(self))
+        sums = self.cumulative[upper] - self.cumulative[lower]
+        return pd.DataFrame(sums, columns=list(MEASURES) + ['n'], index=self.periods(ends))
+
+    def mean(self, ends, width, measure='cnt'):
+        """Rata-rata `measure` per baris dalam jendela (NaN kalau jendela tidak berisi baris)."""
+        sums = self.window(ends, width)
+        return sums[measure] / sums['n'].where(sums['n'] > 0)
+
+    def share(self, ends, width, part='casual', whole='cnt'):
+        sums = self.window(ends, width)
+        return sums[part] / sums[whole].where(sums[whole] > 0)
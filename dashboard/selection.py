@@ -0,0 +1,253 @@
+"""
+Bitmap index untuk filter kategorikal.
+
+Untuk setiap nilai dari kolom kategorikal (season, weathersit, workingday,
+hr) disimpan bitmap 1 bit/baris (np.packbits). Filter sidebar cukup
+meng-OR bitmap nilai yang dipilih dalam satu kolom lalu meng-AND antar
+kolom, tanpa membandingkan string per baris dan tanpa membuat salinan frame.
+
+TimeIndex menyimpan timestamp (dteday + hr) yang terurut sehingga filter
+rentang tanggal cukup dua binary search (searchsorted) lalu slicing, dan
+hasilnya bisa di-AND dengan mask bitmap.
+
+Tabel yang mendapat append disimpan sebagai beberapa segment (Segments):
+bitmap dan time key dipegang per segment, jadi extended() hanya membangun
+bagian untuk delta dan tidak menyalin bagian lama.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+DAY_INDEX_COLUMNS = ['season', 'weathersit', 'workingday']
+HOUR_INDEX_COLUMNS = DAY_INDEX_COLUMNS + ['hr']
+
+
+def _packed_bitmaps(df, columns):
+    bitmaps = {}
+    for col in columns:
+        values = np.asarray(df[col]).astype('int64')
+        bitmaps[col] = {int(v): np.packbits(values == v) for v in np.unique(values)}
+    return bitmaps
+
+
+class BitmapIndex:
+    def __init__(self, df, columns):
+        self.columns = list(columns)
+        # Satu (jumlah baris, {kolom: {nilai: bitmap}}) per segment
+        self.parts = [(len(df), _packed_bitmaps(df, self.columns))]
+
+    @property
+    def n_rows(self):
+        return sum(n for n, _ in self.parts)
+
+    def extended(self, df):
+        """
+        Index baru untuk frame lama + baris `df` yang di-append di belakangnya.
+
+        Hanya bitmap segment baru yang dibangun (biaya sebanding delta), bagian
+        lama dipakai bersama sehingga sesi lain yang masih memakai index lama
+        tetap konsisten.
+        """
+        new = BitmapIndex.__new__(BitmapIndex)
+        new.columns = self.columns
+        new.parts = self.parts + [(len(df), _packed_bitmaps(df, self.columns))]
+        return new
+
+    @staticmethod
+    def _select_part(n_rows, bitmaps, criteria):
+        packed = np.full((n_rows + 7) // 8, 0xFF, dtype=np.uint8)
+        for col, values in criteria.items():
+            if values is None:
+                continue
+            column_bits = np.zeros_like(packed)
+            for v in values:
+                bits = bitmaps[col].get(int(v))
+                if bits is not None:
+                    np.bitwise_or(column_bits, bits, out=column_bits)
+            np.bitwise_and(packed, column_bits, out=packed)
+        return np.unpackbits(packed, count=n_rows).astype(bool)
+
+    def select(self, **criteria):
+        """
+        Mask boolean untuk baris yang memenuhi semua kriteria.
+
+        Contoh: index.select(season=[1, 2], weathersit=[1]). Kriteria bernilai
+        None diabaikan (kolom tidak difilter).
+        """
+        masks = [self._select_part(n, bitmaps, criteria) for n, bitmaps in self.parts]
+        return masks[0] if len(masks) == 1 else np.concatenate(masks)
+
+    def row_ids(self, **criteria):
+        return np.flatnonzero(self.select(**criteria))
+
+
+def time_keys(df):
+    """Jam sejak epoch (dteday + hr; tabel harian memakai jam 0) sebagai int64."""
+    days = df['dteday'].to_numpy().astype('datetime64[D]').astype('int64')
+    hours = df['hr'].to_numpy().astype('int64') if 'hr' in df.columns else 0
+    return days * 24 + hours
+
+
+def _hour_key(timestamp):
+    return pd.Timestamp(timestamp).to_datetime64().astype('datetime64[h]').astype('int64')
+
+
+class _SortedKeys:
+    """Time key satu segment, terurut (langsung, atau lewat permutasi `order`)."""
+
+    def __init__(self, keys):
+        self.n_rows = len(keys)
+        if self.n_rows == 0 or np.all(keys[1:] >= keys[:-1]):
+            self.order = None
+            self.keys = keys
+        else:
+            self.order = np.argsort(keys, kind='stable')
+            self.keys = keys[self.order]
+
+    def bounds(self, start=None, stop=None):
+        lo = 0 if start is None else int(np.searchsorted(self.keys, _hour_key(start), side='left'))
+        hi = self.n_rows if stop is None else int(np.searchsorted(self.keys, _hour_key(stop), side='left'))
+        return lo, max(lo, hi)
+
+    def in_range(self, start=None, stop=None):
+        lo, hi = self.bounds(start, stop)
+        if self.order is None:
+            return lo, hi
+        in_range = np.zeros(self.n_rows, dtype=bool)
+        in_range[self.order[lo:hi]] = True
+        return in_range
+
+
+class TimeIndex:
+    """
+    Index timestamp terurut untuk filter rentang waktu.
+
+    Kalau segment sudah urut waktu (kasus normal, termasuk append data baru),
+    posisi hasil binary search langsung menjadi slice baris; kalau tidak,
+    disimpan permutasi `order` yang mengurutkan baris segment itu.
+    """
+
+    def __init__(self, df):
+        self.parts = [_SortedKeys(time_keys(df))]
+
+    def extended(self, df):
+        """Index baru untuk frame lama + baris `df` yang di-append di belakangnya (hanya delta yang diurutkan)."""
+        new = TimeIndex.__new__(TimeIndex)
+        new.parts = self.parts + [_SortedKeys(time_keys(df))]
+        return new
+
+    @property
+    def n_rows(self):
+        return sum(part.n_rows for part in self.parts)
+
+    @property
+    def start(self):
+        keys = [part.keys[0] for part in self.parts if part.n_rows]
+        return pd.Timestamp(np.datetime64(int(min(keys)), 'h')) if keys else None
+
+    @property
+    def end(self):
+        keys = [part.keys[-1] for part in self.parts if part.n_rows]
+        return pd.Timestamp(np.datetime64(int(max(keys)), 'h')) if keys else None
+
+    def row_ids(self, start=None, stop=None):
+        mask = self.restrict(np.ones(self.n_rows, dtype=bool), start, stop)
+        return np.flatnonzero(mask)
+
+    def restrict(self, mask, start=None, stop=None):
+        """AND-kan mask boolean (mis. hasil BitmapIndex.select) dengan rentang [start, stop)."""
+        mask = mask.copy()
+        offset = 0
+        for part in self.parts:
+            segment = mask[offset:offset + part.n_rows]
+            in_range = part.in_range(start, stop)
+            if isinstance(in_range, tuple):
+                lo, hi = in_range
+                segment[:lo] = False
+                segment[hi:] = False
+            else:
+                segment &= in_range
+            offset += part.n_rows
+        return mask
+
+
+def take(df, mask):
+    """
+    Ambil baris terpilih. Kalau semua baris terpilih, frame asli dikembalikan;
+    kalau baris terpilih bersambung (mis. hanya filter rentang tanggal pada
+    data urut waktu), hasilnya slice iloc tanpa menyalin data.
+    """
+    rows = np.flatnonzero(mask)
+    if len(rows) == len(df):
+        return df
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        return df.iloc[rows[0]:rows[-1] + 1]
+    return df[mask]
+
+
+class Segments:
+    """
+    Frame satu tabel sebagai daftar segment (store dasar + delta hasil append).
+
+    Segment tidak digabung saat refresh: take() memotong mask per segment dan
+    hanya menyalin baris terpilih (baris bersambung dalam satu segment
+    dikembalikan sebagai slice tanpa salinan). Frame utuh (frame) baru
+    digabung saat pertama kali diminta dan disimpan untuk generasi data ini;
+    tabel dengan satu segment langsung memakai frame hasil mmap.
+    """
+
+    def __init__(self, frames, source_hash=None):
+        self.frames = tuple(frames)
+        self.source_hash = source_hash
+        self.offsets = np.cumsum([0] + [len(f) for f in self.frames])
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def extended(self, delta, source_hash=None):
+        return Segments(self.frames + (delta,), source_hash)
+
+    def _tag(self, df):
+        if self.source_hash is not None and df.attrs.get('source_hash') != self.source_hash:
+            # Frame segment dipakai bersama generasi data lain: tag dipasang di salinan dangkal
+            df = df.copy(deep=False)
+            df.attrs['source_hash'] = self.source_hash
+        return df
+
+    @property
+    def frame(self):
+        with self._lock:
+            if self._frame is None:
+                frame = self.frames[0] if len(self.frames) == 1 else pd.concat(self.frames, ignore_index=True)
+                self._frame = self._tag(frame)
+            return self._frame
+
+    @property
+    def dtypes(self):
+        return self.frames[0].dtypes
+
+    def isin(self, name, values):
+        """Mask boolean kolom `name` bernilai salah satu `values`, tanpa menggabung frame."""
+        masks = [f[name].isin(values).to_numpy() for f in self.frames]
+        return masks[0] if len(masks) == 1 else np.concatenate(masks)
+
+    def take(self, mask):
+        """Baris terpilih sebagai satu frame; hanya baris terpilih yang disalin."""
+        if len(self.frames) == 1 or mask.all():
+            return take(self.frame, mask)
+        bounds = list(zip(self.frames, self.offsets[:-1], self.offsets[1:]))
+        touched = [(f, lo, hi) for f, lo, hi in bounds if mask[lo:hi].any()]
+        if len(touched) == 1:
+            # Semua baris terpilih di satu segment: slice/view dari segment itu saja
+            f, lo, hi = touched[0]
+            result = take(f, mask[lo:hi])
+            # Index = posisi baris di frame utuh, sama seperti frame[mask]
+            return self._tag(result.set_axis(result.index + lo) if lo else result)
+        parts = [f[mask[lo:hi]] for f, lo, hi in bounds]
+        result = pd.concat(parts, ignore_index=True)
+        # Index = posisi baris di frame utuh, sama seperti frame[mask]
+        result.index = pd.Index(np.flatnonzero(mask))
+        return self._tag(result)
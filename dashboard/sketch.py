@@ -0,0 +1,139 @@
+"""
+Sketch quantile KLL yang bisa di-merge.
+
+QuantileSketch menyimpan ringkasan berukuran tetap (~3k item) dari satu
+kolom numerik: level h berisi item berbobot 2^h. Saat sebuah level melebihi
+kapasitasnya, item di level itu diurutkan lalu separuhnya (posisi genap atau
+ganjil, dipilih acak) naik ke level berikutnya dengan bobot dua kali lipat.
+Sketch per sel filter (season x weathersit) bisa digabung sehingga quantile
+untuk kombinasi filter mana pun dihitung dari gabungan sketch tanpa memindai
+atau mengurutkan baris.
+
+Batas error (Karnin, Lang & Liberty 2016): rank hasil quantile meleset paling
+banyak ~1.7/k * n dengan probabilitas tinggi; default k=200 -> sekitar 0.9%
+dari jumlah baris. Sel yang belum pernah dikompaksi (n <= k) eksak, dan
+quantile dari sketch eksak sama dengan Series.quantile (interpolasi linear).
+Nilai min & max selalu eksak.
+"""
+import numpy as np
+
+DEFAULT_K = 200
+MIN_CAPACITY = 8
+
+
+class QuantileSketch:
+    __slots__ = ('k', 'n', 'min', 'max', 'levels')
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.levels = [np.empty(0)]
+
+    @classmethod
+    def from_array(cls, values, k=DEFAULT_K):
+        sketch = cls(k)
+        sketch._add(np.asarray(values, dtype='float64'))
+        return sketch
+
+    def _add(self, values):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compact(self):
+        # Seed dari n: sketch untuk data yang sama selalu identik (aman untuk cache)
+        rng = np.random.default_rng(self.n)
+        while any(len(items) > self._capacity(h) for h, items in enumerate(self.levels)):
+            for h in range(len(self.levels)):
+                items = self.levels[h]
+                if len(items) <= self._capacity(h):
+                    continue
+                items = np.sort(items)
+                # Kalau jumlah item ganjil, satu item tetap di level ini supaya total bobot = n
+                odd = len(items) % 2
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                promoted = items[odd + rng.integers(2)::2]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.levels[h] = items[:odd]
+
+    def update(self, values):
+        """Tambahkan nilai baru (mis. baris hasil append) ke sketch."""
+        self._add(np.asarray(values, dtype='float64'))
+        return self
+
+    def merge(self, other, compact=True):
+        """
+        Sketch gabungan (sketch asli tidak diubah). compact=False hanya
+        menyambung level tanpa kompaksi: dipakai untuk query sekali pakai
+        sehingga sel eksak tetap eksak.
+        """
+        merged = QuantileSketch(max(self.k, other.k))
+        merged.n = self.n + other.n
+        merged.min = np.fmin(self.min, other.min)
+        merged.max = np.fmax(self.max, other.max)
+        depth = max(len(self.levels), len(other.levels))
+        merged.levels = [
+            np.concatenate([s.levels[h] for s in (self, other) if h < len(s.levels)]) for h in range(depth)
+        ]
+        if compact:
+            merged._compact()
+        return merged
+
+    __add__ = merge
+
+    def quantiles(self, qs):
+        """Quantile (interpolasi linear antar rank seperti Series.quantile) untuk tiap q."""
+        qs = np.asarray(qs, dtype='float64')
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_h), 2 ** h) for h, items_h in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+
+        ranks = qs * (self.n - 1)
+        lo, hi = np.floor(ranks), np.ceil(ranks)
+        lo_values = items[np.searchsorted(cumulative, lo, side='right')]
+        hi_values = items[np.searchsorted(cumulative, hi, side='right')]
+        values = lo_values + (ranks - lo) * (hi_values - lo_values)
+        # Ujung distribusi memakai min / max eksak
+        values[qs <= 0] = self.min
+        values[qs >= 1] = self.max
+        return values
+
+    def quantile(self, q):
+        return float(self.quantiles([q])[0])
+
+    def __len__(self):
+        """Jumlah item yang disimpan (ukuran sketch, bukan jumlah baris)."""
+        return sum(len(items) for items in self.levels)
+
+
+def merge_sketches(sketches, k=DEFAULT_K):
+    """Gabungan untuk query: level disambung tanpa kompaksi (biaya sebanding jumlah sel, bukan baris)."""
+    total = QuantileSketch(k)
+    for s in sketches:
+        total = total.merge(s, compact=False)
+    return total
+
+
+def sketches_by(df, by, column, k=DEFAULT_K):
+    """Dict {key grup: QuantileSketch kolom `column`} dengan key sama seperti stats.moments_by."""
+    keys = df[by].astype('int64')
+    values = df[column].to_numpy(dtype='float64')
+    sketches = {}
+    for key, rows in keys.groupby(by if len(by) > 1 else by[0], sort=False).indices.items():
+        sketches[key] = QuantileSketch.from_array(values[rows], k)
+    return sketches
@@ -0,0 +1,134 @@
+"""
+Engine statistik single-pass berbasis akumulator.
+
+Moments menyimpan n, mean, dan matriks co-moment (Σ (x - mean)(y - mean)^T)
+untuk sekumpulan kolom numerik. Akumulator bisa di-merge (rumus paralel
+Chan/Welford), sehingga korelasi, kovarians, std, dan regresi linear untuk
+kombinasi filter / chunk mana pun cukup dihitung dari gabungan akumulator,
+tanpa memindai ulang kolomnya.
+"""
+import numpy as np
+import pandas as pd
+
+
+def numeric_columns(df):
+    """Kolom numerik (bukan categorical / bool), pengganti select_dtypes(float64, int64)."""
+    return [
+        c for c in df.columns
+        if pd.api.types.is_numeric_dtype(df[c])
+        and not isinstance(df[c].dtype, pd.CategoricalDtype)
+        and not pd.api.types.is_bool_dtype(df[c])
+    ]
+
+
+class Moments:
+    __slots__ = ('columns', 'n', 'mean', 'comoment')
+
+    def __init__(self, columns, n, mean, comoment):
+        self.columns = list(columns)
+        self.n = int(n)
+        self.mean = mean
+        self.comoment = comoment
+
+    @classmethod
+    def empty(cls, columns):
+        k = len(columns)
+        return cls(columns, 0, np.zeros(k), np.zeros((k, k)))
+
+    @classmethod
+    def from_array(cls, values, columns):
+        values = np.asarray(values, dtype='float64')
+        if len(values) == 0:
+            return cls.empty(columns)
+        mean = values.mean(axis=0)
+        centered = values - mean
+        return cls(columns, len(values), mean, centered.T @ centered)
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        columns = numeric_columns(df) if columns is None else list(columns)
+        return cls.from_array(df[columns].to_numpy(dtype='float64'), columns)
+
+    def merge(self, other):
+        """Gabungkan dua akumulator (hasilnya sama dengan menghitung dari gabungan baris)."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        mean = self.mean + delta * (other.n / n)
+        comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.n * other.n / n)
+        return Moments(self.columns, n, mean, comoment)
+
+    __add__ = merge
+
+    def update(self, chunk):
+        """Merge chunk baru (DataFrame) ke akumulator."""
+        return self.merge(Moments.from_frame(chunk, self.columns))
+
+    def _pos(self, column):
+        return self.columns.index(column)
+
+    def cov(self, ddof=1):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = self.comoment / (self.n - ddof)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def corr(self):
+        """Matriks korelasi Pearson, setara DataFrame.corr()."""
+        diag = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / np.outer(diag, diag)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def corr_of(self, x, y):
+        i, j = self._pos(x), self._pos(y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.comoment[i, j] / np.sqrt(self.comoment[i, i] * self.comoment[j, j])
+
+    def std(self, column, ddof=1):
+        i = self._pos(column)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt(self.comoment[i, i] / (self.n - ddof))
+
+    def linear_fit(self, x, y):
+        """Slope & intercept regresi y ~ x (least squares, setara np.polyfit deg=1)."""
+        i, j = self._pos(x), self._pos(y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = self.comoment[i, j] / self.comoment[i, i]
+        return slope, self.mean[j] - slope * self.mean[i]
+
+
+def merge_all(moments, columns):
+    total = Moments.empty(columns)
+    for m in moments:
+        total = total.merge(m)
+    return total
+
+
+def grouped_moments(df, columns, codes, n_groups):
+    """
+    Moments per grup dalam satu pass: baris diurutkan sekali berdasarkan kode
+    grup lalu setiap slice kontigu dihitung dengan satu perkalian matriks.
+    Baris dengan kode < 0 diabaikan.
+    """
+    codes = np.asarray(codes, dtype='int64')
+    values = df[columns].to_numpy(dtype='float64')
+    valid = codes >= 0
+    values, codes = values[valid], codes[valid]
+
+    order = np.argsort(codes, kind='stable')
+    values = values[order]
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n_groups))])
+    return [Moments.from_array(values[bounds[g]:bounds[g + 1]], columns) for g in range(n_groups)]
+
+
+def moments_by(df, by, columns=None):
+    """Dict {key grup: Moments} untuk kolom-kolom `by` (key berupa tuple kalau > 1 kolom)."""
+    columns = numeric_columns(df) if columns is None else list(columns)
+    keys = df[by].astype('int64')
+    group_index = pd.MultiIndex.from_frame(keys) if len(by) > 1 else pd.Index(keys[by[0]])
+    uniques = group_index.unique()
+    groups = grouped_moments(df, columns, uniques.get_indexer(group_index), len(uniques))
+    return dict(zip(uniques, groups))
@@ -0,0 +1,24 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modul dashboard diimpor dengan nama pendek, sama seperti dashboard.py
+sys.path.insert(0, os.path.join(ROOT, 'dashboard'))
+
+
+@pytest.fixture(scope='session')
+def data_dir(tmp_path_factory):
+    """Salinan day.csv & hour.csv (store dibangun di sini, bukan di data/ repo)."""
+    target = tmp_path_factory.mktemp('data')
+    for name in ('day.csv', 'hour.csv'):
+        shutil.copy(os.path.join(ROOT, 'data', name), target / name)
+    return str(target)
+
+
+@pytest.fixture(scope='session')
+def dataset(data_dir):
+    from dataset import LiveDataset
+    return LiveDataset(data_dir)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from analysis import DEMAND_LEVELS, build_graph
+
+# Rentang satu hari tanpa hari Light Snow/Rain
+EMPTY_RANGE = {'season': (1, 2, 3, 4), 'weather': (3,), 'dates': ('2012-06-01', '2012-06-02')}
+
+
+@pytest.fixture(params=['pandas', 'duckdb'])
+def graph(request, monkeypatch):
+    if request.param == 'duckdb':
+        pytest.importorskip('duckdb')
+    monkeypatch.setenv('BIKE_QUERY_BACKEND', request.param)
+    return build_graph()
+
+
+def test_demand_levels_empty_date_range(graph, dataset):
+    inputs = {'dataset': dataset, **EMPTY_RANGE}
+    assert len(graph.compute('day_filtered', inputs)) == 0
+    q1, q2, levels = graph.compute('demand_levels', inputs)
+    assert np.isnan(q1) and np.isnan(q2)
+    assert list(levels.index) == DEMAND_LEVELS
+    assert levels['days'].sum() == 0
+
+
+def test_demand_levels_date_range(graph, dataset):
+    inputs = {'dataset': dataset, 'season': (1, 2, 3, 4), 'weather': (1, 2, 3), 'dates': ('2012-06-01', '2012-07-01')}
+    q1, q2, levels = graph.compute('demand_levels', inputs)
+    assert q1 <= q2
+    assert levels['days'].sum() == 30
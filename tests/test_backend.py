@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import DuckDBBackend, PandasBackend
+
+LABELS = ['Low Demand', 'Medium Demand', 'High Demand']
+AGGS = {'days': ('cnt', 'count'), 'temp_celsius': ('temp_celsius', 'mean')}
+
+
+@pytest.fixture(scope='module')
+def backends(dataset):
+    pytest.importorskip('duckdb')
+    return PandasBackend(dataset), DuckDBBackend(dataset)
+
+
+@pytest.mark.parametrize('where', [
+    {'season': [1, 2, 3, 4], 'weathersit': []},
+    {'season': [], 'weathersit': [1, 2, 3]},
+])
+def test_empty_selection_parity(backends, where):
+    pandas_backend, duckdb_backend = backends
+    q_pandas = pandas_backend.quantiles('day', 'cnt', [0.33, 0.67, 1.0], where)
+    q_duckdb = duckdb_backend.quantiles('day', 'cnt', [0.33, 0.67, 1.0], where)
+    assert np.isnan(q_pandas).all() and np.isnan(q_duckdb).all()
+
+    edges = [0, *q_duckdb]
+    bins_pandas = pandas_backend.aggregate_bins('day', 'cnt', edges, LABELS, AGGS, where)
+    bins_duckdb = duckdb_backend.aggregate_bins('day', 'cnt', edges, LABELS, AGGS, where)
+    assert bins_pandas.empty and bins_duckdb.empty
+    assert list(bins_pandas.columns) == list(bins_duckdb.columns) == list(AGGS)
+    assert list(bins_duckdb.index.categories) == LABELS
+
+    grouped = duckdb_backend.aggregate('day', ['temp_category'], {'cnt': ('cnt', 'mean')}, where)
+    assert grouped.empty
+
+
+def test_bins_parity(backends):
+    pandas_backend, duckdb_backend = backends
+    where = {'season': [2, 3], 'weathersit': [1]}
+    edges = [0, *pandas_backend.quantiles('day', 'cnt', [0.33, 0.67, 1.0], where)]
+    bins_pandas = pandas_backend.aggregate_bins('day', 'cnt', edges, LABELS, AGGS, where)
+    bins_duckdb = duckdb_backend.aggregate_bins('day', 'cnt', edges, LABELS, AGGS, where)
+    assert list(bins_pandas.index) == list(bins_duckdb.index) == LABELS
+    assert bins_pandas['days'].tolist() == bins_duckdb['days'].tolist()
+    pd.testing.assert_series_equal(bins_pandas['temp_celsius'], bins_duckdb['temp_celsius'],
+                                   check_index_type=False, check_dtype=False)
@@ -0,0 +1,36 @@
+import importlib.util
+import json
+import os
+
+from conftest import ROOT
+
+
+def load_bench():
+    spec = importlib.util.spec_from_file_location('bench_dashboard', os.path.join(ROOT, 'benchmarks', 'bench_dashboard.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(pipeline):
+    return {'1x': {'pipeline': pipeline, 'pages': {}}}
+
+
+def test_compare_reports_stages_missing_from_baseline():
+    bench = load_bench()
+    baseline = {'results': run({'load': {'wall_s': 0.1}})}
+    results = run({'load': {'wall_s': 0.5}, 'rolling_window': {'wall_s': 0.2, 'peak_mb': 1.0}})
+    results['10x'] = run({'load': {'wall_s': 1.0}})['1x']
+
+    regressions, missing = bench.compare(results, baseline, tolerance=0.25)
+    assert regressions == ['1x/pipeline/load/wall_s']
+    # Scale 10x tidak ada di baseline sama sekali, jadi tidak dilaporkan hilang
+    assert missing == ['1x/pipeline/rolling_window/wall_s']
+
+
+def test_baseline_covers_all_pipeline_stages():
+    bench = load_bench()
+    with open(bench.BASELINE_PATH) as f:
+        baseline = json.load(f)
+    stages = set(baseline['results']['1x']['pipeline'])
+    assert {'date_range', 'pyramid_build', 'pyramid_trend', 'rolling_window', 'sketch_quantiles'} <= stages
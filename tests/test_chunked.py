@@ -0,0 +1,49 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import chunked
+from conftest import ROOT
+from cube import build_cube, rollup
+from dataset import CUBE_DIMS
+from datastore import ingest_table, manifest_path, read_manifest, read_store, store_dir, store_path
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    shutil.copy(os.path.join(ROOT, 'data', 'day.csv'), tmp_path / 'day.csv')
+    return str(tmp_path)
+
+
+def test_stream_table_matches_ingest(csv_dir):
+    result = chunked.stream_table(csv_dir, 'day', chunksize=100)
+    streamed, manifest = read_store(store_path(csv_dir, 'day')), read_manifest(csv_dir, 'day')
+    # Tidak ada file sementara yang tertinggal
+    assert sorted(os.listdir(store_dir(csv_dir))) == sorted(
+        os.path.basename(p) for p in (store_path(csv_dir, 'day'), manifest_path(csv_dir, 'day'))
+    )
+
+    df, ingested = ingest_table(csv_dir, 'day')
+    assert manifest == ingested
+    pd.testing.assert_frame_equal(streamed, df)
+    assert result['rows'] == len(df)
+    pd.testing.assert_frame_equal(rollup(result['cube'], by='season', stats=('sum', 'count')),
+                                  rollup(build_cube(df, CUBE_DIMS['day']), by='season', stats=('sum', 'count')))
+    assert sum(m.n for m in result['moments'].values()) == len(df)
+
+
+def test_stream_table_removes_temp_files_on_failure(csv_dir, monkeypatch):
+    clean_chunks = chunked._clean_chunks
+
+    def failing_chunks(csv_path, chunksize):
+        chunks = clean_chunks(csv_path, chunksize)
+        yield next(chunks)
+        raise ValueError('CSV rusak')
+
+    monkeypatch.setattr(chunked, '_clean_chunks', failing_chunks)
+    with pytest.raises(ValueError):
+        chunked.stream_table(csv_dir, 'day', chunksize=100)
+    assert os.listdir(store_dir(csv_dir)) == []
+    assert read_manifest(csv_dir, 'day') is None
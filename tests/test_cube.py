@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import DAY_DIMS, HOUR_DIMS, build_cube, filter_cube, merge_cubes, rollup
+
+
+@pytest.fixture(scope='module')
+def hour_frame(dataset):
+    return dataset.tables['hour'].frame
+
+
+def sorted_values(frame):
+    return frame.sort_index().to_numpy(dtype='float64')
+
+
+@pytest.mark.parametrize('by', [['hr'], ['season', 'weathersit'], ['mnth', 'yr']])
+def test_rollup_matches_groupby(hour_frame, by):
+    result = rollup(build_cube(hour_frame, HOUR_DIMS), by=by, stats=('count', 'sum', 'mean', 'std', 'max'))
+    grouped = hour_frame.assign(cnt=hour_frame['cnt'].astype('float64')).groupby(by, observed=True)['cnt']
+    expected = grouped.agg(['count', 'sum', 'mean', 'std', 'max'])
+    np.testing.assert_allclose(sorted_values(result), sorted_values(expected))
+
+
+def test_grand_total_and_filter(hour_frame):
+    cube = filter_cube(build_cube(hour_frame, HOUR_DIMS), seasons=[2, 3], weathers=[1])
+    total = rollup(cube, measures=('cnt', 'temp'), stats=('sum', 'mean')).iloc[0]
+    selected = hour_frame[hour_frame['season'].isin([2, 3]) & (hour_frame['weathersit'] == 1)]
+    assert total['cnt_sum'] == selected['cnt'].sum()
+    assert total['temp_mean'] == pytest.approx(selected['temp'].astype('float64').mean())
+
+
+def test_merge_cubes_matches_full_rebuild(hour_frame):
+    split = len(hour_frame) - 2_000
+    merged = merge_cubes(build_cube(hour_frame.iloc[:split], HOUR_DIMS),
+                         build_cube(hour_frame.iloc[split:], HOUR_DIMS), HOUR_DIMS)
+    full = build_cube(hour_frame, HOUR_DIMS)
+    assert len(merged) == len(full)
+    pd.testing.assert_frame_equal(merged.sort_values(HOUR_DIMS).reset_index(drop=True),
+                                  full.sort_values(HOUR_DIMS).reset_index(drop=True), check_dtype=False)
+
+
+def test_day_type_rollup(dataset):
+    day = dataset.tables['day'].frame
+    result = rollup(build_cube(day, DAY_DIMS), by='day_type', stats=('count',))
+    weekend = day['weekday'].isin([0, 6])
+    assert result.loc['Weekend', 'count'] == weekend.sum()
+    assert result.loc['Weekday', 'count'] == (~weekend).sum()
@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from dataset import LiveDataset
+from datastore import store_dir
+
+
+@pytest.fixture
+def live(tmp_path):
+    for name in ('day.csv', 'hour.csv'):
+        shutil.copy(os.path.join(ROOT, 'data', name), tmp_path / name)
+    return LiveDataset(str(tmp_path))
+
+
+def new_day_rows(data_dir, count):
+    last = pd.read_csv(os.path.join(data_dir, 'day.csv')).iloc[[-1] * count]
+    dates = pd.date_range('2013-01-01', periods=count, freq='D')
+    return last.assign(instant=np.arange(732, 732 + count), dteday=dates.strftime('%Y-%m-%d'), yr=2,
+                       mnth=dates.month, season=1)
+
+
+def test_append_keeps_old_segment_without_copy(live):
+    base = live.tables['day'].segments.frames[0]
+    live.append('day', new_day_rows(live.data_dir, 3))
+    state = live.tables['day']
+    assert state.segments.frames[0] is base
+    assert len(state.segments) == len(base) + 3
+    assert len(state.index.parts) == len(state.time_index.parts) == 2
+
+
+def test_append_matches_full_rebuild(live):
+    live.append('day', new_day_rows(live.data_dir, 3))
+    live.append('day', new_day_rows(live.data_dir, 2).assign(instant=[735, 736], dteday=['2013-01-04', '2013-01-05']))
+    state = live.tables['day']
+    # Rebuild penuh: store dibuang, CSV (sudah berisi baris append) di-ingest ulang jadi satu segment
+    shutil.rmtree(store_dir(live.data_dir))
+    rebuilt = LiveDataset(live.data_dir).tables['day']
+    assert len(rebuilt.segments.frames) == 1
+
+    mask = state.time_index.restrict(state.index.select(season=[1], weathersit=[1, 2]), '2012-12-01', '2013-01-05')
+    assert mask.sum() > 0
+    np.testing.assert_array_equal(mask, rebuilt.time_index.restrict(
+        rebuilt.index.select(season=[1], weathersit=[1, 2]), '2012-12-01', '2013-01-05'
+    ))
+    pd.testing.assert_frame_equal(state.take(mask), rebuilt.take(mask))
+    pd.testing.assert_frame_equal(state.frame, rebuilt.frame)
+    assert state.time_index.end == rebuilt.time_index.end == pd.Timestamp('2013-01-05')
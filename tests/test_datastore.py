@@ -0,0 +1,101 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from datastore import CSV_DTYPES, RowDeduper, clean_frame, ingest_table, read_manifest
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    shutil.copy(os.path.join(ROOT, 'data', 'day.csv'), tmp_path / 'day.csv')
+    return str(tmp_path)
+
+
+def expected_frame(csv_dir):
+    return clean_frame(pd.read_csv(os.path.join(csv_dir, 'day.csv'), dtype=CSV_DTYPES))
+
+
+def test_chunked_ingest_matches_full_read(csv_dir):
+    # Baris duplikat yang jatuh di chunk berbeda tetap dibuang sekali saja
+    raw = pd.read_csv(os.path.join(csv_dir, 'day.csv'))
+    pd.concat([raw, raw.iloc[[3, 500]]]).to_csv(os.path.join(csv_dir, 'day.csv'), index=False)
+
+    df, manifest = ingest_table(csv_dir, 'day', chunksize=100)
+    pd.testing.assert_frame_equal(df, expected_frame(csv_dir))
+    assert len(df) == 731
+    assert read_manifest(csv_dir, 'day') == manifest
+
+
+def test_row_deduper_matches_drop_duplicates():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'a': rng.integers(0, 20, 1000), 'b': rng.integers(0, 5, 1000)})
+    deduper = RowDeduper()
+    kept = pd.concat([deduper.filter(frame.iloc[i:i + 64]) for i in range(0, len(frame), 64)])
+    pd.testing.assert_frame_equal(kept, frame.drop_duplicates())
+    assert len(deduper.seen) == len(kept)
+    assert np.all(deduper.seen[1:] > deduper.seen[:-1])
+
+
+def test_ingest_header_only_csv(csv_dir):
+    pd.read_csv(os.path.join(csv_dir, 'day.csv')).iloc[:0].to_csv(os.path.join(csv_dir, 'day.csv'), index=False)
+    df, _ = ingest_table(csv_dir, 'day')
+    assert len(df) == 0
+    assert list(df.columns) == list(expected_frame(csv_dir).columns)
+
+
+def test_ingest_read_only_store_keeps_frame_in_memory(csv_dir):
+    # Folder store berupa file: penulisan gagal seperti di filesystem read-only
+    open(os.path.join(csv_dir, 'store'), 'w').close()
+    df, _ = ingest_table(csv_dir, 'day', chunksize=100)
+    pd.testing.assert_frame_equal(df, expected_frame(csv_dir))
+
+
+def test_multi_batch_store_reads_zero_copy(csv_dir, monkeypatch):
+    import pyarrow as pa
+
+    import datastore
+
+    ingest_table(csv_dir, 'day', chunksize=100)
+    # Catat rentang alamat tiap mapping yang dibuka read_store
+    mappings = []
+    memory_map = pa.memory_map
+
+    def tracking_memory_map(path, mode='r'):
+        source = memory_map(path, mode)
+        whole = source.read_buffer()
+        source.seek(0)
+        mappings.append((whole.address, whole.address + whole.size, whole))
+        return source
+
+    monkeypatch.setattr(pa, 'memory_map', tracking_memory_map)
+    df = datastore.read_store(datastore.store_path(csv_dir, 'day'))
+    (start, stop, _), = mappings
+    for column in ('cnt', 'temp', 'instant'):
+        address = df[column].to_numpy().__array_interface__['data'][0]
+        assert start <= address < stop, column
+
+
+def new_day_row(csv_dir, **changes):
+    last = pd.read_csv(os.path.join(csv_dir, 'day.csv')).iloc[[-1]]
+    return last.assign(**{'instant': 732, 'dteday': '2013-01-01', 'yr': 2, 'mnth': 1, 'season': 1, **changes})
+
+
+def test_append_rows_accepts_years_after_2012(csv_dir):
+    from datastore import append_rows
+
+    added = append_rows(csv_dir, 'day', new_day_row(csv_dir))
+    assert len(added) == 1
+    assert added['yr'].iloc[0] == 2
+
+
+@pytest.mark.parametrize('changes', [{'yr': 1}, {'mnth': 2}])
+def test_validate_rows_rejects_yr_mnth_that_contradict_dteday(csv_dir, changes):
+    from datastore import validate_rows
+
+    rows = new_day_row(csv_dir, **changes)
+    with pytest.raises(ValueError):
+        validate_rows(rows, 'day', list(rows.columns))
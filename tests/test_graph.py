@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from graph import Graph, value_nbytes
+
+
+def make_graph(max_bytes):
+    graph = Graph(max_bytes=max_bytes)
+    graph.source('frame')
+    graph.source('threshold')
+
+    @graph.node('filtered', inputs=['frame', 'threshold'])
+    def filtered(frame, threshold):
+        # Salinan seperti take(): tiap threshold menyimpan frame sendiri
+        return frame[frame['x'] >= threshold].copy()
+
+    return graph
+
+
+def test_memo_evicts_under_byte_budget():
+    frame = pd.DataFrame({'x': np.arange(10_000, dtype='float64'), 'y': np.ones(10_000)})
+    one_copy = value_nbytes(frame)
+    graph = make_graph(max_bytes=int(2.5 * one_copy))
+
+    for threshold in range(-5, 0):
+        graph.compute('filtered', {'frame': frame, 'threshold': threshold})
+    # Hanya dua salinan penuh yang muat di budget; entry terlama dibuang
+    assert len(graph._memo) == 2
+    assert graph.total_bytes <= graph.max_bytes
+
+    # Threshold terbaru masih hit, yang pertama sudah di-evict dan dihitung ulang
+    graph.compute('filtered', {'frame': frame, 'threshold': -1})
+    assert graph.stats['filtered'] == {'hits': 1, 'misses': 5, 'seconds': graph.stats['filtered']['seconds']}
+    graph.compute('filtered', {'frame': frame, 'threshold': -5})
+    assert graph.stats['filtered']['misses'] == 6
+
+
+def test_oversized_value_keeps_single_entry():
+    frame = pd.DataFrame({'x': np.arange(1_000, dtype='float64')})
+    graph = make_graph(max_bytes=10)
+    graph.compute('filtered', {'frame': frame, 'threshold': 0})
+    graph.compute('filtered', {'frame': frame, 'threshold': 1})
+    assert len(graph._memo) == 1
+    graph.clear()
+    assert graph.total_bytes == 0
+
+
+def test_unmemoized_node_is_shared_within_compute_only():
+    graph = Graph()
+    graph.source('frame')
+    calls = []
+
+    @graph.node('filtered', inputs=['frame'], memo=False)
+    def filtered(frame):
+        calls.append(1)
+        return frame[frame['x'] > 0]
+
+    @graph.node('total', inputs=['filtered'])
+    def total(filtered):
+        return float(filtered['x'].sum())
+
+    @graph.node('count', inputs=['filtered'])
+    def count(filtered):
+        return len(filtered)
+
+    frame = pd.DataFrame({'x': np.arange(-3.0, 4.0)})
+    assert graph.compute(['total', 'count'], {'frame': frame}) == [6.0, 3]
+    assert len(calls) == 1
+    # Hanya agregat yang masuk memo; node hilir yang hit tidak menghitung ulang frame hasil filter
+    assert len(graph._memo) == 2
+    graph.compute(['total', 'count'], {'frame': frame})
+    assert len(calls) == 1
+    graph.compute('filtered', {'frame': frame})
+    assert len(calls) == 2
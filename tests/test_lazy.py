@@ -0,0 +1,11 @@
+from lazy import startup_modules
+
+
+def test_startup_modules_follow_dashboard_imports():
+    modules = startup_modules()
+    for name in ('backend', 'persist', 'pyramid', 'rolling', 'sketch', 'analysis', 'graph'):
+        assert name in modules
+    # Dependency lebih dulu dari modul yang meng-import-nya
+    assert modules.index('selection') < modules.index('dataset') < modules.index('analysis')
+    # Plotting tetap lazy
+    assert 'charts' not in modules and 'matplotlib.pyplot' not in modules
@@ -0,0 +1,11 @@
+import subprocess
+import sys
+
+from conftest import ROOT
+
+
+def test_altair_charts_does_not_import_matplotlib():
+    # Proses baru: modul lain di sesi pytest mungkin sudah memuat matplotlib
+    code = 'import sys, altair_charts; sys.exit("matplotlib" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], cwd=f'{ROOT}/dashboard')
+    assert result.returncode == 0
@@ -0,0 +1,33 @@
+from persist import PersistentCache, open_cache
+
+
+def test_open_cache_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setenv('BIKE_CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+    cache = open_cache(str(tmp_path))
+    assert isinstance(cache, PersistentCache)
+    assert cache.memoize('x', 'v1', {}, lambda: [1, 2, 3]) == [1, 2, 3]
+    assert cache.memoize('x', 'v1', {}, lambda: None) == [1, 2, 3]
+
+
+def test_open_cache_unwritable_path_falls_back(tmp_path, monkeypatch):
+    # Induk path berupa file biasa: makedirs / sqlite gagal seperti di filesystem read-only
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('')
+    monkeypatch.setenv('BIKE_CACHE_PATH', str(blocker / 'store' / 'cache.sqlite'))
+    assert open_cache(str(tmp_path)) is None
+
+
+def test_open_cache_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv('BIKE_CACHE', '0')
+    assert open_cache(str(tmp_path)) is None
+
+
+def test_dataset_without_persistent_cache(dataset):
+    from analysis import build_graph
+
+    # Fallback in-memory: tanpa PersistentCache graph tetap menghitung dari dataset
+    graph = build_graph(None)
+    inputs = {'dataset': dataset, 'season': (1, 2, 3, 4), 'weather': (1, 2, 3, 4), 'dates': None}
+    first = graph.compute('avg_by_temp', inputs)
+    assert graph.compute('avg_by_temp', inputs) is first
+    assert graph.stats['avg_by_temp']['hits'] == 1
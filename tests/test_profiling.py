@@ -0,0 +1,27 @@
+import json
+import logging
+
+from profiling import RunProfile, StageStats, logger
+
+
+def test_enabled_profile_logs_rerun_to_stderr(capsys, monkeypatch):
+    # Handler baru dibuat di dalam test supaya menulis ke stderr yang ditangkap capsys
+    monkeypatch.setattr(logger, 'handlers', [])
+    monkeypatch.setattr(logger, 'level', logging.NOTSET)
+    monkeypatch.setattr(logger, 'propagate', True)
+
+    profile = RunProfile(enabled=True, context={'page': 'overview'})
+    with profile.stage('load'):
+        pass
+    profile.finish(StageStats())
+
+    line = capsys.readouterr().err.strip().splitlines()[-1]
+    record = json.loads(line[line.index('{'):])
+    assert record['event'] == 'rerun' and record['page'] == 'overview'
+    assert list(record['stages']) == ['load']
+
+
+def test_disabled_profile_does_not_configure_logger(monkeypatch):
+    monkeypatch.setattr(logger, 'handlers', [])
+    RunProfile(enabled=False)
+    assert logger.handlers == []
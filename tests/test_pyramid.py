@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyramid import LEVELS, RollupPyramid
+
+SEASONS = (2, 3)
+# Awal periode tiap level dari timestamp (minggu mulai Senin)
+PERIOD_START = {
+    'hour': lambda ts: ts,
+    'day': lambda ts: ts.dt.normalize(),
+    'week': lambda ts: ts.dt.normalize() - pd.to_timedelta(ts.dt.dayofweek, unit='D'),
+    'month': lambda ts: ts.dt.to_period('M').dt.start_time,
+    'year': lambda ts: ts.dt.to_period('Y').dt.start_time,
+}
+
+
+@pytest.fixture(scope='module')
+def hour_frame(dataset):
+    return dataset.tables['hour'].frame
+
+
+def timestamps(df):
+    return df['dteday'] + pd.to_timedelta(df['hr'].astype('int64'), unit='h')
+
+
+def expected_series(df, level, seasons):
+    df = df[df['season'].isin(seasons)]
+    return df.groupby(PERIOD_START[level](timestamps(df)).rename('period'))['cnt'].sum()
+
+
+@pytest.mark.parametrize('level', list(LEVELS))
+def test_series_matches_groupby(hour_frame, level):
+    pyramid = RollupPyramid.from_frame(hour_frame)
+    series = pyramid.series(level, SEASONS)['cnt']
+    expected = expected_series(hour_frame, level, SEASONS)
+    np.testing.assert_array_equal(series.index.to_numpy(), expected.index.to_numpy().astype('datetime64[ns]'))
+    np.testing.assert_allclose(series.to_numpy(), expected.to_numpy())
+
+
+def test_partial_edge_periods_are_exact(hour_frame):
+    pyramid = RollupPyramid.from_frame(hour_frame)
+    start, stop = pd.Timestamp('2011-03-15 06:00'), pd.Timestamp('2012-02-10 18:00')
+    ts = timestamps(hour_frame)
+    in_range = hour_frame[(ts >= start) & (ts < stop) & hour_frame['season'].isin(SEASONS)]
+    for level in ('day', 'week', 'month', 'year'):
+        assert pyramid.series(level, SEASONS, start, stop)['cnt'].sum() == in_range['cnt'].sum()
+
+
+def test_extended_matches_full_rebuild(hour_frame):
+    split = len(hour_frame) - 1_000
+    full = RollupPyramid.from_frame(hour_frame)
+    appended = RollupPyramid.from_frame(hour_frame.iloc[:split]).extended(hour_frame.iloc[split:])
+    for level, (starts, sums) in full.levels.items():
+        np.testing.assert_array_equal(appended.levels[level][0], starts)
+        np.testing.assert_allclose(appended.levels[level][1], sums)
+
+
+def test_choose_level_fits_point_budget(hour_frame):
+    pyramid = RollupPyramid.from_frame(hour_frame)
+    assert pyramid.choose_level('2012-06-01', '2012-06-08') == 'hour'
+    assert pyramid.choose_level('2012-01-01', '2012-07-01') == 'day'
+    assert pyramid.choose_level() == 'week'
+    assert pyramid.choose_level(max_points=1) == 'year'
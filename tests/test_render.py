@@ -0,0 +1,32 @@
+import importlib.machinery
+import math
+import sys
+import types
+
+from render import RenderPool
+
+
+def streamlit_main(script, spec):
+    """Modul __main__ seperti buatan ScriptRunner Streamlit untuk script dashboard."""
+    module = types.ModuleType('__main__')
+    module.__file__ = str(script)
+    module.__spec__ = spec
+    return module
+
+
+def test_workers_start_without_rerunning_script(tmp_path, monkeypatch):
+    marker = tmp_path / 'ran'
+    script = tmp_path / 'script.py'
+    script.write_text(f'open({str(marker)!r}, "w").close()\n')
+    main = streamlit_main(script, importlib.machinery.ModuleSpec('__main__', None))
+    monkeypatch.setitem(sys.modules, '__main__', main)
+
+    pool = RenderPool(2)
+    try:
+        futures = [pool.submit(math.factorial, n) for n in range(5)]
+        # __main__ global tidak diganti selama submit (sesi lain bisa sedang rerun)
+        assert sys.modules['__main__'] is main
+        assert [future.result(timeout=60) for future in futures] == [1, 1, 2, 6, 24]
+    finally:
+        pool.shutdown()
+    assert not marker.exists()
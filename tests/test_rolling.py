@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling import PrefixSums
+
+
+@pytest.fixture(scope='module')
+def day_frame(dataset):
+    return dataset.tables['day'].frame
+
+
+def expected_mean(df, width, selected=None):
+    cnt = df.set_index('dteday')['cnt'].astype('float64')
+    if selected is not None:
+        cnt = cnt.where(selected.to_numpy())
+    # Rata-rata per baris terpilih dalam jendela; jendela di awal data lebih pendek
+    return cnt.rolling(width, min_periods=1).mean()
+
+
+@pytest.mark.parametrize('width', [1, 7, 28])
+def test_mean_matches_pandas_rolling(day_frame, width):
+    prefix = PrefixSums.from_frame(day_frame, 'day')
+    ends = np.arange(len(prefix))
+    np.testing.assert_allclose(prefix.mean(ends, width).to_numpy(), expected_mean(day_frame, width).to_numpy())
+
+
+def test_mean_with_filter_counts_only_selected_rows(day_frame):
+    selected = day_frame['season'].isin([2, 3])
+    prefix = PrefixSums.from_frame(day_frame[selected], 'day')
+    expected = expected_mean(day_frame, 28, selected)
+    # Grid prefix mulai dari hari terpilih pertama
+    first = int(np.argmax(selected.to_numpy()))
+    np.testing.assert_allclose(prefix.mean(np.arange(len(prefix)), 28).to_numpy(),
+                               expected.to_numpy()[first:first + len(prefix)])
+
+
+def test_share_matches_window_sums(day_frame):
+    prefix = PrefixSums.from_frame(day_frame, 'day')
+    casual = day_frame['casual'].astype('float64').rolling(7, min_periods=1).sum()
+    cnt = day_frame['cnt'].astype('float64').rolling(7, min_periods=1).sum()
+    np.testing.assert_allclose(prefix.share(np.arange(len(prefix)), 7).to_numpy(), (casual / cnt).to_numpy())
+
+
+@pytest.mark.parametrize('split', ['tail', 'overlap', 'before'])
+def test_extended_matches_full_rebuild(day_frame, split):
+    if split == 'tail':
+        base, delta = day_frame.iloc[:-30], day_frame.iloc[-30:]
+    elif split == 'overlap':
+        # Delta berisi periode yang sudah ada di prefix lama dan periode baru
+        base, delta = day_frame.iloc[::2], day_frame.iloc[1::2]
+    else:
+        base, delta = day_frame.iloc[100:], day_frame.iloc[:100]
+    full = PrefixSums.from_frame(day_frame, 'day')
+    appended = PrefixSums.from_frame(base, 'day').extended(delta)
+    assert appended.first == full.first
+    np.testing.assert_allclose(appended.cumulative, full.cumulative)
+
+
+def test_ends_keep_last_period_and_point_budget(day_frame):
+    prefix = PrefixSums.from_frame(day_frame, 'day')
+    lo, hi = prefix.bounds('2012-01-01', '2012-07-01')
+    assert prefix.periods([lo, hi - 1]).tolist() == [pd.Timestamp('2012-01-01'), pd.Timestamp('2012-06-30')]
+    ends = prefix.ends('2012-01-01', '2012-07-01', max_points=20)
+    assert len(ends) <= 20 and ends[-1] == hi - 1
+    assert len(prefix.ends('2013-01-01', '2013-02-01')) == 0
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from selection import BitmapIndex, Segments, TimeIndex, take
+
+
+def make_frame(days, start='2011-01-01'):
+    dates = pd.date_range(start, periods=days, freq='D')
+    return pd.DataFrame({
+        'dteday': dates,
+        'season': (np.arange(days) // 30) % 4 + 1,
+        'cnt': np.arange(days, dtype='int64'),
+    })
+
+
+def test_bitmap_select_matches_isin(dataset):
+    hour = dataset.tables['hour'].frame
+    index = BitmapIndex(hour, ['season', 'weathersit', 'hr'])
+    mask = index.select(season=[1, 3], weathersit=[1, 2], hr=None)
+    expected = hour['season'].isin([1, 3]) & hour['weathersit'].isin([1, 2])
+    np.testing.assert_array_equal(mask, expected.to_numpy())
+    np.testing.assert_array_equal(index.row_ids(hr=[8, 17]), np.flatnonzero(hour['hr'].isin([8, 17])))
+    # Nilai yang tidak pernah muncul: tidak ada baris terpilih
+    assert not index.select(season=[9]).any()
+
+
+def test_extended_indexes_match_full_rebuild(dataset):
+    hour = dataset.tables['hour'].frame
+    split = len(hour) - 500
+    # Delta sengaja tidak urut waktu supaya segment-nya memakai permutasi
+    base, delta = hour.iloc[:split], hour.iloc[split:].iloc[::-1]
+    whole = pd.concat([base, delta], ignore_index=True)
+
+    bitmap = BitmapIndex(base, ['season', 'hr']).extended(delta)
+    np.testing.assert_array_equal(bitmap.select(season=[4], hr=[0, 23]),
+                                  BitmapIndex(whole, ['season', 'hr']).select(season=[4], hr=[0, 23]))
+
+    time_index = TimeIndex(base).extended(delta)
+    ts = whole['dteday'] + pd.to_timedelta(whole['hr'].astype('int64'), unit='h')
+    start, stop = pd.Timestamp('2012-12-20 05:00'), pd.Timestamp('2012-12-30')
+    np.testing.assert_array_equal(time_index.row_ids(start, stop), np.flatnonzero((ts >= start) & (ts < stop)))
+    assert (time_index.start, time_index.end) == (ts.min(), ts.max())
+
+
+def shares_memory(result, df, column='cnt'):
+    return np.shares_memory(result[column].to_numpy(), df[column].to_numpy())
+
+
+def test_take_contiguous_range_is_view():
+    df = make_frame(100)
+    mask = TimeIndex(df).restrict(np.ones(len(df), dtype=bool), '2011-01-11', '2011-01-21')
+    result = take(df, mask)
+    pd.testing.assert_frame_equal(result, df[mask])
+    assert shares_memory(result, df)
+    assert take(df, np.ones(len(df), dtype=bool)) is df
+
+
+def test_take_scattered_rows_copies_selection():
+    df = make_frame(100)
+    mask = (df['season'] == 2).to_numpy() | (df['season'] == 4).to_numpy()
+    result = take(df, mask)
+    pd.testing.assert_frame_equal(result, df[mask])
+    assert not shares_memory(result, df)
+
+
+def test_segments_take_matches_whole_frame():
+    base, delta = make_frame(100), make_frame(20, start='2011-04-11')
+    segments = Segments([base, delta], source_hash='abc')
+    whole = pd.concat([base, delta], ignore_index=True)
+
+    # Rentang di dalam segment delta saja: slice dari segment itu, index tetap posisi di frame utuh
+    in_delta = np.zeros(len(whole), dtype=bool)
+    in_delta[105:110] = True
+    result = segments.take(in_delta)
+    pd.testing.assert_frame_equal(result, whole[in_delta])
+    assert shares_memory(result, delta)
+    assert result.attrs['source_hash'] == 'abc'
+
+    across = (whole['season'] == 2).to_numpy()
+    pd.testing.assert_frame_equal(segments.take(across), whole[across])
+    # Tag versi data dipasang di salinan dangkal, frame segment bersama tidak diubah
+    assert 'source_hash' not in base.attrs
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sketch import DEFAULT_K, QuantileSketch, merge_sketches, sketches_by
+
+QS = [0.0, 0.1, 0.33, 0.5, 0.67, 0.9, 1.0]
+
+
+def rank_error(values, estimates, qs):
+    """Selisih rank (relatif terhadap n) antara estimasi dan quantile eksak."""
+    ordered = np.sort(values)
+    ranks = np.searchsorted(ordered, estimates, side='left') / len(values)
+    return np.abs(ranks - np.asarray(qs))
+
+
+def test_small_sketch_is_exact():
+    values = np.random.default_rng(1).normal(size=DEFAULT_K)
+    sketch = QuantileSketch.from_array(values)
+    np.testing.assert_allclose(sketch.quantiles(QS), pd.Series(values).quantile(QS).to_numpy())
+
+
+def test_large_sketch_rank_error_within_bound():
+    values = np.random.default_rng(2).lognormal(size=50_000)
+    sketch = QuantileSketch.from_array(values)
+    assert len(sketch) < 5_000
+    assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+    # Batas KLL ~1.7/k dengan probabilitas tinggi (seed tetap, jadi hasil deterministik)
+    assert rank_error(values, sketch.quantiles(QS[1:-1]), QS[1:-1]).max() <= 1.7 / DEFAULT_K
+
+
+def test_merged_cells_match_pandas_quantiles():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({'season': rng.integers(1, 5, 20_000), 'cnt': rng.gamma(2.0, 500.0, 20_000)})
+    cells = sketches_by(df, ['season'], 'cnt')
+    assert sum(s.n for s in cells.values()) == len(df)
+
+    selected = df[df['season'].isin([1, 3])]
+    merged = merge_sketches([cells[1], cells[3]])
+    assert merged.n == len(selected)
+    assert rank_error(selected['cnt'].to_numpy(), merged.quantiles([0.33, 0.67]), [0.33, 0.67]).max() <= 1.7 / DEFAULT_K
+
+
+def test_update_after_append_matches_rebuild_bound():
+    rng = np.random.default_rng(4)
+    base, delta = rng.normal(size=10_000), rng.normal(1.0, size=2_000)
+    appended = QuantileSketch.from_array(base).update(delta)
+    merged = QuantileSketch.from_array(base).merge(QuantileSketch.from_array(delta))
+    combined = np.concatenate([base, delta])
+    for sketch in (appended, merged):
+        assert sketch.n == len(combined)
+        assert rank_error(combined, sketch.quantiles([0.25, 0.5, 0.75]), [0.25, 0.5, 0.75]).max() <= 1.7 / DEFAULT_K
+
+
+def test_empty_sketch_and_nan_values():
+    assert np.isnan(QuantileSketch().quantiles([0.5])).all()
+    sketch = QuantileSketch.from_array([1.0, np.nan, 3.0])
+    assert sketch.n == 2
+    assert sketch.quantile(0.5) == pytest.approx(2.0)
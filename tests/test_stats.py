@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stats import Moments, grouped_moments, merge_all, moments_by, numeric_columns
+
+COLUMNS = ['temp', 'hum', 'cnt']
+
+
+@pytest.fixture(scope='module')
+def day_frame(dataset):
+    return dataset.tables['day'].frame
+
+
+def assert_matches_frame(moments, df):
+    values = df[COLUMNS].astype('float64')
+    assert moments.n == len(df)
+    np.testing.assert_allclose(moments.mean, values.mean().to_numpy())
+    np.testing.assert_allclose(moments.cov().to_numpy(), values.cov().to_numpy())
+    np.testing.assert_allclose(moments.corr().to_numpy(), values.corr().to_numpy())
+
+
+def test_chan_merge_matches_single_pass(day_frame):
+    # Potongan dengan ukuran & rata-rata berbeda, termasuk potongan kosong
+    pieces = [day_frame.iloc[:3], day_frame.iloc[3:3], day_frame.iloc[3:400], day_frame.iloc[400:]]
+    merged = merge_all([Moments.from_frame(p, COLUMNS) for p in pieces], COLUMNS)
+    assert_matches_frame(merged, day_frame)
+    assert_matches_frame(Moments.from_frame(day_frame.iloc[:400], COLUMNS).update(day_frame.iloc[400:]), day_frame)
+
+
+def test_moments_by_cells_merge_to_filtered_rows(day_frame):
+    cells = moments_by(day_frame, ['season', 'weathersit'], COLUMNS)
+    selected = day_frame[day_frame['season'].isin([1, 4]) & day_frame['weathersit'].isin([1, 2])]
+    merged = merge_all([m for (s, w), m in cells.items() if s in (1, 4) and w in (1, 2)], COLUMNS)
+    assert_matches_frame(merged, selected)
+
+
+def test_linear_fit_and_std_match_numpy(day_frame):
+    moments = Moments.from_frame(day_frame, COLUMNS)
+    slope, intercept = moments.linear_fit('temp', 'cnt')
+    np.testing.assert_allclose([slope, intercept], np.polyfit(day_frame['temp'], day_frame['cnt'], 1))
+    assert moments.corr_of('temp', 'cnt') == pytest.approx(day_frame['temp'].corr(day_frame['cnt']))
+    assert moments.std('cnt') == pytest.approx(day_frame['cnt'].std())
+
+
+def test_grouped_moments_skip_negative_codes(day_frame):
+    codes = np.where(day_frame['season'] == 1, -1, day_frame['season'].astype('int64') - 2)
+    groups = grouped_moments(day_frame, COLUMNS, codes, 3)
+    for g, moments in enumerate(groups):
+        assert_matches_frame(moments, day_frame[day_frame['season'].astype('int64') == g + 2])
+
+
+def test_numeric_columns_skip_categorical_and_bool():
+    df = pd.DataFrame({'x': [1.0], 'n': [1], 'flag': [True], 'label': pd.Categorical(['a'])})
+    assert numeric_columns(df) == ['x', 'n']